@@ -6,13 +6,54 @@ load_dotenv()
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    REPLICA_DATABASE_URL: str | None = None
+    REPLICA_PIN_SECONDS: int = 10
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
     ADMIN_USERNAME: str
     ADMIN_EMAIL: str
     ADMIN_PASSWORD: str
     FRONTEND_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_ECHO: bool = False
+    DB_SLOW_QUERY_MS: float = 200
+    DB_N_PLUS_ONE_THRESHOLD: int = 5
+    CLUB_CACHE_TTL_SECONDS: float = 60
+    CLUB_CACHE_MAX_ENTRIES: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 4096
+    VERIFIED_TOKEN_CACHE_MAX_ENTRIES: int = 8192
+    FORM_VALIDATOR_CACHE_TTL_SECONDS: float = 3600
+    FORM_VALIDATOR_CACHE_MAX_ENTRIES: int = 512
+    REGISTRATION_ANALYTICS_CACHE_TTL_SECONDS: float = 15
+    REGISTRATION_ANALYTICS_CACHE_MAX_ENTRIES: int = 1024
+    CACHE_INVALIDATION_CHANNEL: str | None = None
+    # Without an invalidation channel, workers poll for revoked sessions and
+    # token version changes this often
+    TOKEN_STATE_RELOAD_SECONDS: float = 5
+    ADMISSION_BATCH_SIZE: int = 200
+    ADMISSION_POLL_INTERVAL_SECONDS: float = 0.5
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    # bcrypt cost factor; hashes made with any other cost are rehashed on login
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    RATE_LIMIT_ENABLED: bool = True
+    # memory:// keeps buckets per worker; a redis:// URL shares them between workers
+    RATE_LIMIT_STORAGE_URL: str = "memory://"
+    # Number of reverse proxies in front of the API that append to X-Forwarded-For
+    RATE_LIMIT_TRUSTED_PROXY_HOPS: int = 0
+    RATE_LIMIT_AUTH: str = "10/minute"
+    RATE_LIMIT_SUBMISSION: str = "30/minute"
+    RATE_LIMIT_BROWSING: str = "300/minute"
+    RATE_LIMIT_ADMIN: str = "120/minute"
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 200
 
     class Config:
         env_file = ".env"
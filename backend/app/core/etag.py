@@ -0,0 +1,34 @@
+import hashlib
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+
+def row_fingerprint(*columns, order_by):
+    # md5 over every (id, updated_at) pair a response is built from: any insert,
+    # update or delete among those rows changes the result
+    return func.md5(func.string_agg(func.concat_ws(":", *columns), aggregate_order_by(",", *order_by)))
+
+
+def make_etag(*parts) -> str:
+    return '"' + hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Let clients keep the body but revalidate on every poll
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
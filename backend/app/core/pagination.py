@@ -0,0 +1,63 @@
+import base64
+import json
+from datetime import datetime
+from typing import Generic, List, NamedTuple, Optional, TypeVar
+from uuid import UUID
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.exceptions.handler import BadRequestException
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+# Lists are ordered by (created_at, id) and resumed after the last row seen,
+# so every page is an index range scan however deep the client has paged
+class PageParams(NamedTuple):
+    after: Optional[tuple[datetime, UUID]]
+    limit: int
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        created_at, id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, TypeError):
+        raise BadRequestException("Invalid cursor")
+
+
+def page_params(cursor: Optional[str] = None, limit: int = settings.DEFAULT_PAGE_SIZE) -> PageParams:
+    if limit < 1:
+        raise BadRequestException("limit must be at least 1")
+    return PageParams(after=decode_cursor(cursor) if cursor else None, limit=min(limit, settings.MAX_PAGE_SIZE))
+
+
+def keyset(stmt: Select, page: PageParams, created_at, id) -> Select:
+    if page.after:
+        stmt = stmt.filter(tuple_(created_at, id) > tuple_(*page.after))
+    # One extra row tells us whether there is a next page without a count query
+    return stmt.order_by(created_at, id).limit(page.limit + 1)
+
+
+def page_of(rows: list, page: PageParams, created_at) -> dict:
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        next_cursor = encode_cursor(getattr(rows[-1], created_at.key), rows[-1].id)
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+async def paginate(db: AsyncSession, stmt: Select, page: PageParams, created_at, id) -> dict:
+    rows = (await db.scalars(keyset(stmt, page, created_at, id))).all()
+    return page_of(rows, page, created_at)
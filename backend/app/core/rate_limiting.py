@@ -1,4 +1,152 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import logging
+import math
+import re
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import NamedTuple, Protocol
+from fastapi import Request
+from app.core.config import settings
+from app.exceptions.handler import TooManyRequestsException, UnauthorizedException
+from app.services.user_service import verify_token
 
-limiter = Limiter(key_func=get_remote_address)
\ No newline at end of file
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class Bucket(NamedTuple):
+    # Holds up to `burst` tokens and refills at `rate` tokens per second
+    rate: float
+    burst: int
+
+
+def parse_limit(limit: str) -> Bucket:
+    # "30/minute": a burst of 30 requests, refilled evenly over a minute
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(second|minute|hour|day)\s*", limit)
+    if not match or int(match[1]) < 1:
+        raise ValueError(f"Invalid rate limit {limit!r}, expected e.g. '30/minute'")
+    burst = int(match[1])
+    return Bucket(rate=burst / PERIODS[match[2]], burst=burst)
+
+
+class RateLimitStore(Protocol):
+    # Takes one token from the bucket; returns 0 when allowed, else seconds until a token is available
+    async def take(self, key: str, bucket: Bucket) -> float: ...
+
+
+class MemoryRateLimitStore:
+    # Per-process buckets: the local stand-in, and what a single worker uses
+    def __init__(self, max_entries: int = 65536):
+        self.max_entries = max_entries
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = Lock()
+
+    async def take(self, key: str, bucket: Bucket) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (bucket.burst, now))
+            tokens = min(bucket.burst, tokens + (now - updated_at) * bucket.rate)
+            retry_after = 0.0 if tokens >= 1 else (1 - tokens) / bucket.rate
+            if not retry_after:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+
+# Refill and take in one step on the Redis server, using its clock so workers agree
+TAKE_TOKEN_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or burst
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimitStore:
+    # Buckets shared by every worker; needs the optional `redis` package
+    def __init__(self, url: str):
+        try:
+            from redis.asyncio import Redis
+        except ImportError as error:
+            raise RuntimeError("RATE_LIMIT_STORAGE_URL points at Redis but the redis package is not installed") from error
+        self._client = Redis.from_url(url)
+        self._take_token = self._client.register_script(TAKE_TOKEN_SCRIPT)
+
+    async def take(self, key: str, bucket: Bucket) -> float:
+        return float(await self._take_token(keys=[f"rate-limit:{key}"], args=[bucket.rate, bucket.burst]))
+
+
+def create_store(url: str) -> RateLimitStore:
+    if url.startswith("memory://"):
+        return MemoryRateLimitStore()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisRateLimitStore(url)
+    raise ValueError(f"Unsupported RATE_LIMIT_STORAGE_URL {url!r}")
+
+
+store = create_store(settings.RATE_LIMIT_STORAGE_URL)
+
+ROUTE_GROUPS = {
+    "auth": parse_limit(settings.RATE_LIMIT_AUTH),
+    "submission": parse_limit(settings.RATE_LIMIT_SUBMISSION),
+    "browsing": parse_limit(settings.RATE_LIMIT_BROWSING),
+    "admin": parse_limit(settings.RATE_LIMIT_ADMIN),
+}
+
+
+def client_ip(request: Request) -> str:
+    # Each trusted proxy appends the address it received from, so the client
+    # is the entry that many hops from the end of X-Forwarded-For
+    hops = settings.RATE_LIMIT_TRUSTED_PROXY_HOPS
+    if hops:
+        forwarded = [part.strip() for part in request.headers.get("x-forwarded-for", "").split(",") if part.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else "unknown"
+
+
+def client_key(request: Request) -> str:
+    # Signed-in users get their own budget even when they share an address;
+    # verify_token serves repeat tokens from its cache without decoding them
+    token = request.cookies.get("access_token")
+    if token:
+        try:
+            return f"user:{verify_token(token).id}"
+        except UnauthorizedException:
+            pass
+    return f"ip:{client_ip(request)}"
+
+
+def rate_limit(group: str):
+    bucket = ROUTE_GROUPS[group]
+
+    async def dependency(request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        try:
+            retry_after = await store.take(f"{group}:{client_key(request)}", bucket)
+        except Exception:
+            # An unreachable shared store should not take the API down with it
+            logger.exception("Rate limit store failed, letting the request through")
+            return
+        if retry_after:
+            raise TooManyRequestsException(retry_after=math.ceil(retry_after))
+
+    return dependency
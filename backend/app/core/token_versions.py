@@ -0,0 +1,66 @@
+import time
+from threading import Lock
+from app.core.config import settings
+
+
+class TokenVersionFloors:
+    # Lowest token version each user may still present. Only users whose
+    # claims changed within one access-token lifetime need an entry, since
+    # any older token has expired by then.
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._floors: dict[str, tuple[int, float]] = {}
+        self._lock = Lock()
+
+    def accepts(self, user_id: str, version: int | None) -> bool:
+        if version is None:
+            return False
+        entry = self._floors.get(user_id)
+        return entry is None or version >= entry[0] or entry[1] <= time.monotonic()
+
+    def raise_floors(self, versions: dict[str, int]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for user_id, version in versions.items():
+                entry = self._floors.get(user_id)
+                if entry is None or entry[0] < version or entry[1] <= now:
+                    self._floors[user_id] = (version, now + self.ttl_seconds)
+            for user_id in [user_id for user_id, (_, expires_at) in self._floors.items() if expires_at <= now]:
+                del self._floors[user_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._floors.clear()
+
+
+token_version_floors = TokenVersionFloors(settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+class RevokedSessions:
+    # Login sessions revoked within the last access-token lifetime; access
+    # tokens naming one of them are refused without a database lookup
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._sessions: dict[str, float] = {}
+        self._lock = Lock()
+
+    def __contains__(self, session_id: str) -> bool:
+        expires_at = self._sessions.get(session_id)
+        return expires_at is not None and expires_at > time.monotonic()
+
+    def add(self, *session_ids: str) -> None:
+        # Sessions seen again on a reload keep their first expiry
+        now = time.monotonic()
+        with self._lock:
+            for session_id in session_ids:
+                if self._sessions.get(session_id, 0) <= now:
+                    self._sessions[session_id] = now + self.ttl_seconds
+            for session_id in [session_id for session_id, expires_at in self._sessions.items() if expires_at <= now]:
+                del self._sessions[session_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+
+revoked_sessions = RevokedSessions(settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
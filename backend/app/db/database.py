@@ -1,7 +1,37 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import declarative_base
 from app.core.config import settings
+from app.db.instrumentation import install_query_hooks
+from app.db.pool import InstrumentedQueuePool
 
-engine = create_engine(settings.DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
\ No newline at end of file
+def get_async_database_url(url: str) -> str:
+    # The app talks to Postgres through psycopg 3's native async driver,
+    # whatever driver the configured URL names.
+    return make_url(url).set(drivername="postgresql+psycopg").render_as_string(hide_password=False)
+
+def create_pooled_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        get_async_database_url(url),
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    install_query_hooks(engine.sync_engine)
+    return engine
+
+engine = create_pooled_engine(settings.DATABASE_URL)
+# Without a replica, read-only sessions fall back to the primary
+replica_engine = create_pooled_engine(settings.REPLICA_DATABASE_URL) if settings.REPLICA_DATABASE_URL else engine
+
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+ReadSessionLocal = async_sessionmaker(
+    bind=replica_engine.execution_options(postgresql_readonly=True),
+    autoflush=False,
+    expire_on_commit=False,
+)
+Base = declarative_base()
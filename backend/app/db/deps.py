@@ -1,8 +1,40 @@
-from app.db.database import SessionLocal
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.db.database import SessionLocal, ReadSessionLocal
 
-def get_db():
-    db = SessionLocal()
-    try:
+PRIMARY_PIN_COOKIE = "db_primary_pin"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+async def get_db():
+    async with SessionLocal() as db:
+        yield db
+
+async def get_read_db(request: Request):
+    # Clients that wrote recently keep reading from the primary so they see their own writes
+    session_factory = SessionLocal if PRIMARY_PIN_COOKIE in request.cookies else ReadSessionLocal
+    async with session_factory() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+
+class PrimaryPinMiddleware:
+    # Marks clients with a short-lived cookie after a successful write; see get_read_db
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message: Message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{PRIMARY_PIN_COOKIE}=1; Max-Age={settings.REPLICA_PIN_SECONDS}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
@@ -0,0 +1,9 @@
+from psycopg import errors
+from sqlalchemy.exc import IntegrityError
+
+
+def unique_violation(error: IntegrityError) -> str | None:
+    # Name of the unique index or constraint a failed write collided with
+    if isinstance(error.orig, errors.UniqueViolation):
+        return error.orig.diag.constraint_name
+    return None
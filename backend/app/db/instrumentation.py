@@ -0,0 +1,91 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    # Statements are compiled with bound parameters, so identical text means
+    # the same query shape ran again with different values
+    def repeated(self, threshold: int | None = None) -> list[tuple[str, int]]:
+        threshold = threshold or settings.DB_N_PLUS_ONE_THRESHOLD
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    def assert_max_queries(self, limit: int) -> None:
+        assert self.count <= limit, f"Expected at most {limit} queries, {self.count} were executed"
+
+    def assert_no_n_plus_one(self, threshold: int | None = None) -> None:
+        repeated = self.repeated(threshold)
+        assert not repeated, "Repeated query shapes (N+1): " + "; ".join(
+            f"{count}x {statement}" for statement, count in repeated
+        )
+
+
+# Trackers nest: a test's tracker still sees queries while the request
+# middleware tracks the same statements for its Server-Timing header
+_current_stats: ContextVar[tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+
+@contextmanager
+def track_queries():
+    stats = QueryStats()
+    token = _current_stats.set((*_current_stats.get(), stats))
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def install_query_hooks(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start_time"].pop()
+        if duration * 1000 >= settings.DB_SLOW_QUERY_MS:
+            logger.warning("Slow query (%.1f ms): %s", duration * 1000, statement)
+        for stats in _current_stats.get():
+            stats.record(statement, duration)
+
+
+class QueryStatsMiddleware:
+    # Reports per-request query count and DB time as a Server-Timing header
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_timing(message: Message):
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("server-timing", f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"')
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        for statement, count in stats.repeated():
+            logger.warning("Possible N+1 on %s %s: %d executions of %s", scope["method"], scope["path"], count, statement)
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import logging
+import psycopg
+from typing import Awaitable, Callable
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache, caches
+from app.core.config import settings
+from app.core.token_versions import revoked_sessions, token_version_floors
+
+logger = logging.getLogger(__name__)
+
+
+async def notify_invalidation(db: AsyncSession, cache_name: str, *keys: str) -> None:
+    # NOTIFY is transactional, so other workers only hear about committed changes
+    if not settings.CACHE_INVALIDATION_CHANNEL:
+        return
+    payload = json.dumps({"cache": cache_name, "keys": list(keys)})
+    await db.execute(select(func.pg_notify(settings.CACHE_INVALIDATION_CHANNEL, payload)))
+
+
+async def notify_token_versions(db: AsyncSession, versions: dict[str, int]) -> None:
+    if not settings.CACHE_INVALIDATION_CHANNEL or not versions:
+        return
+    payload = json.dumps({"token_versions": versions})
+    await db.execute(select(func.pg_notify(settings.CACHE_INVALIDATION_CHANNEL, payload)))
+
+
+async def notify_revoked_sessions(db: AsyncSession, session_ids: list[str]) -> None:
+    if not settings.CACHE_INVALIDATION_CHANNEL or not session_ids:
+        return
+    payload = json.dumps({"revoked_sessions": session_ids})
+    await db.execute(select(func.pg_notify(settings.CACHE_INVALIDATION_CHANNEL, payload)))
+
+
+async def commit_and_invalidate(db: AsyncSession, invalidations: dict[TTLCache, list[str]]) -> None:
+    for cache, keys in invalidations.items():
+        await notify_invalidation(db, cache.name, *keys)
+    await db.commit()
+    # Evict only after commit so a concurrent reader cannot re-cache the old row
+    for cache, keys in invalidations.items():
+        cache.invalidate(*keys)
+
+
+def apply_invalidation(payload: str) -> None:
+    message = json.loads(payload)
+    if "token_versions" in message:
+        token_version_floors.raise_floors(message["token_versions"])
+        return
+    if "revoked_sessions" in message:
+        revoked_sessions.add(*message["revoked_sessions"])
+        return
+    cache = caches.get(message["cache"])
+    if cache is not None:
+        cache.invalidate(*message["keys"])
+
+
+async def listen_for_invalidations(on_connect: Callable[[], Awaitable[None]] | None = None) -> None:
+    conninfo = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as conn:
+                await conn.execute(f'LISTEN "{settings.CACHE_INVALIDATION_CHANNEL}"')
+                # Messages sent while disconnected are lost, so start from empty caches
+                for cache in caches.values():
+                    cache.clear()
+                if on_connect is not None:
+                    await on_connect()
+                async for notify in conn.notifies():
+                    try:
+                        apply_invalidation(notify.payload)
+                    except (ValueError, KeyError):
+                        logger.warning("Ignoring malformed cache invalidation: %s", notify.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Cache invalidation listener disconnected, reconnecting")
+            await asyncio.sleep(5)
@@ -7,12 +7,13 @@ from starlette.status import (
     HTTP_409_CONFLICT,
     HTTP_413_REQUEST_ENTITY_TOO_LARGE,
     HTTP_422_UNPROCESSABLE_ENTITY,
+    HTTP_429_TOO_MANY_REQUESTS,
     HTTP_500_INTERNAL_SERVER_ERROR,
 )
 
 class CustomException(HTTPException):
-    def __init__(self, status_code: int, detail: str):
-        super().__init__(status_code=status_code, detail=detail)
+    def __init__(self, status_code: int, detail: str, headers: dict[str, str] | None = None):
+        super().__init__(status_code=status_code, detail=detail, headers=headers)
 
 class NotFoundException(CustomException):
     def __init__(self, detail: str = "Item not found"):
@@ -42,6 +43,10 @@ class UnprocessableEntityException(CustomException):
     def __init__(self, detail: str = "Unprocessable entity"):
         super().__init__(status_code=HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
 
+class TooManyRequestsException(CustomException):
+    def __init__(self, detail: str = "Too many requests", retry_after: int = 1):
+        super().__init__(status_code=HTTP_429_TOO_MANY_REQUESTS, detail=detail, headers={"Retry-After": str(retry_after)})
+
 class InternalServerErrorException(CustomException):
     def __init__(self, detail: str = "Internal server error"):
         super().__init__(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=detail)
\ No newline at end of file
@@ -0,0 +1,61 @@
+# Admits submissions queued by forms in queued intake mode.
+#
+#   python -m app.jobs.admission_worker [--once]
+#
+# Runs until interrupted, polling when the queue is empty; --once drains the
+# queue and exits. Several workers can run side by side.
+import asyncio
+import logging
+import sys
+from contextlib import suppress
+from app.core.config import settings
+from app.db.database import SessionLocal, engine
+# Register every mapped class, as the app does through its routers
+from app.models import club_model, event_model, form_model, idempotency_model, refresh_token_model, registration_model, submission_model, team_model, user_model
+from app.services.admission_service import drain_submission_queue
+
+logger = logging.getLogger(__name__)
+
+MAX_ERROR_BACKOFF_SECONDS = 60
+
+
+async def run_admission_worker(once: bool = False) -> None:
+    failures = 0
+    while True:
+        async with SessionLocal() as db:
+            try:
+                processed = await drain_submission_queue(db, settings.ADMISSION_BATCH_SIZE)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # The batch's tickets stay queued; back off so a persistent
+                # failure (database down, bad payload) doesn't spin
+                if once:
+                    raise
+                logger.exception("Admission batch failed, retrying")
+                with suppress(Exception):
+                    await db.rollback()
+                failures += 1
+                processed = None
+        if processed is None:
+            await asyncio.sleep(min(settings.ADMISSION_POLL_INTERVAL_SECONDS * 2 ** failures, MAX_ERROR_BACKOFF_SECONDS))
+            continue
+        failures = 0
+        if processed:
+            logger.info("Admitted a batch of %d submission(s)", processed)
+        elif once:
+            return
+        else:
+            await asyncio.sleep(settings.ADMISSION_POLL_INTERVAL_SECONDS)
+
+
+async def main(argv: list[str]) -> None:
+    try:
+        await run_admission_worker(once="--once" in argv)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,26 @@
+# Deletes Idempotency-Key records older than IDEMPOTENCY_KEY_TTL_HOURS.
+#
+#   python -m app.jobs.purge_idempotency_keys
+import asyncio
+import logging
+from app.db.database import SessionLocal, engine
+# Register every mapped class, as the app does through its routers
+from app.models import club_model, event_model, form_model, idempotency_model, refresh_token_model, registration_model, submission_model, team_model, user_model
+from app.services.idempotency_service import purge_expired_idempotency_keys
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    try:
+        async with SessionLocal() as db:
+            purged = await purge_expired_idempotency_keys(db)
+            await db.commit()
+    finally:
+        await engine.dispose()
+    logger.info("Purged %d expired idempotency key(s)", purged)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+# Recomputes event_registration_stats from the registrations table.
+#
+#   python -m app.jobs.reconcile_registration_stats [event_id ...]
+#
+# Without arguments every event is reconciled, one short transaction each.
+import asyncio
+import logging
+import sys
+from uuid import UUID
+from sqlalchemy import select
+from app.db.database import SessionLocal, engine
+# Register every mapped class, as the app does through its routers
+from app.models import club_model, event_model, form_model, idempotency_model, refresh_token_model, registration_model, submission_model, team_model, user_model
+from app.models.event_model import Event
+from app.services.registration_stats_service import recompute_registration_stats
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_registration_stats(event_ids: list[UUID] | None = None) -> int:
+    if event_ids is None:
+        async with SessionLocal() as db:
+            event_ids = (await db.scalars(select(Event.id))).all()
+
+    drifted = 0
+    for event_id in event_ids:
+        async with SessionLocal() as db:
+            before, after = await recompute_registration_stats(db, event_id)
+            await db.commit()
+        if before != after:
+            drifted += 1
+            logger.warning("Registration stats for event %s drifted: %s -> %s", event_id, before, after)
+    return drifted
+
+
+async def main(argv: list[str]) -> None:
+    event_ids = [UUID(arg) for arg in argv] or None
+    try:
+        drifted = await reconcile_registration_stats(event_ids)
+    finally:
+        await engine.dispose()
+    logger.info("Reconciled registration stats, %d event(s) corrected", drifted)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    asyncio.run(main(sys.argv[1:]))
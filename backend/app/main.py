@@ -1,7 +1,50 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import user_router, club_router, event_router, form_router, form_response_router, registration_router, team_router
-from app.db.database import Base, engine
+from app.routers import user_router, club_router, event_router, form_router, form_response_router, registration_router, team_router, admin_router
+from app.core.config import settings
+from app.core.rate_limiting import rate_limit
+from app.db.database import SessionLocal, engine
+from app.db.deps import PrimaryPinMiddleware
+from app.db.instrumentation import QueryStatsMiddleware
+from app.db.invalidation import listen_for_invalidations
+from app.services.refresh_token_service import load_revoked_sessions
+from app.services.user_service import load_token_version_floors
+
+logger = logging.getLogger(__name__)
+
+async def reload_token_state():
+    async with SessionLocal() as db:
+        await load_token_version_floors(db)
+        await load_revoked_sessions(db)
+
+
+async def poll_token_state():
+    # Without an invalidation channel this is how a logout, password change or
+    # club approval on one worker reaches the others
+    while True:
+        await asyncio.sleep(settings.TOKEN_STATE_RELOAD_SECONDS)
+        try:
+            await reload_token_state()
+        except Exception:
+            logger.exception("Reloading revoked sessions and token versions failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await reload_token_state()
+    if settings.CACHE_INVALIDATION_CHANNEL:
+        syncer = asyncio.create_task(listen_for_invalidations(reload_token_state))
+    else:
+        syncer = asyncio.create_task(poll_token_state())
+    yield
+    syncer.cancel()
+    with suppress(asyncio.CancelledError):
+        await syncer
+    await engine.dispose()
+
 
 app = FastAPI(
     title = "Competition Portal",
@@ -12,7 +55,8 @@ app = FastAPI(
         "name": "API Support",
         "url": "https://github.com/AlifHossain27",
         "email": "alifh044@gmail.com"
-    }
+    },
+    lifespan = lifespan
 )
 
 app.add_middleware(
@@ -22,12 +66,19 @@ app.add_middleware(
     allow_headers=["*"],
     allow_credentials=True,
 )
-Base.metadata.create_all(bind=engine)
-
-app.include_router(user_router.user_router, prefix="/api", tags=["Users"])
-app.include_router(club_router.club_router, prefix="/api", tags=["Clubs"])
-app.include_router(event_router.event_router, prefix="/api", tags=["Events"])
-app.include_router(form_router.form_router, prefix="/api", tags=["Forms"])
-app.include_router(form_response_router.form_response_router, prefix="/api", tags=["FormResponses"])
-app.include_router(registration_router.registration_router, prefix="/api", tags=["Registrations"])
-app.include_router(team_router.team_router, prefix="/api", tags=["Team Management"])
\ No newline at end of file
+if settings.REPLICA_DATABASE_URL:
+    app.add_middleware(PrimaryPinMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+
+# Every client gets a general request budget; auth, submission and admin
+# routes also draw on their own bucket
+browsing_limit = [Depends(rate_limit("browsing"))]
+
+app.include_router(user_router.user_router, prefix="/api", tags=["Users"], dependencies=browsing_limit)
+app.include_router(club_router.club_router, prefix="/api", tags=["Clubs"], dependencies=browsing_limit)
+app.include_router(event_router.event_router, prefix="/api", tags=["Events"], dependencies=browsing_limit)
+app.include_router(form_router.form_router, prefix="/api", tags=["Forms"], dependencies=browsing_limit)
+app.include_router(form_response_router.form_response_router, prefix="/api", tags=["FormResponses"], dependencies=browsing_limit)
+app.include_router(registration_router.registration_router, prefix="/api", tags=["Registrations"], dependencies=browsing_limit)
+app.include_router(team_router.team_router, prefix="/api", tags=["Team Management"], dependencies=browsing_limit)
+app.include_router(admin_router.admin_router, prefix="/api", tags=["Admin"], dependencies=[Depends(rate_limit("admin"))])
\ No newline at end of file
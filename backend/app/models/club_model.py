@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, func
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -12,8 +12,13 @@ class ClubStatusEnum(str, enum.Enum):
 
 class Club(Base):
     __tablename__ = "clubs"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_clubs_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_clubs_created_at_id", "created_at", "id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
     slug = Column(String, nullable=False, unique=True)
     description = Column(Text, nullable=True)
@@ -21,7 +26,7 @@ class Club(Base):
     banner_url = Column(String, nullable=True)
     website = Column(String, nullable=True)
     status = Column(Enum(ClubStatusEnum), default=ClubStatusEnum.pending, nullable=True)
-    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), index=True)
     approved_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
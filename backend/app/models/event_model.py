@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, func
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -17,8 +17,13 @@ class EventStatusEnum(str, enum.Enum):
 
 class Event(Base):
     __tablename__ = "events"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_events_club_id_status_created_at_id", "club_id", "status", "created_at", "id"),
+        Index("ix_events_club_id_created_at_id", "club_id", "created_at", "id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     club_id = Column(UUID(as_uuid=True), ForeignKey("clubs.id"))
     title = Column(String, nullable=False)
     slug = Column(String, nullable=False, unique=True)
@@ -30,7 +35,7 @@ class Event(Base):
     registration_deadline = Column(DateTime, nullable=True)
     location = Column(String, nullable=True)
     max_participants = Column(Integer, nullable=True)
-    status = Column(Enum(EventStatusEnum), default=EventStatusEnum.draft, nullable=False)
+    status = Column(Enum(EventStatusEnum), default=EventStatusEnum.draft, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
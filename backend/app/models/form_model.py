@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime, func, Enum
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, func, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 import enum
 from sqlalchemy.orm import relationship
@@ -10,15 +10,27 @@ class FormStatusEnum(str, enum.Enum):
     published = "published"
     closed = "closed"
 
+class FormIntakeModeEnum(str, enum.Enum):
+    direct = "direct"
+    queued = "queued"
+
 class Form(Base):
     __tablename__ = "forms"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_forms_event_id_status_created_at_id", "event_id", "status", "created_at", "id"),
+        Index("ix_forms_event_id_created_at_id", "event_id", "created_at", "id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     event_id = Column(UUID(as_uuid=True), ForeignKey("events.id"))
     title = Column(String, nullable=False)
     instructions = Column(Text, nullable=True)
     form_content = Column(Text, nullable=True)
     status = Column(Enum(FormStatusEnum), default=FormStatusEnum.draft, nullable=False)
+    # queued: submissions are acknowledged with a ticket and admitted in
+    # batches by app/jobs/admission_worker.py
+    intake_mode = Column(Enum(FormIntakeModeEnum), default=FormIntakeModeEnum.direct, server_default=FormIntakeModeEnum.direct.value, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -27,8 +39,11 @@ class Form(Base):
 
 class FormResponse(Base):
     __tablename__ = "form_responses"
+    __table_args__ = (
+        Index("ix_form_responses_form_id_submitted_at_id", "form_id", "submitted_at", "id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     form_id = Column(UUID(as_uuid=True), ForeignKey("forms.id"))
     response_content = Column(Text, nullable=False)
     submitted_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Enum, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -17,8 +17,13 @@ class PaymentStatusEnum(str, enum.Enum):
 
 class Registration(Base):
     __tablename__ = "registrations"
+    __table_args__ = (
+        Index("ix_registrations_event_id_status", "event_id", "status"),
+        Index("ix_registrations_event_id_payment_status", "event_id", "payment_status"),
+        Index("ix_registrations_event_id_registered_at_id", "event_id", "registered_at", "id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     event_id = Column(UUID(as_uuid=True), ForeignKey("events.id"))
     form_response_id = Column(UUID(as_uuid=True), ForeignKey("form_responses.id"))
     team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id"))
@@ -30,3 +35,19 @@ class Registration(Base):
     event = relationship("Event", back_populates="registrations")
     form_response = relationship("FormResponse", back_populates="registration")
     team = relationship("Team", back_populates="registrations")
+
+
+# Per-event registration counters, updated in the same transaction as the
+# registration they count; see app/services/registration_stats_service.py
+class EventRegistrationStats(Base):
+    __tablename__ = "event_registration_stats"
+
+    event_id = Column(UUID(as_uuid=True), ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    total_registrations = Column(Integer, nullable=False, server_default="0")
+    pending = Column(Integer, nullable=False, server_default="0")
+    confirmed = Column(Integer, nullable=False, server_default="0")
+    cancelled = Column(Integer, nullable=False, server_default="0")
+    unpaid = Column(Integer, nullable=False, server_default="0")
+    paid = Column(Integer, nullable=False, server_default="0")
+    refunded = Column(Integer, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, ForeignKey, DateTime, Enum, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+import uuid
+import enum
+from app.db.database import Base
+
+class SubmissionStatusEnum(str, enum.Enum):
+    queued = "queued"
+    accepted = "accepted"
+    rejected = "rejected"
+
+# Durable intake queue for forms in queued mode; the row id is the ticket
+# handed back to the client
+class SubmissionQueue(Base):
+    __tablename__ = "submission_queue"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_submission_queue_queued_created_at", "created_at", postgresql_where=text("status = 'queued'")),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    form_id = Column(UUID(as_uuid=True), ForeignKey("forms.id", ondelete="CASCADE"), nullable=False)
+    event_id = Column(UUID(as_uuid=True), ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    status = Column(Enum(SubmissionStatusEnum), default=SubmissionStatusEnum.queued, nullable=False)
+    registration_id = Column(UUID(as_uuid=True), ForeignKey("registrations.id", ondelete="SET NULL"), nullable=True)
+    detail = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    processed_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -6,8 +6,12 @@ from app.db.database import Base
 
 class Team(Base):
     __tablename__ = "teams"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_teams_event_id_created_at_id", "event_id", "created_at", "id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     event_id = Column(UUID(as_uuid=True), ForeignKey("events.id"))
     team_name = Column(String, nullable=False)
     leader_name = Column(String, nullable=False)
@@ -21,9 +25,25 @@ class Team(Base):
 
 class TeamMember(Base):
     __tablename__ = "team_members"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_team_members_team_id_created_at_id", "team_id", "created_at", "id"),
+        # A person can be on one team per event; enforced here so concurrent
+        # submissions cannot both pass an application-side check
+        Index("uq_team_members_event_id_email", "event_id", text("lower(member_email)"), unique=True),
+        Index(
+            "uq_team_members_event_id_student_id",
+            "event_id",
+            "member_student_id",
+            unique=True,
+            postgresql_where=text("member_student_id IS NOT NULL"),
+        ),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id"))
+    # Copied from the team so the uniqueness indexes can cover it
+    event_id = Column(UUID(as_uuid=True), ForeignKey("events.id", ondelete="SET NULL"))
     member_name = Column(String, nullable=False)
     member_email = Column(String, nullable=False)
     member_student_id = Column(String, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Enum, func
+from sqlalchemy import Column, String, DateTime, Enum, Index, Integer, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -12,13 +12,21 @@ class UserRoleEnum(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_token_version_changed_at", "token_version_changed_at", postgresql_where=text("token_version_changed_at IS NOT NULL")),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
     email = Column(String, unique=True, nullable=False)
     password = Column(String, nullable=False)
     role = Column(Enum(UserRoleEnum), default=UserRoleEnum.regular, nullable=False)
     university_id = Column(String, nullable=True)
+    # Bumped whenever the role or club claims in issued access tokens go stale
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+    token_version_changed_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
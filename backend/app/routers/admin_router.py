@@ -0,0 +1,27 @@
+import traceback
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.deps import get_db
+from app.schemas.admin_schemas import PoolStatusSchema
+from app.schemas.user_schemas import TokenData
+from app.services.admin_service import get_pool_status
+from app.services.user_service import get_current_user
+from app.exceptions.handler import (
+    NotFoundException,
+    BadRequestException,
+    UnauthorizedException
+)
+
+
+admin_router = APIRouter()
+
+
+@admin_router.get("/admin/db/pool", response_model=dict[str, PoolStatusSchema], status_code=200)
+async def get_pool_status_router(current_user: TokenData = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    try:
+        return await get_pool_status(current_user=current_user, db=db)
+    except (NotFoundException, BadRequestException, UnauthorizedException) as error:
+        raise error
+    except Exception as e:
+        print(traceback.format_exc())
+        raise e
@@ -1,9 +1,11 @@
 import traceback
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from app.db.deps import get_db
+from app.core.pagination import Page, PageParams, page_params
+from app.core.rate_limiting import rate_limit
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag
+from app.db.deps import get_db, get_read_db
 from app.schemas.club_schemas import ClubCreate, ClubSchema
 from app.services.club_service import (
     create_club,
@@ -11,6 +13,7 @@ from app.services.club_service import (
     get_club_by_slug,
     get_all_club,
     list_active_clubs,
+    list_active_clubs_version,
     list_pending_clubs,
     approve_club,
     reject_club,
@@ -32,9 +35,9 @@ club_router = APIRouter()
 
 
 @club_router.post("/club/create", response_model=ClubSchema, status_code=201)
-async def create_club_router(club: ClubCreate, current_user: TokenData = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_club_router(club: ClubCreate, current_user: TokenData = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     try:
-        return create_club(current_user=current_user, payload=club, db=db)
+        return await create_club(current_user=current_user, payload=club, db=db)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
@@ -42,29 +45,33 @@ async def create_club_router(club: ClubCreate, current_user: TokenData = Depends
         raise e
 
 
-@club_router.get("/clubs", response_model=List[ClubSchema], status_code=200)
-async def list_clubs_router(db: Session = Depends(get_db), skip: int = 0, limit: int = None):
+@club_router.get("/clubs", response_model=Page[ClubSchema], status_code=200)
+async def list_clubs_router(request: Request, response: Response, db: AsyncSession = Depends(get_read_db), page: PageParams = Depends(page_params)):
     try:
-        return list_active_clubs(db=db, skip=skip, limit=limit)
+        etag = make_etag(await list_active_clubs_version(db=db), page)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+        return await list_active_clubs(db=db, page=page)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         print(traceback.format_exc())
         raise BadRequestException()
 
-@club_router.get("/clubs/all", response_model=List[ClubSchema])
-async def get_all_club_router(current_user: TokenData = Depends(get_current_user),skip: int = 0, limit: int = None, db: Session = Depends(get_db)):
+@club_router.get("/clubs/all", response_model=Page[ClubSchema], dependencies=[Depends(rate_limit("admin"))])
+async def get_all_club_router(current_user: TokenData = Depends(get_current_user), page: PageParams = Depends(page_params), db: AsyncSession = Depends(get_db)):
     try:
-        return get_all_club(current_user=current_user, db=db, skip=skip, limit=limit)
+        return await get_all_club(current_user=current_user, db=db, page=page)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
-@club_router.get("/clubs/pending", response_model=List[ClubSchema])
-async def list_pending_club_router(current_user: TokenData = Depends(get_current_user),skip: int = 0, limit: int = None, db: Session = Depends(get_db)):
+@club_router.get("/clubs/pending", response_model=Page[ClubSchema], dependencies=[Depends(rate_limit("admin"))])
+async def list_pending_club_router(current_user: TokenData = Depends(get_current_user), page: PageParams = Depends(page_params), db: AsyncSession = Depends(get_db)):
     try:
-        return list_pending_clubs(current_user=current_user, db=db, skip=skip, limit=limit)
+        return await list_pending_clubs(current_user=current_user, db=db, page=page)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
@@ -72,10 +79,10 @@ async def list_pending_club_router(current_user: TokenData = Depends(get_current
 
 
 @club_router.get("/clubs/{slug}", response_model=ClubSchema)
-async def get_club_router(slug: str, db: Session = Depends(get_db)):
+async def get_club_router(slug: str, db: AsyncSession = Depends(get_read_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return get_club(db=db, club_id=club_id)
+        club_id = await get_club_by_slug(slug=slug, db=db)
+        return await get_club(db=db, club_id=club_id)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
@@ -83,10 +90,10 @@ async def get_club_router(slug: str, db: Session = Depends(get_db)):
         raise e
 
 @club_router.patch("/clubs/{slug}", response_model=ClubSchema, status_code=201)
-async def update_club_router(slug: str, club: ClubCreate, current_user: TokenData = Depends(get_current_user), db: Session = Depends(get_db)):
+async def update_club_router(slug: str, club: ClubCreate, current_user: TokenData = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return update_club(current_user=current_user, club_id=club_id, updated_attributes=club, db=db)
+        club_id = await get_club_by_slug(slug=slug, db=db)
+        return await update_club(current_user=current_user, club_id=club_id, updated_attributes=club, db=db)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
@@ -95,28 +102,28 @@ async def update_club_router(slug: str, club: ClubCreate, current_user: TokenDat
 
 
 @club_router.delete("/clubs/{slug}", status_code=204)
-async def delete_club_router(slug: str, current_user: TokenData = Depends(get_current_user), db: Session = Depends(get_db)):
+async def delete_club_router(slug: str, current_user: TokenData = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return delete_club(current_user=current_user, db=db, club_id=club_id)
+        club_id = await get_club_by_slug(slug=slug, db=db)
+        return await delete_club(current_user=current_user, db=db, club_id=club_id)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         print(traceback.format_exc())
         raise e
 
-@club_router.patch("/clubs/{slug}/approve", status_code=201)
-async def approve_club_by_admin_router(slug: str, current_user: TokenData = Depends(get_current_user), db: Session = Depends(get_db)):
-    club_id = get_club_by_slug(slug=slug, db=db)
-    club = approve_club(current_user=current_user,db=db, club_id=club_id)
+@club_router.patch("/clubs/{slug}/approve", status_code=201, dependencies=[Depends(rate_limit("admin"))])
+async def approve_club_by_admin_router(slug: str, current_user: TokenData = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    club_id = await get_club_by_slug(slug=slug, db=db)
+    club = await approve_club(current_user=current_user,db=db, club_id=club_id)
     if not club:
         raise NotFoundException(f"Club with id {club_id} not found")
     return {"detail": f"Club {club.name} approved successfully"}
 
-@club_router.patch("/clubs/{slug}/reject", status_code=201)
-async def reject_club_by_admin_router(slug: str, current_user: TokenData = Depends(get_current_user), db: Session = Depends(get_db)):
-    club_id = get_club_by_slug(slug=slug, db=db)
-    club = reject_club(current_user=current_user,db=db, club_id=club_id)
+@club_router.patch("/clubs/{slug}/reject", status_code=201, dependencies=[Depends(rate_limit("admin"))])
+async def reject_club_by_admin_router(slug: str, current_user: TokenData = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    club_id = await get_club_by_slug(slug=slug, db=db)
+    club = await reject_club(current_user=current_user,db=db, club_id=club_id)
     if not club:
         raise NotFoundException(f"Club with id {club_id} not found")
     return {"detail": f"Club {club.name} rejected successfully"}
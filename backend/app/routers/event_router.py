@@ -1,14 +1,17 @@
 import traceback
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from app.db.deps import get_db
-from app.schemas.event_schemas import EventCreate, EventSchema, EventModelSchema
+from app.core.pagination import Page, PageParams, page_params
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag
+from app.db.deps import get_db, get_read_db
+from app.schemas.event_schemas import EventCreate, EventSchema, EventModelSchema, EventFieldsSchema, EVENT_INCLUDES
 from app.schemas.user_schemas import TokenData
 from app.services import event_service
 from app.services.user_service import get_current_user
-from app.services.club_service import get_club_by_slug
+from app.services.club_service import get_club_by_slug, get_club_ref
+from app.services.loader_options import event_schema_options, event_model_schema_options
+from app.services.resource_service import EventContext, event_resolver, resolve_event
 from app.exceptions.handler import (
     NotFoundException,
     ConflictException,
@@ -18,92 +21,110 @@ from app.exceptions.handler import (
 )
 
 event_router = APIRouter()
+owned_event = event_resolver()
+owned_event_with_forms = event_resolver(*event_schema_options)
+owned_event_model = event_resolver(*event_model_schema_options)
+owner_event_selection = event_service.event_selection(*EVENT_INCLUDES)
+public_event_selection = event_service.event_selection("forms")
 
 
 @event_router.post("/club/{slug}/event/create", response_model=EventSchema, status_code=201)
-async def create_event_router(slug: str, data: EventCreate, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+async def create_event_router(slug: str, data: EventCreate, db: AsyncSession = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return event_service.create_event(current_user, db, data, club_id)
+        club_id = await get_club_by_slug(slug=slug, db=db)
+        return await event_service.create_event(current_user, db, data, club_id)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
-@event_router.get("/club/{club_id}/event/published", response_model=List[EventSchema], status_code=200)
-async def get_published_events_by_club_router(club_id: UUID, skip: int = 0, limit: int = None, db: Session = Depends(get_db)):
+@event_router.get("/club/{club_id}/event/published", response_model=Page[EventFieldsSchema], response_model_exclude_unset=True, status_code=200)
+async def get_published_events_by_club_router(club_id: UUID, request: Request, response: Response, page: PageParams = Depends(page_params), selection: event_service.EventSelection = Depends(public_event_selection), db: AsyncSession = Depends(get_read_db)):
     try:
-        return event_service.get_published_events_by_club(club_id, db, skip, limit)
+        # An unknown club and a club with nothing published share the same
+        # empty fingerprint, so the club must exist before any 304
+        if not await get_club_ref(db, club_id):
+            raise NotFoundException(f"Club with id {club_id} not found")
+        etag = make_etag(await event_service.get_published_events_by_club_version(club_id, db), page, selection.fields, sorted(selection.include))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+        return await event_service.get_published_events_by_club(club_id, db, selection, page)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
-@event_router.get("/club/{slug}/event/all", response_model=List[EventModelSchema], status_code=200)
-async def get_all_events_by_club_router(slug: str, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user), skip: int = 0, limit: int = None):
+@event_router.get("/club/{slug}/event/all", response_model=Page[EventFieldsSchema], response_model_exclude_unset=True, status_code=200)
+async def get_all_events_by_club_router(slug: str, db: AsyncSession = Depends(get_db), current_user: TokenData = Depends(get_current_user), page: PageParams = Depends(page_params), selection: event_service.EventSelection = Depends(owner_event_selection)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return event_service.get_all_events_by_club(current_user, club_id, db, skip, limit)
+        club_id = await get_club_by_slug(slug=slug, db=db)
+        return await event_service.get_all_events_by_club(current_user, club_id, db, selection, page)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
-@event_router.get("/club/{slug}/event/draft", response_model=List[EventModelSchema], status_code=200)
-async def get_draft_events_by_club_router(slug: str, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user), skip: int = 0, limit: int = None):
+@event_router.get("/club/{slug}/event/draft", response_model=Page[EventFieldsSchema], response_model_exclude_unset=True, status_code=200)
+async def get_draft_events_by_club_router(slug: str, db: AsyncSession = Depends(get_db), current_user: TokenData = Depends(get_current_user), page: PageParams = Depends(page_params), selection: event_service.EventSelection = Depends(owner_event_selection)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return event_service.get_draft_events_by_club(current_user, club_id, db, skip, limit)
+        club_id = await get_club_by_slug(slug=slug, db=db)
+        return await event_service.get_draft_events_by_club(current_user, club_id, db, selection, page)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
-@event_router.get("/club/{slug}/event/closed", response_model=List[EventModelSchema], status_code=200)
-async def get_closed_events_by_club_router(slug: str, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user), skip: int = 0, limit: int = None):
+@event_router.get("/club/{slug}/event/closed", response_model=Page[EventFieldsSchema], response_model_exclude_unset=True, status_code=200)
+async def get_closed_events_by_club_router(slug: str, db: AsyncSession = Depends(get_db), current_user: TokenData = Depends(get_current_user), page: PageParams = Depends(page_params), selection: event_service.EventSelection = Depends(owner_event_selection)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return event_service.get_closed_events_by_club(current_user, club_id, db, skip, limit)
+        club_id = await get_club_by_slug(slug=slug, db=db)
+        return await event_service.get_closed_events_by_club(current_user, club_id, db, selection, page)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
-@event_router.get("/club/{slug}/event/cancelled", response_model=List[EventModelSchema], status_code=200)
-async def get_cancelled_events_by_club_router(slug: str, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user), skip: int = 0, limit: int = None):
+@event_router.get("/club/{slug}/event/cancelled", response_model=Page[EventFieldsSchema], response_model_exclude_unset=True, status_code=200)
+async def get_cancelled_events_by_club_router(slug: str, db: AsyncSession = Depends(get_db), current_user: TokenData = Depends(get_current_user), page: PageParams = Depends(page_params), selection: event_service.EventSelection = Depends(owner_event_selection)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return event_service.get_cancelled_events_by_club(current_user, club_id, db, skip, limit)
+        club_id = await get_club_by_slug(slug=slug, db=db)
+        return await event_service.get_cancelled_events_by_club(current_user, club_id, db, selection, page)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
 @event_router.get("/club/{slug}/event/{event_id}", response_model=EventSchema, status_code=200)
-async def get_event_router(slug: str, event_id: UUID, db: Session = Depends(get_db)):
+async def get_event_router(slug: str, event_id: UUID, request: Request, response: Response, db: AsyncSession = Depends(get_read_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return event_service.get_event(db, club_id, event_id)
+        club_id = await get_club_by_slug(slug=slug, db=db)
+        version = await event_service.get_event_version(db, club_id, event_id)
+        if version is not None:
+            etag = make_etag(version)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            set_etag(response, etag)
+        context = await resolve_event(db, slug, event_id, options=event_schema_options)
+        return context.event
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
     
 @event_router.patch("/club/{slug}/event/{event_id}", response_model=EventSchema, status_code=201)
-async def update_event_router(slug, event_id: UUID, data: EventCreate, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+async def update_event_router(data: EventCreate, context: EventContext = Depends(owned_event_with_forms), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return event_service.update_event(current_user, db, club_id, event_id, data)
+        return await event_service.update_event(context, db, data)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
 @event_router.delete("/club/{slug}/event/{event_id}", status_code=204)
-async def delete_event_router(slug: str, event_id: UUID, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+async def delete_event_router(context: EventContext = Depends(owned_event), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return event_service.delete_event(current_user, db, club_id, event_id)
+        return await event_service.delete_event(context, db)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
@@ -111,30 +132,27 @@ async def delete_event_router(slug: str, event_id: UUID, db: Session = Depends(g
 
 
 @event_router.patch("/club/{slug}/event/{event_id}/publish", response_model=EventModelSchema, status_code=201)
-async def publish_event_router(slug: str, event_id: UUID,db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+async def publish_event_router(context: EventContext = Depends(owned_event_model), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return event_service.publish_event(current_user, club_id, event_id, db)
+        return await event_service.publish_event(context, db)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
 @event_router.patch("/club/{slug}/event/{event_id}/close", response_model=EventModelSchema, status_code=201)
-async def close_event_router(slug: str, event_id: UUID, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+async def close_event_router(context: EventContext = Depends(owned_event_model), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return event_service.close_event(current_user, club_id, event_id, db)
+        return await event_service.close_event(context, db)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
 @event_router.patch("/club/{slug}/event/{event_id}/cancel", response_model=EventModelSchema, status_code=201)
-async def cancel_event_router(slug: str, event_id: UUID, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+async def cancel_event_router(context: EventContext = Depends(owned_event_model), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return event_service.cancel_event(current_user, club_id, event_id, db)
+        return await event_service.cancel_event(context, db)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
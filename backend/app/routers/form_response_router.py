@@ -1,17 +1,20 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from app.schemas.form_schemas import FormResponseCreate, FormResponseSchema
+from app.core.rate_limiting import rate_limit
+from app.core.pagination import Page, PageParams, page_params
+from app.schemas.form_schemas import FormResponseCreate, FormResponseSchema, FormIntakeModeEnum, SubmissionTicketSchema
 from app.schemas.registration_schemas import RegistrationFullSchema
-from app.schemas.user_schemas import TokenData
 from app.services.form_response_service import (
     create_form_response,
+    enqueue_form_response,
+    submit_form_response_idempotently,
+    get_submission_ticket,
     list_form_responses,
     get_form_response
 )
 from app.db.deps import get_db
-from app.services.user_service import get_current_user
-from app.services.club_service import get_club_by_slug
+from app.services.resource_service import EventContext, form_resolver
 from app.exceptions.handler import (
     NotFoundException,
     ConflictException,
@@ -21,32 +24,51 @@ from app.exceptions.handler import (
 )
 
 form_response_router = APIRouter()
+owned_form = form_resolver()
+submission_form = form_resolver(owner=False)
 
-@form_response_router.post("/club/{slug}/event/{event_id}/form/{form_id}/form-response/create", response_model=RegistrationFullSchema, status_code=201)
-async def create_new_form_response_router(slug: str, form_id: UUID, event_id: UUID, response_data: FormResponseCreate, db: Session = Depends(get_db)):
+@form_response_router.post("/club/{slug}/event/{event_id}/form/{form_id}/form-response/create", response_model=RegistrationFullSchema | SubmissionTicketSchema, status_code=201, dependencies=[Depends(rate_limit("submission"))])
+async def create_new_form_response_router(response_data: FormResponseCreate, response: Response, context: EventContext = Depends(submission_form), db: AsyncSession = Depends(get_db), idempotency_key: str | None = Header(default=None, max_length=255)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return create_form_response(db, response_data, form_id, event_id, club_id)
+        # Retries with the same Idempotency-Key get the first outcome back
+        if idempotency_key:
+            status_code, body, replayed = await submit_form_response_idempotently(context, db, response_data, idempotency_key)
+            response.status_code = status_code
+            if replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+            return body
+        # Queued forms acknowledge with a ticket; the admission worker decides
+        if context.form.intake_mode == FormIntakeModeEnum.queued:
+            response.status_code = 202
+            return await enqueue_form_response(context, db, response_data)
+        return await create_form_response(context, db, response_data)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
     
-@form_response_router.get("/club/{slug}/event/{event_id}/form/{form_id}/form-response", response_model=list[FormResponseSchema], status_code=200)
-async def list_form_responses_router(slug: str, form_id: UUID, event_id: UUID, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+@form_response_router.get("/club/{slug}/event/{event_id}/form/{form_id}/form-response/tickets/{ticket_id}", response_model=SubmissionTicketSchema, status_code=200)
+async def get_submission_ticket_router(ticket_id: UUID, context: EventContext = Depends(submission_form), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return list_form_responses(current_user, db, club_id, event_id, form_id)
+        return await get_submission_ticket(context, db, ticket_id)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
     
-@form_response_router.get("/club/{slug}/event/{event_id}/form/{form_id}/form-response/{response_id}", response_model=list[FormResponseSchema], status_code=200)
-async def get_form_responses_router(slug: str, response_id: UUID, form_id: UUID, event_id: UUID, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+@form_response_router.get("/club/{slug}/event/{event_id}/form/{form_id}/form-response", response_model=Page[FormResponseSchema], status_code=200)
+async def list_form_responses_router(page: PageParams = Depends(page_params), context: EventContext = Depends(owned_form), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return get_form_response(current_user, db, club_id, event_id, form_id, response_id)
+        return await list_form_responses(context, db, page)
+    except (NotFoundException, ConflictException, BadRequestException) as error:
+        raise error
+    except Exception as e:
+        raise e
+    
+@form_response_router.get("/club/{slug}/event/{event_id}/form/{form_id}/form-response/{response_id}", response_model=FormResponseSchema, status_code=200)
+async def get_form_responses_router(response_id: UUID, context: EventContext = Depends(owned_form), db: AsyncSession = Depends(get_db)):
+    try:
+        return await get_form_response(context, db, response_id)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
@@ -1,11 +1,10 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from app.core.pagination import Page, PageParams, page_params
 from app.schemas.form_schemas import FormCreate, FormSchema
-from app.schemas.user_schemas import TokenData
 from app.services.form_service import (
     create_form,
-    get_form,
     get_all_forms,
     get_published_forms,
     get_draft_forms,
@@ -16,9 +15,8 @@ from app.services.form_service import (
     draft_form,
     close_form
 )
-from app.db.deps import get_db
-from app.services.user_service import get_current_user
-from app.services.club_service import get_club_by_slug
+from app.db.deps import get_db, get_read_db
+from app.services.resource_service import EventContext, event_resolver, form_resolver
 from app.exceptions.handler import (
     NotFoundException,
     ConflictException,
@@ -28,112 +26,105 @@ from app.exceptions.handler import (
 )
 
 form_router = APIRouter()
+owned_event = event_resolver()
+public_event = event_resolver(owner=False, session=get_read_db)
+owned_form = form_resolver()
+public_form = form_resolver(owner=False, session=get_read_db)
 
 @form_router.post("/club/{slug}/event/{event_id}/form/create", response_model=FormSchema, status_code=201)
-async def create_new_form(slug: str, event_id: UUID, form_data: FormCreate, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+async def create_new_form(form_data: FormCreate, context: EventContext = Depends(owned_event), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return create_form(current_user, db, form_data, event_id, club_id)
+        return await create_form(context, db, form_data)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
-@form_router.get("/club/{slug}/event/{event_id}/form/all", response_model=list[FormSchema], status_code=200)
-async def list_all_forms(slug: str, event_id: UUID, skip: int = 0, limit: int = None, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+@form_router.get("/club/{slug}/event/{event_id}/form/all", response_model=Page[FormSchema], status_code=200)
+async def list_all_forms(page: PageParams = Depends(page_params), context: EventContext = Depends(owned_event), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return get_all_forms(db, current_user, event_id, club_id, skip, limit)
+        return await get_all_forms(context, db, page)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
-@form_router.get("/club/{slug}/event/{event_id}/form/published", response_model=list[FormSchema], status_code=200)
-async def list_published_forms(slug: str, event_id: UUID, skip: int = 0, limit: int = None,db: Session = Depends(get_db)):
+@form_router.get("/club/{slug}/event/{event_id}/form/published", response_model=Page[FormSchema], status_code=200)
+async def list_published_forms(page: PageParams = Depends(page_params), context: EventContext = Depends(public_event), db: AsyncSession = Depends(get_read_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return get_published_forms(db, event_id, club_id, skip, limit)
+        return await get_published_forms(context, db, page)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
-@form_router.get("/club/{slug}/event/{event_id}/form/draft", response_model=list[FormSchema], status_code=200)
-async def list_draft_forms(slug: str,event_id: UUID, skip: int = 0, limit: int = None, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+@form_router.get("/club/{slug}/event/{event_id}/form/draft", response_model=Page[FormSchema], status_code=200)
+async def list_draft_forms(page: PageParams = Depends(page_params), context: EventContext = Depends(owned_event), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return get_draft_forms(db, current_user, event_id, club_id, skip, limit)
+        return await get_draft_forms(context, db, page)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
-@form_router.get("/club/{slug}/event/{event_id}/form/closed", response_model=list[FormSchema], status_code=200)
-async def list_closed_forms(slug: str, event_id: UUID, skip: int = 0, limit: int = None, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+@form_router.get("/club/{slug}/event/{event_id}/form/closed", response_model=Page[FormSchema], status_code=200)
+async def list_closed_forms(page: PageParams = Depends(page_params), context: EventContext = Depends(owned_event), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return get_closed_forms(db, current_user, event_id, club_id, skip, limit)
+        return await get_closed_forms(context, db, page)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
 @form_router.get("/club/{slug}/event/{event_id}/form/{form_id}", response_model=FormSchema, status_code=200)
-async def read_form(slug: str, event_id: UUID, form_id: UUID, db: Session = Depends(get_db)):
+async def read_form(context: EventContext = Depends(public_form)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return get_form(db, form_id, event_id, club_id)
+        return context.form
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
 @form_router.patch("/club/{slug}/event/{event_id}/form/{form_id}", response_model=FormSchema, status_code=201)
-async def update_existing_form(slug: str, event_id: UUID, form_id: UUID, form_data: FormCreate, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+async def update_existing_form(form_data: FormCreate, context: EventContext = Depends(owned_form), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return update_form(db, current_user, club_id, event_id, form_id, form_data)
+        return await update_form(context, db, form_data)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
 @form_router.delete("/club/{slug}/event/{event_id}/form/{form_id}", status_code=204)
-async def remove_form(slug: str, event_id: UUID, form_id: UUID, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+async def remove_form(context: EventContext = Depends(owned_form), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return delete_form(db, current_user, club_id, event_id, form_id)
+        return await delete_form(context, db)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
 @form_router.patch("/club/{slug}/event/{event_id}/form/{form_id}/publish", response_model=FormSchema, status_code=201)
-async def publish_existing_form(slug: str, event_id: UUID, form_id: UUID, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+async def publish_existing_form(context: EventContext = Depends(owned_form), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return publish_form(db, current_user, club_id, event_id, form_id)
+        return await publish_form(context, db)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
 @form_router.patch("/club/{slug}/event/{event_id}/form/{form_id}/draft", response_model=FormSchema, status_code=201)
-async def mark_form_as_draft(slug: str, event_id: UUID, form_id: UUID, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+async def mark_form_as_draft(context: EventContext = Depends(owned_form), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return draft_form(db, current_user, club_id, event_id, form_id)
+        return await draft_form(context, db)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
 
 @form_router.patch("/club/{slug}/event/{event_id}/form/{form_id}/close", response_model=FormSchema, status_code=201)
-async def mark_form_as_closed(slug: str, event_id: UUID, form_id: UUID, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+async def mark_form_as_closed(context: EventContext = Depends(owned_form), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return close_form(db, current_user, club_id, event_id, form_id)
+        return await close_form(context, db)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
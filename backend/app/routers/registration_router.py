@@ -1,20 +1,20 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from app.core.pagination import Page, PageParams, page_params
 from app.schemas.form_schemas import FormResponseCreate, FormResponseSchema
-from app.schemas.registration_schemas import RegistrationFullSchema, RegistrationSchema, PaymentStatusEnum
-from app.schemas.user_schemas import TokenData
+from app.schemas.registration_schemas import RegistrationFullSchema, RegistrationSchema, RegistrationAnalyticsSchema, PaymentStatusEnum, AnalyticsIntervalEnum
 from app.services.registration_service import (
     get_all_registrations,
     get_registration,
     get_registration_stats,
+    get_registration_analytics_by_interval,
     update_payment_status,
     confirm_registration,
     cancel_registration
 )
-from app.db.deps import get_db
-from app.services.user_service import get_current_user
-from app.services.club_service import get_club_by_slug
+from app.db.deps import get_db, get_read_db
+from app.services.resource_service import EventContext, event_resolver
 from app.exceptions.handler import (
     NotFoundException,
     ConflictException,
@@ -24,62 +24,67 @@ from app.exceptions.handler import (
 )
 
 registration_router = APIRouter()
+owned_event = event_resolver()
+owned_event_read = event_resolver(session=get_read_db)
 
-@registration_router.get("/club/{slug}/event/{event_id}/registrations", response_model=list[RegistrationSchema], status_code=200)
-async def fetch_all_registrations_router(slug: str, event_id: UUID, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+@registration_router.get("/club/{slug}/event/{event_id}/registrations", response_model=Page[RegistrationSchema], status_code=200)
+async def fetch_all_registrations_router(page: PageParams = Depends(page_params), context: EventContext = Depends(owned_event), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return get_all_registrations(current_user=current_user, db=db, club_id=club_id, event_id=event_id)
+        return await get_all_registrations(context, db, page)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
     
-@registration_router.get("/club/{slug}/event/{event_id}/registrations/{registration_id}", response_model=RegistrationFullSchema, status_code=200)
-async def fetch_registration_router(slug: str, event_id: UUID, registration_id: UUID, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+@registration_router.get("/club/{slug}/event/{event_id}/registrations/stats", status_code=200)
+async def registration_statistics_router(context: EventContext = Depends(owned_event), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return get_registration(current_user=current_user, db=db, club_id=club_id, event_id=event_id,registration_id=registration_id)
+        return await get_registration_stats(context, db)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
     
-@registration_router.patch("/club/{slug}/event/{event_id}/registrations/{registration_id}/confirm", response_model=RegistrationSchema, status_code=201)
-async def confirm_registration_router(slug: str, event_id: UUID, registration_id: UUID, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+@registration_router.get("/club/{slug}/event/{event_id}/registrations/analytics", response_model=RegistrationAnalyticsSchema, status_code=200)
+async def registration_analytics_router(interval: AnalyticsIntervalEnum = AnalyticsIntervalEnum.day, context: EventContext = Depends(owned_event_read), db: AsyncSession = Depends(get_read_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return confirm_registration(current_user=current_user, db=db, club_id=club_id, event_id=event_id, registration_id=registration_id)
+        return await get_registration_analytics_by_interval(context, db, interval)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
     
-@registration_router.patch("/club/{slug}/event/{event_id}/registrations/{registration_id}/cancel", response_model=RegistrationSchema, status_code=201)
-async def cancel_registration_router(slug: str, event_id: UUID, registration_id: UUID, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+@registration_router.get("/club/{slug}/event/{event_id}/registrations/{registration_id}", response_model=RegistrationFullSchema, status_code=200)
+async def fetch_registration_router(registration_id: UUID, context: EventContext = Depends(owned_event), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return cancel_registration(current_user=current_user, db=db, club_id=club_id, event_id=event_id, registration_id=registration_id)
+        return await get_registration(context, db, registration_id)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
     
-@registration_router.patch("/club/{slug}/event/{event_id}/registrations/{registration_id}/payment/{payment_status}", response_model=RegistrationSchema, status_code=201)
-async def update_registration_payment_router(slug: str, event_id: UUID, registration_id: UUID, payment_status: str,db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+@registration_router.patch("/club/{slug}/event/{event_id}/registrations/{registration_id}/confirm", response_model=RegistrationSchema, status_code=201)
+async def confirm_registration_router(registration_id: UUID, context: EventContext = Depends(owned_event), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return update_payment_status(current_user=current_user, db=db, club_id=club_id, event_id=event_id, registration_id=registration_id, payment_status=payment_status)
+        return await confirm_registration(context, db, registration_id)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         raise e
     
-@registration_router.get("/club/{slug}/event/{event_id}/registrations/stats", status_code=200)
-async def registration_statistics_router(slug: str, event_id: UUID, db: Session = Depends(get_db), current_user: TokenData = Depends(get_current_user)):
+@registration_router.patch("/club/{slug}/event/{event_id}/registrations/{registration_id}/cancel", response_model=RegistrationSchema, status_code=201)
+async def cancel_registration_router(registration_id: UUID, context: EventContext = Depends(owned_event), db: AsyncSession = Depends(get_db)):
+    try:
+        return await cancel_registration(context, db, registration_id)
+    except (NotFoundException, ConflictException, BadRequestException) as error:
+        raise error
+    except Exception as e:
+        raise e
+    
+@registration_router.patch("/club/{slug}/event/{event_id}/registrations/{registration_id}/payment/{payment_status}", response_model=RegistrationSchema, status_code=201)
+async def update_registration_payment_router(registration_id: UUID, payment_status: str, context: EventContext = Depends(owned_event), db: AsyncSession = Depends(get_db)):
     try:
-        club_id = get_club_by_slug(slug=slug, db=db)
-        return get_registration_stats(current_user, db, club_id, event_id)
+        return await update_payment_status(context, db, registration_id, payment_status)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
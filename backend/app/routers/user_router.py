@@ -1,11 +1,12 @@
 import traceback
-from typing import Annotated, List
+from typing import Annotated
 from uuid import UUID
+from app.core.pagination import Page, PageParams, page_params
 from app.core.config import settings
-from fastapi import APIRouter, Depends, Request, Response
+from fastapi import APIRouter, Cookie, Depends, Response
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.core.rate_limiting import limiter
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.rate_limiting import rate_limit
 from app.db.deps import get_db
 from app.schemas.user_schemas import UserCreate, UserUpdate, UserSchema, Token, PasswordChange
 from app.services.user_service import (
@@ -15,6 +16,7 @@ from app.services.user_service import (
     change_password,
     update_user,
     logout_user,
+    refresh_access_token,
     CurrentUser,
     list_users,
 )
@@ -29,31 +31,57 @@ from app.exceptions.handler import (
 
 user_router = APIRouter()
 
-@user_router.post("/auth", response_model=UserSchema, status_code=201)
-@limiter.limit("10/minute")
-async def register_user_route(request: Request, user: UserCreate, db: Session = Depends(get_db)):
+
+def set_auth_cookies(response: Response, token: Token):
+    response.set_cookie(
+        key="access_token",
+        value=token.access_token,
+        httponly=True,
+        secure=True,
+        samesite="lax",
+        max_age=60 * settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+        path="/",
+    )
+    # Only the auth routes need the refresh token
+    response.set_cookie(
+        key="refresh_token",
+        value=token.refresh_token,
+        httponly=True,
+        secure=True,
+        samesite="strict",
+        max_age=24 * 60 * 60 * settings.REFRESH_TOKEN_EXPIRE_DAYS,
+        path="/api/auth",
+    )
+
+@user_router.post("/auth", response_model=UserSchema, status_code=201, dependencies=[Depends(rate_limit("auth"))])
+async def register_user_route(user: UserCreate, db: AsyncSession = Depends(get_db)):
     try:
-        return register_user(user=user, db=db)
+        return await register_user(user=user, db=db)
     except (NotFoundException, ConflictException, BadRequestException, UnauthorizedException) as error:
         raise error
     except Exception as e:
         print(traceback.format_exc())
         raise e
     
-@user_router.post("/auth/token", response_model=Token)
-@limiter.limit("10/minute")
-async def login_route(request: Request, response: Response, data: Annotated[OAuth2PasswordRequestForm, Depends()], db: Session = Depends(get_db)):
+@user_router.post("/auth/token", response_model=Token, dependencies=[Depends(rate_limit("auth"))])
+async def login_route(response: Response, data: Annotated[OAuth2PasswordRequestForm, Depends()], db: AsyncSession = Depends(get_db)):
+    try:
+        token = await login_user(data=data, db=db)
+        set_auth_cookies(response, token)
+        return token
+    except (NotFoundException, ConflictException, BadRequestException, UnauthorizedException) as error:
+        raise error
+    except Exception as e:
+        print(traceback.format_exc())
+        raise e
+
+@user_router.post("/auth/refresh", response_model=Token, dependencies=[Depends(rate_limit("auth"))])
+async def refresh_route(response: Response, refresh_token: str | None = Cookie(None), db: AsyncSession = Depends(get_db)):
     try:
-        token = login_user(data=data, db=db)
-        response.set_cookie(
-            key="access_token",
-            value=token.access_token,
-            httponly=True,
-            secure=True,
-            samesite="lax",
-            max_age=60 * settings.ACCESS_TOKEN_EXPIRE_MINUTES,
-            path="/",
-        )
+        if not refresh_token:
+            raise UnauthorizedException("Not authenticated")
+        token = await refresh_access_token(db=db, refresh_token=refresh_token)
+        set_auth_cookies(response, token)
         return token
     except (NotFoundException, ConflictException, BadRequestException, UnauthorizedException) as error:
         raise error
@@ -62,17 +90,17 @@ async def login_route(request: Request, response: Response, data: Annotated[OAut
         raise e
     
 @user_router.post("/auth/logout", status_code=204)
-async def logout_route(response: Response):
+async def logout_route(response: Response, access_token: str | None = Cookie(None), refresh_token: str | None = Cookie(None), db: AsyncSession = Depends(get_db)):
     try:
-        logout_user(response)
+        await logout_user(response, db, access_token, refresh_token)
     except Exception as e:
         print(traceback.format_exc())
         raise e
     
-@user_router.get("/users", response_model=List[UserSchema])
-def get_all_users(current_user: CurrentUser, db: Session = Depends(get_db)):
+@user_router.get("/users", response_model=Page[UserSchema], dependencies=[Depends(rate_limit("admin"))])
+async def get_all_users(current_user: CurrentUser, page: PageParams = Depends(page_params), db: AsyncSession = Depends(get_db)):
     try:
-        return list_users(current_user=current_user, db=db)
+        return await list_users(current_user=current_user, db=db, page=page)
     except (NotFoundException, ConflictException, BadRequestException, UnauthorizedException) as error:
         raise error
     except Exception as e:
@@ -80,9 +108,9 @@ def get_all_users(current_user: CurrentUser, db: Session = Depends(get_db)):
         raise e
     
 @user_router.get("/user/me", response_model=UserSchema)
-async def get_current_user_route(current_user: CurrentUser, db: Session = Depends(get_db)):
+async def get_current_user_route(current_user: CurrentUser, db: AsyncSession = Depends(get_db)):
     try:
-        return get_user_by_uuid(uuid=current_user.get_id(), db=db)
+        return await get_user_by_uuid(uuid=current_user.get_id(), db=db)
     except (NotFoundException, ConflictException, BadRequestException, UnauthorizedException) as error:
         raise error
     except Exception as e:
@@ -90,22 +118,32 @@ async def get_current_user_route(current_user: CurrentUser, db: Session = Depend
         raise e
     
 @user_router.patch("/user/me", response_model=UserSchema, status_code=201)
-async def update_user_route(current_user: CurrentUser, user: UserUpdate, db: Session = Depends(get_db)):
+async def update_user_route(current_user: CurrentUser, user: UserUpdate, db: AsyncSession = Depends(get_db)):
     try:
         uuid = current_user.get_id()
-        return update_user(current_user=current_user, uuid=uuid, updated_attributes=user, db=db)
+        return await update_user(current_user=current_user, uuid=uuid, updated_attributes=user, db=db)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
         print(traceback.format_exc())
         raise e
     
+@user_router.patch("/user/change-password", status_code=200)
+async def change_password_route(new_password: PasswordChange, current_user: CurrentUser, db: AsyncSession = Depends(get_db)):
+    try:
+        await change_password(current_user=current_user, new_password=new_password, db=db)
+        return {"detail": "Password changed successfully"}
+    except (NotFoundException, ConflictException, BadRequestException, UnauthorizedException) as error:
+        raise error
+    except Exception as e:
+        print(traceback.format_exc())
+        raise e
+    
 @user_router.get("/user/{user_id}", response_model=UserSchema, status_code=200)
-def admin_get_user(current_user: CurrentUser, user_id: UUID, db: Session = Depends(get_db)):
+async def admin_get_user(current_user: CurrentUser, user_id: UUID, db: AsyncSession = Depends(get_db)):
     try:
-        user = get_user_by_uuid(uuid=current_user.get_id(), db=db)
-        if user.role == "admin":
-            return get_user_by_uuid(user_id, db)
+        if current_user.role == "admin":
+            return await get_user_by_uuid(user_id, db)
     except (NotFoundException, UnauthorizedException) as error:
         raise error
     except Exception as e:
@@ -113,9 +151,9 @@ def admin_get_user(current_user: CurrentUser, user_id: UUID, db: Session = Depen
         raise e
     
 @user_router.patch("/user/{user_id}", response_model=UserSchema, status_code=201)
-async def update_user_route(current_user: CurrentUser, user_id:UUID, user: UserUpdate, db: Session = Depends(get_db)):
+async def update_user_route(current_user: CurrentUser, user_id:UUID, user: UserUpdate, db: AsyncSession = Depends(get_db)):
     try:
-        return update_user(current_user=current_user, uuid=user_id, updated_attributes=user, db=db)
+        return await update_user(current_user=current_user, uuid=user_id, updated_attributes=user, db=db)
     except (NotFoundException, ConflictException, BadRequestException) as error:
         raise error
     except Exception as e:
@@ -124,14 +162,4 @@ async def update_user_route(current_user: CurrentUser, user_id:UUID, user: UserU
     
 
     
-@user_router.patch("/user/change-password", status_code=200)
-async def change_password_route(new_password: PasswordChange, current_user: CurrentUser, db: Session = Depends(get_db)):
-    try:
-        change_password(current_user=current_user, new_password=new_password, db=db)
-        return {"detail": "Password changed successfully"}
-    except (NotFoundException, ConflictException, BadRequestException, UnauthorizedException) as error:
-        raise error
-    except Exception as e:
-        print(traceback.format_exc())
-        raise e
     
\ No newline at end of file
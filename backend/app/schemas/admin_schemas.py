@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class PoolStatusSchema(BaseModel):
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    idle: int
+    overflow: int
+    timeout_seconds: float
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
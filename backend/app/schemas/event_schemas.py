@@ -50,3 +50,35 @@ class EventModelSchema(EventBase):
     teams: List[TeamSchema] = []
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# Columns and relationships a client can select on event list routes with
+# ?fields= and ?include=; lists return EVENT_SUMMARY_FIELDS and no relations
+# unless asked
+EVENT_FIELDS = (
+    "id", "club_id", "title", "slug", "type", "description", "poster_url", "start_time", "end_time",
+    "registration_deadline", "location", "max_participants", "status", "created_at", "updated_at",
+)
+EVENT_SUMMARY_FIELDS = ("id", "club_id", "title", "slug", "type", "status", "start_time", "end_time", "registration_deadline", "location")
+EVENT_INCLUDES = ("forms", "forms.responses", "registrations", "teams")
+
+class EventFieldsSchema(BaseModel):
+    id: UUID
+    club_id: UUID | None = None
+    title: str | None = None
+    slug: str | None = None
+    type: str | None = None
+    description: str | None = None
+    poster_url: str | None = None
+    start_time: datetime | None = None
+    end_time: datetime | None = None
+    registration_deadline: datetime | None = None
+    location: str | None = None
+    max_participants: int | None = None
+    status: EventStatusEnum | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    forms: List[FormResponseModelSchema] | None = None
+    registrations: List[RegistrationSchema] | None = None
+    teams: List[TeamSchema] | None = None
+
@@ -1,4 +1,5 @@
-from pydantic import BaseModel, EmailStr, ConfigDict
+import json
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, ValidationError, field_validator, model_validator
 from uuid import UUID
 from datetime import datetime
 from enum import Enum
@@ -26,14 +27,111 @@ class FormStatusEnum(str, Enum):
     published = "published"
     closed = "closed"
 
+class FormIntakeModeEnum(str, Enum):
+    direct = "direct"
+    queued = "queued"
+
+class SubmissionStatusEnum(str, Enum):
+    queued = "queued"
+    accepted = "accepted"
+    rejected = "rejected"
+
+class SubmissionTicketSchema(BaseModel):
+    id: UUID
+    form_id: UUID
+    status: SubmissionStatusEnum
+    registration_id: UUID | None = None
+    detail: str | None = None
+    created_at: datetime
+    processed_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FormFieldTypeEnum(str, Enum):
+    text = "text"
+    textarea = "textarea"
+    email = "email"
+    url = "url"
+    number = "number"
+    integer = "integer"
+    boolean = "boolean"
+    date = "date"
+    select = "select"
+    multiselect = "multiselect"
+
+
+class FormField(BaseModel):
+    name: str = Field(pattern=r"^[A-Za-z_][A-Za-z0-9_]*$", max_length=64)
+    label: str | None = None
+    type: FormFieldTypeEnum = FormFieldTypeEnum.text
+    required: bool = True
+    min_length: int | None = Field(default=None, ge=0)
+    max_length: int | None = Field(default=None, ge=1)
+    min: float | None = None
+    max: float | None = None
+    options: List[str] | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+    @model_validator(mode="after")
+    def check_options(self):
+        choice = self.type in (FormFieldTypeEnum.select, FormFieldTypeEnum.multiselect)
+        if choice and not self.options:
+            raise ValueError(f"Field '{self.name}' needs options")
+        if not choice and self.options is not None:
+            raise ValueError(f"Field '{self.name}' only takes options for select types")
+        return self
+
+
+# Declarative form layout stored as JSON in Form.form_content; responses to
+# such forms must be a JSON object matching these fields
+class FormDefinition(BaseModel):
+    fields: List[FormField] = Field(min_length=1)
+
+    model_config = ConfigDict(extra="forbid")
+
+    @field_validator("fields")
+    @classmethod
+    def unique_names(cls, fields: List[FormField]) -> List[FormField]:
+        names = [field.name for field in fields]
+        if len(names) != len(set(names)):
+            raise ValueError("Field names must be unique")
+        return fields
+
+
+def parse_form_definition(form_content: str | None, strict: bool = False) -> FormDefinition | None:
+    # Forms created before definitions existed hold free text, possibly JSON
+    # that isn't a definition; those stay unvalidated. New forms are parsed
+    # strictly so an invalid definition is reported instead of ignored.
+    if not form_content:
+        return None
+    try:
+        content = json.loads(form_content)
+    except ValueError:
+        return None
+    if not isinstance(content, dict):
+        return None
+    try:
+        return FormDefinition.model_validate(content)
+    except ValidationError:
+        if strict:
+            raise
+        return None
+
 
 class FormBase(BaseModel):
     title: str
     instructions: str | None = None
     form_content: str | None = None
+    intake_mode: FormIntakeModeEnum = FormIntakeModeEnum.direct
 
 class FormCreate(FormBase):
-    pass
+    @field_validator("form_content")
+    @classmethod
+    def check_definition(cls, form_content: str | None) -> str | None:
+        parse_form_definition(form_content, strict=True)
+        return form_content
 
 class FormSchema(FormBase):
     id: UUID
@@ -42,3 +42,27 @@ class RegistrationFullSchema(RegistrationBase):
     team: TeamSchema
 
     model_config = ConfigDict(from_attributes=True)
+
+class AnalyticsIntervalEnum(str, Enum):
+    hour = "hour"
+    day = "day"
+
+class RegistrationCountsSchema(BaseModel):
+    total_registrations: int
+    pending: int
+    confirmed: int
+    cancelled: int
+    unpaid: int
+    paid: int
+    refunded: int
+    conversion_rate: float
+    paid_ratio: float
+
+class RegistrationBucketSchema(RegistrationCountsSchema):
+    bucket: datetime
+
+class RegistrationAnalyticsSchema(BaseModel):
+    event_id: UUID
+    interval: AnalyticsIntervalEnum
+    totals: RegistrationCountsSchema
+    series: list[RegistrationBucketSchema]
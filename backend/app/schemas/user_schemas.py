@@ -50,11 +50,16 @@ class PasswordChange(BaseModel):
 
 class Token(BaseModel):
     access_token: str
+    refresh_token: str | None = None
     token_type: str = "bearer"
 
 
 class TokenData(BaseModel):
     id: UUID | None = None
+    role: UserRoleEnum | None = None
+    club_id: UUID | None = None
+    token_version: int | None = None
+    session_id: UUID | None = None
 
     def get_id(self) -> UUID | None:
         if self.id:
@@ -0,0 +1,16 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import engine, replica_engine
+from app.models.user_model import UserRoleEnum
+from app.schemas.admin_schemas import PoolStatusSchema
+from app.schemas.user_schemas import TokenData
+from app.exceptions.handler import UnauthorizedException
+
+
+async def get_pool_status(current_user: TokenData, db: AsyncSession) -> dict[str, PoolStatusSchema]:
+    if current_user.role != UserRoleEnum.admin:
+        raise UnauthorizedException("Admin user required")
+
+    pools = {"primary": PoolStatusSchema(**engine.pool.usage())}
+    if replica_engine is not engine:
+        pools["replica"] = PoolStatusSchema(**replica_engine.pool.usage())
+    return pools
@@ -0,0 +1,156 @@
+from collections import Counter
+from itertools import groupby
+from uuid import UUID
+from sqlalchemy import func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.errors import unique_violation
+from app.models.event_model import Event
+from app.models.submission_model import SubmissionQueue, SubmissionStatusEnum
+from app.models.team_model import TeamMember
+from app.schemas.form_schemas import FormResponseCreate
+from app.services.form_response_service import build_registration
+from app.services.registration_stats_service import (
+    apply_registration_delta,
+    lock_active_registration_count,
+    registration_counters,
+)
+from app.services.team_service import MEMBER_CONFLICTS
+
+MEMBER_TAKEN = "A team member is already registered for this event."
+EVENT_FULL = "This event is full."
+
+
+def member_keys(response_data: FormResponseCreate) -> set[tuple[str, str]]:
+    keys = {("email", member.member_email.lower()) for member in response_data.members}
+    keys.update(("student_id", member.member_student_id) for member in response_data.members if member.member_student_id)
+    return keys
+
+
+async def registered_member_keys(db: AsyncSession, event_id: UUID, submissions: list[FormResponseCreate]) -> set[tuple[str, str]]:
+    # One query for the whole batch, answered from the team_members unique indexes
+    wanted = set().union(*(member_keys(submission) for submission in submissions))
+    emails = [value for kind, value in wanted if kind == "email"]
+    student_ids = [value for kind, value in wanted if kind == "student_id"]
+    if not emails and not student_ids:
+        return set()
+    rows = await db.execute(
+        select(func.lower(TeamMember.member_email), TeamMember.member_student_id)
+        .filter(
+            TeamMember.event_id == event_id,
+            or_(func.lower(TeamMember.member_email).in_(emails), TeamMember.member_student_id.in_(student_ids)),
+        )
+    )
+    taken = set()
+    for email, student_id in rows:
+        taken.add(("email", email))
+        if student_id:
+            taken.add(("student_id", student_id))
+    return taken
+
+
+def settle(ticket: SubmissionQueue, status: SubmissionStatusEnum, detail: str | None = None, registration_id: UUID | None = None) -> None:
+    ticket.status = status
+    ticket.detail = detail
+    ticket.registration_id = registration_id
+    ticket.processed_at = func.now()
+
+
+async def admit_event_batch(db: AsyncSession, event_id: UUID, tickets: list[SubmissionQueue]) -> None:
+    # Tickets are in arrival order, so earlier submissions win both member
+    # collisions and the last free seats
+    capacity = await db.scalar(select(Event.max_participants).filter(Event.id == event_id))
+    submissions = {ticket.id: FormResponseCreate.model_validate(ticket.payload) for ticket in tickets}
+    taken = await registered_member_keys(db, event_id, list(submissions.values()))
+    # The counters row is locked before any member is inserted, capped event
+    # or not, in the same order as direct submissions take the two
+    active = await lock_active_registration_count(db, event_id)
+    free = None if capacity is None else capacity - active
+
+    # Seats are only counted as used once a registration is inserted: tickets
+    # that lose a member race during the insert give their seat to the next
+    # candidates in line
+    admitted = []
+    pending = tickets
+    while pending:
+        room = None if free is None else free - len(admitted)
+        if room is not None and room <= 0:
+            break
+        candidates, waiting = [], []
+        for ticket in pending:
+            keys = member_keys(submissions[ticket.id])
+            if keys & taken:
+                settle(ticket, SubmissionStatusEnum.rejected, MEMBER_TAKEN)
+            elif room is not None and len(candidates) >= room:
+                waiting.append(ticket)
+            else:
+                taken |= keys
+                candidates.append(ticket)
+        registrations = await insert_registrations(db, event_id, candidates, submissions)
+        for ticket in candidates:
+            registration = registrations.get(ticket.id)
+            if registration is None:
+                settle(ticket, SubmissionStatusEnum.rejected, MEMBER_TAKEN)
+                taken -= member_keys(submissions[ticket.id])
+            else:
+                admitted.append((ticket, registration))
+        pending = waiting
+    for ticket in pending:
+        settle(ticket, SubmissionStatusEnum.rejected, EVENT_FULL)
+
+    delta = Counter()
+    for ticket, registration in admitted:
+        delta.update(registration_counters(registration.status, registration.payment_status))
+        settle(ticket, SubmissionStatusEnum.accepted, registration_id=registration.id)
+    await apply_registration_delta(db, event_id, delta)
+
+
+async def insert_registrations(
+    db: AsyncSession,
+    event_id: UUID,
+    tickets: list[SubmissionQueue],
+    submissions: dict[UUID, FormResponseCreate],
+) -> dict:
+    if not tickets:
+        return {}
+    # The whole batch goes in with one flush; a direct submission can still
+    # race us onto the unique member indexes, in which case fall back to one
+    # savepoint per ticket to find the losers
+    try:
+        async with db.begin_nested():
+            registrations = {ticket.id: build_registration(event_id, ticket.form_id, submissions[ticket.id]) for ticket in tickets}
+            db.add_all(registrations.values())
+        return registrations
+    except IntegrityError as error:
+        if unique_violation(error) not in MEMBER_CONFLICTS:
+            raise
+
+    registrations = {}
+    for ticket in tickets:
+        try:
+            async with db.begin_nested():
+                registration = build_registration(event_id, ticket.form_id, submissions[ticket.id])
+                db.add(registration)
+            registrations[ticket.id] = registration
+        except IntegrityError as error:
+            # Anything but a member collision is a bug, not a lost race
+            if unique_violation(error) not in MEMBER_CONFLICTS:
+                raise
+    return registrations
+
+
+async def drain_submission_queue(db: AsyncSession, batch_size: int) -> int:
+    # SKIP LOCKED lets several workers claim disjoint batches; events are
+    # handled in id order so workers lock counter rows in the same order
+    tickets = (await db.scalars(
+        select(SubmissionQueue)
+        .filter(SubmissionQueue.status == SubmissionStatusEnum.queued)
+        .order_by(SubmissionQueue.created_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )).all()
+    ordered = sorted(tickets, key=lambda ticket: (ticket.event_id, ticket.created_at))
+    for event_id, event_tickets in groupby(ordered, key=lambda ticket: ticket.event_id):
+        await admit_event_batch(db, event_id, list(event_tickets))
+    await db.commit()
+    return len(tickets)
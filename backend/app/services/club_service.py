@@ -1,13 +1,24 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import List, NamedTuple, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Page, PageParams, paginate
 from uuid import UUID
 
+from app.core.cache import TTLCache
+from app.core.etag import row_fingerprint
+from app.core.config import settings
+from app.core.token_versions import token_version_floors
+from app.db.invalidation import commit_and_invalidate
 from app.models.club_model import Club, ClubStatusEnum
+from app.models.event_model import Event
+from app.models.form_model import Form
 from app.models.user_model import User, UserRoleEnum
 from app.schemas.club_schemas import ClubCreate, ClubSchema
 from app.schemas.user_schemas import TokenData
+from app.services.loader_options import club_schema_options
 from app.services.user_service import (
-    get_user_by_uuid,
+    bump_token_versions,
+    principals,
     CurrentUser
 )
 from app.exceptions.handler import (
@@ -18,12 +29,43 @@ from app.exceptions.handler import (
 )
 
 
-def create_club(current_user:TokenData, db: Session, payload: ClubCreate) -> ClubSchema:
-    user_club = db.query(Club).filter(Club.created_by == current_user.get_id()).first()
+
+# The subset of a club that routing and ownership checks need
+class ClubRef(NamedTuple):
+    id: UUID
+    created_by: UUID
+    status: ClubStatusEnum
+
+club_refs = TTLCache("club_refs", settings.CLUB_CACHE_MAX_ENTRIES, settings.CLUB_CACHE_TTL_SECONDS)
+
+
+def club_cache_keys(club: Club) -> list[str]:
+    return [f"slug:{club.slug}", f"id:{club.id}"]
+
+async def _load_club_ref(db: AsyncSession, key: str, criterion) -> Optional[ClubRef]:
+    ref = club_refs.get(key)
+    if ref is None:
+        row = (await db.execute(select(Club.id, Club.slug, Club.created_by, Club.status).filter(criterion))).one_or_none()
+        if row is None:
+            return None
+        ref = ClubRef(id=row.id, created_by=row.created_by, status=row.status)
+        club_refs.set(f"slug:{row.slug}", ref)
+        club_refs.set(f"id:{row.id}", ref)
+    return ref
+
+async def get_club_ref(db: AsyncSession, club_id: UUID) -> Optional[ClubRef]:
+    return await _load_club_ref(db, f"id:{club_id}", Club.id == club_id)
+
+async def get_club_ref_by_slug(db: AsyncSession, slug: str) -> Optional[ClubRef]:
+    return await _load_club_ref(db, f"slug:{slug}", Club.slug == slug)
+
+
+async def create_club(current_user:TokenData, db: AsyncSession, payload: ClubCreate) -> ClubSchema:
+    user_club = await db.scalar(select(Club).filter(Club.created_by == current_user.get_id()))
     if user_club is not None:
         raise ConflictException("User already has a club")
     
-    existing_slug = db.query(Club).filter(Club.slug == payload.slug).first()
+    existing_slug = await db.scalar(select(Club).filter(Club.slug == payload.slug))
     if existing_slug:
         raise ConflictException(f"Slug '{payload.slug}' already exists")
 
@@ -35,89 +77,102 @@ def create_club(current_user:TokenData, db: Session, payload: ClubCreate) -> Clu
         banner_url=str(payload.banner_url) if payload.banner_url else None,
         website=str(payload.website) if payload.website else None,
         created_by=current_user.get_id(),
+        events=[],
     )
     db.add(club)
-    db.commit()
-    db.refresh(club)
+    token_versions = await bump_token_versions(db, club.created_by)
+    await commit_and_invalidate(db, {club_refs: club_cache_keys(club), principals: [str(club.created_by)]})
+    token_version_floors.raise_floors(token_versions)
     return club
 
 
-def get_club(db: Session, club_id: UUID) -> ClubSchema:
-    club = db.query(Club).filter(Club.id == club_id).first()
+async def get_club(db: AsyncSession, club_id: UUID) -> ClubSchema:
+    club = await db.scalar(select(Club).options(*club_schema_options).filter(Club.id == club_id))
     if not club:
         raise NotFoundException(f"Club with id {club_id} not found")
     return club
 
-def get_club_by_slug(db: Session, slug: str) -> UUID:
-    club = db.query(Club).filter(Club.slug == slug).first()
+async def get_club_by_slug(db: AsyncSession, slug: str) -> UUID:
+    club = await get_club_ref_by_slug(db, slug)
     if not club:
         raise NotFoundException(f"Club with slug {slug} not found")
     return club.id
 
-def list_active_clubs(db: Session, skip: int = 0, limit: int = None) -> List[ClubSchema]:
-    return db.query(Club).filter(Club.status == ClubStatusEnum.active).offset(skip).limit(limit).all()
+async def list_active_clubs(db: AsyncSession, page: PageParams) -> Page[ClubSchema]:
+    return await paginate(db, select(Club).options(*club_schema_options).filter(Club.status == ClubStatusEnum.active), page, Club.created_at, Club.id)
+
+
+async def list_active_clubs_version(db: AsyncSession) -> str | None:
+    return await db.scalar(
+        select(row_fingerprint(
+            Club.id, Club.updated_at, Event.id, Event.updated_at, Form.id, Form.updated_at,
+            order_by=(Club.id, Event.id, Form.id),
+        ))
+        .select_from(Club)
+        .outerjoin(Event, Event.club_id == Club.id)
+        .outerjoin(Form, Form.event_id == Event.id)
+        .filter(Club.status == ClubStatusEnum.active)
+    )
 
 
-def list_pending_clubs(current_user:TokenData, db: Session, skip: int = 0, limit: int = None) -> List[ClubSchema]:
-    user = get_user_by_uuid(uuid=current_user.get_id(), db=db)
-    if user.role == UserRoleEnum.admin:
-        return db.query(Club).filter(Club.status == ClubStatusEnum.pending).offset(skip).limit(limit).all()
+async def list_pending_clubs(current_user:TokenData, db: AsyncSession, page: PageParams) -> Page[ClubSchema]:
+    if current_user.role == UserRoleEnum.admin:
+        return await paginate(db, select(Club).options(*club_schema_options).filter(Club.status == ClubStatusEnum.pending), page, Club.created_at, Club.id)
     else:
         raise UnauthorizedException("Admin user required")
-    
-def get_all_club(current_user:TokenData, db: Session, skip: int = 0, limit: int = None) -> List[ClubSchema]:
-    user = get_user_by_uuid(uuid=current_user.get_id(), db=db)
-    if user.role == UserRoleEnum.admin:
-        return db.query(Club).offset(skip).limit(limit).all()
+
+
+async def get_all_club(current_user:TokenData, db: AsyncSession, page: PageParams) -> Page[ClubSchema]:
+    if current_user.role == UserRoleEnum.admin:
+        return await paginate(db, select(Club).options(*club_schema_options), page, Club.created_at, Club.id)
     else:
         raise UnauthorizedException("Admin user required")
 
-# Approve a club
-def approve_club(current_user:TokenData, db: Session, club_id: UUID):
-    uuid = current_user.get_id()
-    user = get_user_by_uuid(uuid=uuid, db=db)
-    if user.role == UserRoleEnum.admin:
-        club = db.query(Club).filter(Club.id == club_id).first()
+
+async def approve_club(current_user:TokenData, db: AsyncSession, club_id: UUID):
+    if current_user.role == UserRoleEnum.admin:
+        club = await db.scalar(select(Club).filter(Club.id == club_id))
         if not club:
             return None
         club.status = ClubStatusEnum.active
-        club.approved_by = user.id
-        user.role = UserRoleEnum.club
-        db.commit()
-        db.refresh(club)
+        club.approved_by = current_user.id
+        # The club's owner becomes a club user, not the approving admin
+        owner = await db.get(User, club.created_by)
+        if owner and owner.role == UserRoleEnum.regular:
+            owner.role = UserRoleEnum.club
+        token_versions = await bump_token_versions(db, club.created_by)
+        await commit_and_invalidate(db, {club_refs: club_cache_keys(club), principals: [str(club.created_by)]})
+        token_version_floors.raise_floors(token_versions)
         return club
     else:
         raise UnauthorizedException("Admin user required")
     
 
 # Reject a club
-def reject_club(current_user:TokenData, db: Session, club_id: UUID):
-    uuid = current_user.get_id()
-    user = get_user_by_uuid(uuid=uuid, db=db)
-    if user.role == UserRoleEnum.admin:
-        club = db.query(Club).filter(Club.id == club_id).first()
+async def reject_club(current_user:TokenData, db: AsyncSession, club_id: UUID):
+    if current_user.role == UserRoleEnum.admin:
+        club = await db.scalar(select(Club).filter(Club.id == club_id))
         if not club:
             return None
         club.status = ClubStatusEnum.rejected
-        club.approved_by = user.id
-        db.commit()
-        db.refresh(club)
+        club.approved_by = current_user.id
+        await commit_and_invalidate(db, {club_refs: club_cache_keys(club), principals: [str(club.created_by)]})
         return club
     else:
         raise UnauthorizedException("Admin user required")
 
 
-def update_club(current_user:TokenData, club_id: UUID, updated_attributes: ClubCreate, db:Session) -> ClubSchema:
-    user = get_user_by_uuid(uuid=current_user.get_id(), db=db)
-    club = db.query(Club).filter(Club.id == club_id).first()
+async def update_club(current_user:TokenData, club_id: UUID, updated_attributes: ClubCreate, db:AsyncSession) -> ClubSchema:
+    club = await db.scalar(select(Club).options(*club_schema_options).filter(Club.id == club_id))
     if club is None:
         raise NotFoundException(f"Club with id {club_id} not found")
-    if club.created_by != user.id:
+    if club.created_by != current_user.get_id():
         raise UnauthorizedException("You are not the creator of this club")
     if updated_attributes.slug != club.slug:
-        existing_slug = db.query(Club).filter(Club.slug == updated_attributes.slug).first()
+        existing_slug = await db.scalar(select(Club).filter(Club.slug == updated_attributes.slug))
         if existing_slug:
             raise ConflictException(f"Slug '{updated_attributes.slug}' already exists")
+    stale_keys = club_cache_keys(club)
     club.name = updated_attributes.name
     club.slug = str(updated_attributes.slug).lower()
     club.description = updated_attributes.description
@@ -125,18 +180,19 @@ def update_club(current_user:TokenData, club_id: UUID, updated_attributes: ClubC
     club.banner_url = updated_attributes.banner_url
     club.website = updated_attributes.website
 
-    db.commit()
-    db.refresh(club)
+    await commit_and_invalidate(db, {club_refs: [*stale_keys, *club_cache_keys(club)]})
 
     return club
 
 
-def delete_club(current_user:TokenData, db: Session, club_id: UUID) -> None:
-    user = get_user_by_uuid(uuid=current_user.get_id(), db=db)
-    club = db.query(Club).filter(Club.id == club_id).first()
+async def delete_club(current_user:TokenData, db: AsyncSession, club_id: UUID) -> None:
+    club = await db.scalar(select(Club).filter(Club.id == club_id))
     if club is None:
         raise NotFoundException(f"Club with id {club_id} not found")
-    if club.created_by != user.id:
+    if club.created_by != current_user.get_id():
         raise UnauthorizedException("You are not the creator of this club")
-    db.delete(club)
-    db.commit()
+    keys = club_cache_keys(club)
+    await db.delete(club)
+    token_versions = await bump_token_versions(db, club.created_by)
+    await commit_and_invalidate(db, {club_refs: keys, principals: [str(club.created_by)]})
+    token_version_floors.raise_floors(token_versions)
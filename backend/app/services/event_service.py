@@ -1,12 +1,26 @@
-from typing import List
+from typing import List, NamedTuple
 from uuid import UUID
 from datetime import datetime, timedelta, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
+from app.core.pagination import Page, PageParams, keyset, page_of, paginate
 from app.models.event_model import Event, EventStatusEnum
-from app.models.club_model import Club, ClubStatusEnum
+from app.models.club_model import ClubStatusEnum
+from app.services.club_service import get_club_ref
 from app.models.user_model import User, UserRoleEnum
-from app.schemas.event_schemas import EventCreate, EventSchema, EventModelSchema
+from app.models.form_model import Form
+from app.core.etag import row_fingerprint
+from app.models.team_model import Team
+from app.schemas.event_schemas import EventCreate, EventSchema, EventModelSchema, EventFieldsSchema, EVENT_FIELDS, EVENT_SUMMARY_FIELDS
+from app.schemas.form_schemas import FormSchema
 from app.schemas.user_schemas import TokenData
+from app.services.loader_options import (
+    event_schema_options,
+    form_response_model_schema_options,
+    team_schema_options
+)
+from app.services.resource_service import EventContext
 from app.services.user_service import (
     get_user_by_uuid,
     CurrentUser
@@ -19,8 +33,73 @@ from app.exceptions.handler import (
     ForbiddenException
 )
 
-def create_event(current_user: TokenData, db: Session, data: EventCreate, club_id: UUID) -> EventSchema:
-    club = db.query(Club).filter(Club.id == club_id).first()
+
+# Columns and relationships requested through ?fields= and ?include=
+class EventSelection(NamedTuple):
+    fields: tuple[str, ...]
+    include: frozenset[str]
+
+
+def _split_param(value: str | None) -> list[str]:
+    return [part.strip() for part in value.split(",") if part.strip()] if value else []
+
+def event_selection(*allowed_includes: str):
+    def select_event_fields(fields: str | None = None, include: str | None = None) -> EventSelection:
+        requested = _split_param(fields) or list(EVENT_SUMMARY_FIELDS)
+        unknown = [field for field in requested if field not in EVENT_FIELDS]
+        if unknown:
+            raise BadRequestException(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(EVENT_FIELDS)}")
+        includes = set(_split_param(include))
+        unknown = includes.difference(allowed_includes)
+        if unknown:
+            raise BadRequestException(f"Unknown include: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed_includes)}")
+        if "forms.responses" in includes:
+            includes.add("forms")
+        return EventSelection(fields=tuple(dict.fromkeys(["id", *requested])), include=frozenset(includes))
+    return select_event_fields
+
+
+def event_selection_options(selection: EventSelection) -> list:
+    # created_at is always loaded for the page cursor but only serialized when asked for
+    options = [load_only(Event.created_at, *(getattr(Event, field) for field in selection.fields))]
+    if "forms" in selection.include:
+        forms = selectinload(Event.forms)
+        if "forms.responses" in selection.include:
+            forms = forms.options(*form_response_model_schema_options)
+        options.append(forms)
+    if "registrations" in selection.include:
+        options.append(selectinload(Event.registrations))
+    if "teams" in selection.include:
+        options.append(selectinload(Event.teams).options(*team_schema_options))
+    return options
+
+
+def serialize_event_selection(event: Event, selection: EventSelection) -> dict:
+    # Only selected keys are set, so response_model_exclude_unset drops the rest
+    data = {field: getattr(event, field) for field in selection.fields}
+    if "forms" in selection.include:
+        data["forms"] = []
+        for form in event.forms:
+            form_data = {field: getattr(form, field) for field in FormSchema.model_fields}
+            if "forms.responses" in selection.include:
+                form_data["responses"] = form.responses
+            data["forms"].append(form_data)
+    if "registrations" in selection.include:
+        data["registrations"] = event.registrations
+    if "teams" in selection.include:
+        data["teams"] = event.teams
+    return data
+
+
+async def list_selected_events(db: AsyncSession, selection: EventSelection, *criteria, page: PageParams) -> Page[EventFieldsSchema]:
+    stmt = select(Event).options(*event_selection_options(selection)).filter(*criteria)
+    result = page_of((await db.scalars(keyset(stmt, page, Event.created_at, Event.id))).all(), page, Event.created_at)
+    result["items"] = [serialize_event_selection(event, selection) for event in result["items"]]
+    return result
+
+
+async def create_event(current_user: TokenData, db: AsyncSession, data: EventCreate, club_id: UUID) -> EventSchema:
+    club = await get_club_ref(db, club_id)
     if not club:
         raise NotFoundException(f"Club with id {club_id} not found")
     if club.created_by != current_user.get_id():
@@ -37,87 +116,87 @@ def create_event(current_user: TokenData, db: Session, data: EventCreate, club_i
         registration_deadline = data.registration_deadline,
         location = data.location,
         max_participants = data.max_participants,
-        status = EventStatusEnum.draft
+        status = EventStatusEnum.draft,
+        forms = []
     )
     db.add(event)
-    db.commit()
-    db.refresh(event)
+    await db.commit()
     return event
 
 
-def get_published_events(db: Session, skip: int = 0, limit: int = None) -> List[EventSchema]:
-    return db.query(Event).filter(Event.status == EventStatusEnum.published).offset(skip).limit(limit).all()
+async def get_published_events(db: AsyncSession, page: PageParams) -> Page[EventSchema]:
+    return await paginate(db, select(Event).options(*event_schema_options).filter(Event.status == EventStatusEnum.published), page, Event.created_at, Event.id)
 
 
-def get_all_events_by_club(current_user: TokenData, club_id: UUID, db: Session, skip: int = 0, limit: int = None) -> List[EventModelSchema]:
-    club = db.query(Club).filter(Club.id == club_id).first()
+async def get_all_events_by_club(current_user: TokenData, club_id: UUID, db: AsyncSession, selection: EventSelection, page: PageParams) -> Page[EventFieldsSchema]:
+    club = await get_club_ref(db, club_id)
     if not club:
         raise NotFoundException(f"Club with id {club_id} not found")
     if club.created_by != current_user.get_id():
         raise UnauthorizedException
 
-    return db.query(Event).filter(Event.club_id == club_id).offset(skip).limit(limit).all()
+    return await list_selected_events(db, selection, Event.club_id == club_id, page=page)
 
 
-def get_published_events_by_club(club_id: UUID, db: Session, skip: int = 0, limit: int = None) -> List[EventSchema]:
-    club = db.query(Club).filter(Club.id == club_id).first()
+async def get_published_events_by_club(club_id: UUID, db: AsyncSession, selection: EventSelection, page: PageParams) -> Page[EventFieldsSchema]:
+    club = await get_club_ref(db, club_id)
     if not club:
         raise NotFoundException(f"Club with id {club_id} not found")
 
-    return db.query(Event).filter(Event.club_id == club_id).filter(Event.status == EventStatusEnum.published).offset(skip).limit(limit).all()
+    return await list_selected_events(db, selection, Event.club_id == club_id, Event.status == EventStatusEnum.published, page=page)
+
+
+async def get_published_events_by_club_version(club_id: UUID, db: AsyncSession) -> str | None:
+    return await db.scalar(
+        select(row_fingerprint(Event.id, Event.updated_at, Form.id, Form.updated_at, order_by=(Event.id, Form.id)))
+        .select_from(Event)
+        .outerjoin(Form, Form.event_id == Event.id)
+        .filter(Event.club_id == club_id)
+        .filter(Event.status == EventStatusEnum.published)
+    )
 
 
-def get_draft_events_by_club(current_user: TokenData, club_id: UUID, db: Session, skip: int = 0, limit: int = None) -> List[EventModelSchema]:
-    club = db.query(Club).filter(Club.id == club_id).first()
+async def get_draft_events_by_club(current_user: TokenData, club_id: UUID, db: AsyncSession, selection: EventSelection, page: PageParams) -> Page[EventFieldsSchema]:
+    club = await get_club_ref(db, club_id)
     if not club:
         raise NotFoundException(f"Club with id {club_id} not found")
     if club.created_by != current_user.get_id():
         raise UnauthorizedException
 
-    return db.query(Event).filter(Event.club_id == club_id).filter(Event.status == EventStatusEnum.draft).offset(skip).limit(limit).all()
+    return await list_selected_events(db, selection, Event.club_id == club_id, Event.status == EventStatusEnum.draft, page=page)
 
 
-def get_closed_events_by_club(current_user: TokenData, club_id: UUID, db: Session, skip: int = 0, limit: int = None) -> List[EventModelSchema]:
-    club = db.query(Club).filter(Club.id == club_id).first()
+async def get_closed_events_by_club(current_user: TokenData, club_id: UUID, db: AsyncSession, selection: EventSelection, page: PageParams) -> Page[EventFieldsSchema]:
+    club = await get_club_ref(db, club_id)
     if not club:
         raise NotFoundException(f"Club with id {club_id} not found")
     if club.created_by != current_user.get_id():
         raise UnauthorizedException
 
-    return db.query(Event).filter(Event.club_id == club_id).filter(Event.status == EventStatusEnum.closed).offset(skip).limit(limit).all()
+    return await list_selected_events(db, selection, Event.club_id == club_id, Event.status == EventStatusEnum.closed, page=page)
 
 
-def get_cancelled_events_by_club(current_user: TokenData, club_id: UUID, db: Session, skip: int = 0, limit: int = None) -> List[EventModelSchema]:
-    club = db.query(Club).filter(Club.id == club_id).first()
+async def get_cancelled_events_by_club(current_user: TokenData, club_id: UUID, db: AsyncSession, selection: EventSelection, page: PageParams) -> Page[EventFieldsSchema]:
+    club = await get_club_ref(db, club_id)
     if not club:
         raise NotFoundException(f"Club with id {club_id} not found")
     if club.created_by != current_user.get_id():
         raise UnauthorizedException
 
-    return db.query(Event).filter(Event.club_id == club_id).filter(Event.status == EventStatusEnum.cancelled).offset(skip).limit(limit).all()
+    return await list_selected_events(db, selection, Event.club_id == club_id, Event.status == EventStatusEnum.cancelled, page=page)
 
 
-def get_event(db: Session, club_id: UUID, event_id: UUID) -> EventSchema:
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    if event.club_id != club.id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    return event
+async def get_event_version(db: AsyncSession, club_id: UUID, event_id: UUID) -> str | None:
+    return await db.scalar(
+        select(row_fingerprint(Event.id, Event.updated_at, Form.id, Form.updated_at, order_by=(Form.id,)))
+        .select_from(Event)
+        .outerjoin(Form, Form.event_id == Event.id)
+        .filter(Event.id == event_id, Event.club_id == club_id)
+    )
 
 
-def update_event(current_user: TokenData, db: Session, club_id:UUID, event_id: UUID, data: EventCreate) -> EventSchema:
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    if event.club_id != club.id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    
-    if club.created_by != current_user.get_id():
-        raise ForbiddenException("You can not update this event. You are not the owner of the club.")
-    
+async def update_event(context: EventContext, db: AsyncSession, data: EventCreate) -> EventSchema:
+    event = context.event
     event.title = data.title
     event.slug = data.slug
     event.type = data.type
@@ -130,74 +209,32 @@ def update_event(current_user: TokenData, db: Session, club_id:UUID, event_id: U
     event.max_participants = data.max_participants
     event.updated_at = datetime.now(tz = timezone.utc)
     
-    db.commit()
-    db.refresh(event)
+    await db.commit()
     return event
 
 
-def delete_event(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID):
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    if event.club_id != club.id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    
-    if club.created_by != current_user.get_id():
-        raise ForbiddenException("You can not delete this event. You are not the owner of the club.")
-
-    db.delete(event)
-    db.commit()
+async def delete_event(context: EventContext, db: AsyncSession):
+    await db.delete(context.event)
+    await db.commit()
     return {"detail": "Event deleted successfully"}
 
 
-def publish_event(current_user: TokenData, club_id:UUID, event_id: UUID, db: Session) -> EventModelSchema:
-    user = db.query(User).filter(User.id == current_user.get_id()).first()
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if club.id != event.club_id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    if club.created_by != user.id:
-        raise UnauthorizedException
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    
+async def publish_event(context: EventContext, db: AsyncSession) -> EventModelSchema:
+    event = context.event
     event.status = EventStatusEnum.published
-    db.commit()
-    db.refresh(event)
+    await db.commit()
     return event
 
 
-def close_event(current_user: TokenData, club_id:UUID, event_id: UUID, db: Session) -> EventModelSchema:
-    user = db.query(User).filter(User.id == current_user.get_id()).first()
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if club.id != event.club_id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    if club.created_by != user.id:
-        raise UnauthorizedException
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    
+async def close_event(context: EventContext, db: AsyncSession) -> EventModelSchema:
+    event = context.event
     event.status = EventStatusEnum.closed
-    db.commit()
-    db.refresh(event)
+    await db.commit()
     return event
 
 
-def cancel_event(current_user: TokenData, club_id:UUID, event_id: UUID, db: Session) -> EventModelSchema:
-    user = db.query(User).filter(User.id == current_user.get_id()).first()
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if club.id != event.club_id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    if club.created_by != user.id:
-        raise UnauthorizedException
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    
+async def cancel_event(context: EventContext, db: AsyncSession) -> EventModelSchema:
+    event = context.event
     event.status = EventStatusEnum.cancelled
-    db.commit()
-    db.refresh(event)
-    return event
-
+    await db.commit()
+    return event
\ No newline at end of file
@@ -1,15 +1,24 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Page, PageParams, paginate
 from uuid import UUID
 from datetime import datetime, timezone
 from app.models.user_model import User, UserRoleEnum
-from app.models.club_model import Club, ClubStatusEnum
+from app.models.club_model import ClubStatusEnum
+from app.services.resource_service import EventContext
 from app.models.event_model import Event, EventStatusEnum
 from app.models.form_model import Form, FormResponse
 from app.models.team_model import Team, TeamMember
 from app.models.registration_model import Registration, RegistrationStatusEnum, PaymentStatusEnum
-from app.schemas.form_schemas import FormResponseCreate, FormResponseSchema, FormStatusEnum
+from app.models.submission_model import SubmissionQueue, SubmissionStatusEnum
+from app.schemas.form_schemas import FormResponseCreate, FormResponseSchema, FormStatusEnum, FormIntakeModeEnum, SubmissionTicketSchema
 from app.schemas.registration_schemas import RegistrationFullSchema
 from app.schemas.user_schemas import TokenData
+from app.services.form_validator_service import validate_form_response
+from app.services.idempotency_service import claim_idempotency_key, hash_request, store_idempotent_response
+from app.services.registration_stats_service import get_active_registration_count, record_registration_created
+from app.services.team_service import member_conflict
 from app.exceptions.handler import (
     UnauthorizedException,
     NotFoundException,
@@ -18,103 +27,146 @@ from app.exceptions.handler import (
     ForbiddenException
 )
 
-def create_form_response(db: Session, response_data: FormResponseCreate, form_id: UUID, event_id: UUID, club_id: UUID) -> RegistrationFullSchema:
-    form = db.query(Form).filter(Form.id == form_id).first()
+async def check_submission(context: EventContext, db: AsyncSession, response_data: FormResponseCreate) -> None:
+    form = context.form
 
-    if not form:
-        raise NotFoundException(f"Form with ID {form_id} not found")
-    
     if form.status != FormStatusEnum.published:
         raise BadRequestException("Form must be published to accept responses.")
-    
-    if response_data.members:
-        for member in response_data.members:
-            existing_member = (
-                db.query(TeamMember)
-                .join(Team, Team.id == TeamMember.team_id)
-                .filter(
-                    Team.event_id == event_id,
-                    (TeamMember.member_email == member.member_email)
-                    | (TeamMember.member_student_id == member.member_student_id)
-                )
-                .first()
-            )
-            if existing_member:
-                raise ConflictException(
-                    f"Member {member.member_name} ({member.member_email}) already registered for this event."
-                )
-            
+
+    validate_form_response(form, response_data.response_content)
+
+    members = response_data.members
+    if members:
+        student_ids = [member.member_student_id for member in members if member.member_student_id]
+        if len({member.member_email.lower() for member in members}) < len(members) or len(set(student_ids)) < len(student_ids):
+            raise BadRequestException("Each team member must have a unique email and student id.")
+
+    # Lock-free early exit once an event has sold out; the seat reservation
+    # is what actually guarantees the limit
+    capacity = context.event.max_participants
+    if capacity is not None and await get_active_registration_count(db, context.event.id) >= capacity:
+        raise ConflictException("This event is full.")
+
+def build_registration(event_id: UUID, form_id: UUID, response_data: FormResponseCreate) -> Registration:
     team = Team(
         event_id=event_id,
         team_name=response_data.team_name,
         leader_name=response_data.leader_name,
-        leader_email=response_data.leader_email
+        leader_email=response_data.leader_email,
+        members=[
+            TeamMember(
+                event_id=event_id,
+                member_name=member.member_name,
+                member_email=member.member_email,
+                member_student_id=member.member_student_id
+            )
+            for member in response_data.members
+        ]
     )
-    db.add(team)
-    db.commit()
-    db.refresh(team)
-
-    for member in response_data.members:
-        new_member = TeamMember(
-            team_id=team.id,
-            member_name=member.member_name,
-            member_email=member.member_email,
-            member_student_id=member.member_student_id
-        )
-        db.add(new_member)
-    db.commit()
-            
     form_response = FormResponse(
         form_id=form_id,
         response_content=response_data.response_content,
     )
-    db.add(form_response)
-    db.commit()
-    db.refresh(form_response)
-
-    registration = Registration(
+    return Registration(
         event_id=event_id,
-        form_response_id=form_response.id,
-        team_id=team.id,
+        form_response=form_response,
+        team=team,
         status=RegistrationStatusEnum.pending,
         payment_status=PaymentStatusEnum.unpaid,
         ticket_code=None
     )
-    db.add(registration)
-    db.commit()
-    db.refresh(registration)
 
-    registration.team = team
-    registration.team.members = db.query(TeamMember).filter(TeamMember.team_id == team.id).all()
-    registration.form_response = form_response
+async def add_form_response(context: EventContext, db: AsyncSession, response_data: FormResponseCreate) -> Registration:
+    await check_submission(context, db, response_data)
+
+    registration = build_registration(context.event.id, context.form.id, response_data)
+    # The seat is reserved before the members are written: the admission
+    # worker also locks the counters row before touching team_members, and
+    # taking the two in the same order keeps the paths from deadlocking
+    if not await record_registration_created(db, registration, context.event.max_participants):
+        await db.rollback()
+        raise ConflictException("This event is full.")
+    db.add(registration)
+    # A single flush writes the team, all members as one multi-row
+    # INSERT .. RETURNING, the response and the registration; nothing is
+    # committed until the caller does. Members already on a team for this
+    # event are rejected by the unique indexes on team_members.
+    try:
+        await db.flush()
+    except IntegrityError as error:
+        await db.rollback()
+        raise member_conflict(error)
+    return registration
 
+async def create_form_response(context: EventContext, db: AsyncSession, response_data: FormResponseCreate) -> RegistrationFullSchema:
+    registration = await add_form_response(context, db, response_data)
+    await db.commit()
     return registration
 
-def list_form_responses(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID, form_id: UUID) -> list[FormResponseSchema]:
-    event = db.query(Event).filter(Event.id == event_id, Event.club_id == club_id).first()
-    if not event:
-        raise NotFoundException("Event not found or not part of this club")
-    
-    club = db.query(Club).filter(Club.id == club_id).first()
-    if club.created_by != current_user.get_id():
-        raise UnauthorizedException
-
-    responses = db.query(FormResponse).filter(FormResponse.form_id == form_id).all()
-    return responses
-
-def get_form_response(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID, form_id: UUID, response_id: UUID) -> FormResponseSchema:
-    event = db.query(Event).filter(Event.id == event_id, Event.club_id == club_id).first()
-    if not event:
-        raise NotFoundException("Event not found or not part of this club")
-    
-    club = db.query(Club).filter(Club.id == club_id).first()
-    if club.created_by != current_user.get_id():
-        raise UnauthorizedException
-
-    response = db.query(FormResponse).filter(
+
+async def add_submission_ticket(context: EventContext, db: AsyncSession, response_data: FormResponseCreate) -> SubmissionQueue:
+    await check_submission(context, db, response_data)
+
+    ticket = SubmissionQueue(
+        form_id=context.form.id,
+        event_id=context.event.id,
+        payload=response_data.model_dump(mode="json"),
+        status=SubmissionStatusEnum.queued
+    )
+    db.add(ticket)
+    await db.flush()
+    return ticket
+
+async def enqueue_form_response(context: EventContext, db: AsyncSession, response_data: FormResponseCreate) -> SubmissionTicketSchema:
+    ticket = await add_submission_ticket(context, db, response_data)
+    await db.commit()
+    return ticket
+
+async def submit_form_response_idempotently(
+    context: EventContext,
+    db: AsyncSession,
+    response_data: FormResponseCreate,
+    idempotency_key: str
+) -> tuple[int, dict, bool]:
+    # Returns (status code, response body, replayed). The key is claimed in
+    # the same transaction as the submission, so a concurrent retry blocks
+    # on it until this one commits and then replays what it stored
+    stored = await claim_idempotency_key(db, context.form.id, idempotency_key, hash_request(response_data.model_dump(mode="json")))
+    if stored is not None:
+        return stored.status_code, stored.response, True
+
+    if context.form.intake_mode == FormIntakeModeEnum.queued:
+        ticket = await add_submission_ticket(context, db, response_data)
+        status_code, body = 202, SubmissionTicketSchema.model_validate(ticket).model_dump(mode="json")
+    else:
+        registration = await add_form_response(context, db, response_data)
+        status_code, body = 201, RegistrationFullSchema.model_validate(registration).model_dump(mode="json")
+    await store_idempotent_response(db, context.form.id, idempotency_key, status_code, body)
+    await db.commit()
+    return status_code, body, False
+
+
+async def get_submission_ticket(context: EventContext, db: AsyncSession, ticket_id: UUID) -> SubmissionTicketSchema:
+    ticket = await db.scalar(select(SubmissionQueue).filter(
+        SubmissionQueue.id == ticket_id,
+        SubmissionQueue.form_id == context.form.id
+    ))
+
+    if not ticket:
+        raise NotFoundException("Submission ticket not found")
+
+    return ticket
+
+
+async def list_form_responses(context: EventContext, db: AsyncSession, page: PageParams) -> Page[FormResponseSchema]:
+    return await paginate(db, select(FormResponse).filter(FormResponse.form_id == context.form.id), page, FormResponse.submitted_at, FormResponse.id)
+
+
+async def get_form_response(context: EventContext, db: AsyncSession, response_id: UUID) -> FormResponseSchema:
+    response = await db.scalar(select(FormResponse).filter(
         FormResponse.id == response_id,
-        FormResponse.form_id == form_id
-    ).first()
+        FormResponse.form_id == context.form.id
+    ))
 
     if not response:
         raise NotFoundException("Form response not found")
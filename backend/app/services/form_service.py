@@ -1,12 +1,16 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Page, PageParams, paginate
 from uuid import UUID
 from datetime import datetime, timezone
 from app.models.user_model import User, UserRoleEnum
-from app.models.club_model import Club, ClubStatusEnum
+from app.models.club_model import ClubStatusEnum
 from app.models.event_model import Event, EventStatusEnum
 from app.models.form_model import Form
 from app.schemas.form_schemas import FormCreate, FormSchema, FormStatusEnum
 from app.schemas.user_schemas import TokenData
+from app.services.form_validator_service import form_validators
+from app.services.resource_service import EventContext
 from app.exceptions.handler import (
     UnauthorizedException,
     NotFoundException,
@@ -15,181 +19,69 @@ from app.exceptions.handler import (
     ForbiddenException
 )
 
-def create_form(current_user: TokenData, db: Session, form_data: FormCreate, event_id: UUID, club_id: UUID) -> FormSchema:
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not club:
-        raise NotFoundException(f"Club with id {club_id} not found")
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    if event.club_id != club.id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    if club.created_by != current_user.get_id():
-        raise UnauthorizedException
-
+async def create_form(context: EventContext, db: AsyncSession, form_data: FormCreate) -> FormSchema:
     form = Form(
         title = form_data.title,
         instructions = form_data.instructions,
         form_content = form_data.form_content,
-        event_id = event.id,
+        intake_mode = form_data.intake_mode,
+        event_id = context.event.id,
         status = FormStatusEnum.draft
     )
     db.add(form)
-    db.commit()
-    db.refresh(form)
+    await db.commit()
     return form
 
-def get_form(db: Session, form_id: UUID, event_id: UUID, club_id: UUID):
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    if event.club_id != club.id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    
-    return db.query(Form).filter(Form.id == form_id).first()
-
-def get_published_forms(db: Session, event_id: UUID, club_id: UUID, skip: int = 0, limit: int = None):
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    if event.club_id != club.id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    
-    return db.query(Form).filter(Form.event_id == event.id).filter(Form.status == FormStatusEnum.published).offset(skip).limit(limit).all()
+async def get_published_forms(context: EventContext, db: AsyncSession, page: PageParams) -> Page[FormSchema]:
+    return await paginate(db, select(Form).filter(Form.event_id == context.event.id).filter(Form.status == FormStatusEnum.published), page, Form.created_at, Form.id)
 
-def get_draft_forms(db: Session, current_user: TokenData, event_id: UUID, club_id: UUID, skip: int = 0, limit: int = None):
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    if event.club_id != club.id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    if club.created_by != current_user.get_id():
-        raise UnauthorizedException
 
-    return db.query(Form).filter(Form.event_id == event.id).filter(Form.status == FormStatusEnum.draft).offset(skip).limit(limit).all()
+async def get_draft_forms(context: EventContext, db: AsyncSession, page: PageParams) -> Page[FormSchema]:
+    return await paginate(db, select(Form).filter(Form.event_id == context.event.id).filter(Form.status == FormStatusEnum.draft), page, Form.created_at, Form.id)
 
-def get_closed_forms(db: Session, current_user: TokenData, event_id: UUID, club_id: UUID, skip: int = 0, limit: int = None):
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    if event.club_id != club.id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    if club.created_by != current_user.get_id():
-        raise UnauthorizedException
 
-    return db.query(Form).filter(Form.event_id == event.id).filter(Form.status == FormStatusEnum.closed).offset(skip).limit(limit).all()
+async def get_closed_forms(context: EventContext, db: AsyncSession, page: PageParams) -> Page[FormSchema]:
+    return await paginate(db, select(Form).filter(Form.event_id == context.event.id).filter(Form.status == FormStatusEnum.closed), page, Form.created_at, Form.id)
 
-def get_all_forms(db: Session, current_user: TokenData, event_id: UUID, club_id: UUID, skip: int = 0, limit: int = None):
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    if event.club_id != club.id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    if club.created_by != current_user.get_id():
-        raise UnauthorizedException
 
-    return db.query(Form).filter(Form.event_id == event.id).offset(skip).limit(limit).all()
+async def get_all_forms(context: EventContext, db: AsyncSession, page: PageParams) -> Page[FormSchema]:
+    return await paginate(db, select(Form).filter(Form.event_id == context.event.id), page, Form.created_at, Form.id)
 
-def update_form(db: Session, current_user: TokenData, club_id: UUID, event_id: UUID, form_id: UUID, form_data: FormCreate):
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    if event.club_id != club.id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    if club.created_by != current_user.get_id():
-        raise ForbiddenException("You are not authorized to modify this form.")
 
-    form = db.query(Form).filter(Form.id == form_id).first()
-    if not form:
-        raise NotFoundException(f"Form with id {form_id} not found")
-    
+async def update_form(context: EventContext, db: AsyncSession, form_data: FormCreate):
+    form = context.form
     form.title = form_data.title
     form.instructions = form_data.instructions
     form.form_content = form_data.form_content
+    form.intake_mode = form_data.intake_mode
     form.updated_at = datetime.now(tz = timezone.utc)
 
-    db.commit()
-    db.refresh(form)
+    await db.commit()
+    form_validators.invalidate(str(form.id))
     return form
 
-def delete_form(db: Session, current_user: TokenData, club_id: UUID, event_id: UUID, form_id: UUID):
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    if event.club_id != club.id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    if club.created_by != current_user.get_id():
-        raise ForbiddenException("You are not authorized to modify this form.")
-
-    form = db.query(Form).filter(Form.id == form_id).first()
-    if not form:
-        raise NotFoundException(f"Form with id {form_id} not found")
-    
-    db.delete(form)
-    db.commit()
+async def delete_form(context: EventContext, db: AsyncSession):
+    form = context.form
+    await db.delete(form)
+    await db.commit()
+    form_validators.invalidate(str(form.id))
     return form
 
-def publish_form(db: Session, current_user: TokenData, club_id: UUID, event_id: UUID, form_id: UUID):
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    if event.club_id != club.id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    if club.created_by != current_user.get_id():
-        raise ForbiddenException("You are not authorized to modify this form.")
-
-    form = db.query(Form).filter(Form.id == form_id).first()
-    if not form:
-        raise NotFoundException(f"Form with id {form_id} not found")
-    
+async def publish_form(context: EventContext, db: AsyncSession):
+    form = context.form
     form.status = FormStatusEnum.published
-    db.commit()
-    db.refresh(form)
+    await db.commit()
+    form_validators.invalidate(str(form.id))
     return form
 
-def draft_form(db: Session, current_user: TokenData, club_id: UUID, event_id: UUID, form_id: UUID):
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    if event.club_id != club.id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    if club.created_by != current_user.get_id():
-        raise ForbiddenException("You are not authorized to modify this form.")
-
-    form = db.query(Form).filter(Form.id == form_id).first()
-    if not form:
-        raise NotFoundException(f"Form with id {form_id} not found")
-    
+async def draft_form(context: EventContext, db: AsyncSession):
+    form = context.form
     form.status = FormStatusEnum.draft
-    db.commit()
-    db.refresh(form)
+    await db.commit()
     return form
 
-def close_form(db: Session, current_user: TokenData, club_id: UUID, event_id: UUID, form_id: UUID):
-    club = db.query(Club).filter(Club.id == club_id).first()
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise NotFoundException(f"Event with id {event_id} not found")
-    if event.club_id != club.id:
-        raise NotFoundException(f"Event with id {event_id} not found in club with id {club_id}")
-    if club.created_by != current_user.get_id():
-        raise ForbiddenException("You are not authorized to modify this form.")
-
-    form = db.query(Form).filter(Form.id == form_id).first()
-    if not form:
-        raise NotFoundException(f"Form with id {form_id} not found")
-    
+async def close_form(context: EventContext, db: AsyncSession):
+    form = context.form
     form.status = FormStatusEnum.closed
-    db.commit()
-    db.refresh(form)
-    return form
-
+    await db.commit()
+    return form
\ No newline at end of file
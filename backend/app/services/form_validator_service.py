@@ -0,0 +1,79 @@
+from datetime import date
+from typing import Annotated, Any, List, Literal
+from pydantic import AnyHttpUrl, BaseModel, ConfigDict, EmailStr, Field, ValidationError, create_model
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.form_model import Form
+from app.schemas.form_schemas import FormDefinition, FormField, FormFieldTypeEnum, parse_form_definition
+from app.exceptions.handler import UnprocessableEntityException
+
+# form id -> (form updated_at, compiled model or None for free-text forms).
+# updated_at changes on every edit and status change, so a worker that missed
+# an invalidation still recompiles instead of using an old definition
+form_validators = TTLCache("form_validators", settings.FORM_VALIDATOR_CACHE_MAX_ENTRIES, settings.FORM_VALIDATOR_CACHE_TTL_SECONDS)
+
+
+class FormResponseModel(BaseModel):
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
+
+def _field_type(field: FormField) -> Any:
+    if field.type in (FormFieldTypeEnum.text, FormFieldTypeEnum.textarea):
+        return Annotated[str, Field(min_length=field.min_length, max_length=field.max_length)]
+    if field.type == FormFieldTypeEnum.email:
+        return EmailStr
+    if field.type == FormFieldTypeEnum.url:
+        return AnyHttpUrl
+    if field.type == FormFieldTypeEnum.number:
+        return Annotated[float, Field(ge=field.min, le=field.max)]
+    if field.type == FormFieldTypeEnum.integer:
+        return Annotated[int, Field(ge=field.min, le=field.max)]
+    if field.type == FormFieldTypeEnum.boolean:
+        return bool
+    if field.type == FormFieldTypeEnum.date:
+        return date
+    choice = Literal[tuple(field.options)]
+    if field.type == FormFieldTypeEnum.select:
+        return choice
+    return Annotated[List[choice], Field(min_length=field.min_length, max_length=field.max_length)]
+
+
+def compile_form_definition(definition: FormDefinition) -> type[BaseModel]:
+    # Fields get positional attribute names and take the user's name as their
+    # alias, so names like `model_config` or `_secret` cannot clash with
+    # pydantic's own attributes
+    fields = {}
+    for index, field in enumerate(definition.fields):
+        field_type = _field_type(field)
+        if field.required:
+            fields[f"field_{index}"] = (field_type, Field(alias=field.name, title=field.label))
+        else:
+            fields[f"field_{index}"] = (field_type | None, Field(default=None, alias=field.name, title=field.label))
+    return create_model("FormResponseContent", __base__=FormResponseModel, **fields)
+
+
+def get_form_validator(form: Form) -> type[BaseModel] | None:
+    key = str(form.id)
+    cached = form_validators.get(key)
+    if cached is not None and cached[0] == form.updated_at:
+        return cached[1]
+    validator = None
+    definition = parse_form_definition(form.form_content)
+    if definition is not None:
+        validator = compile_form_definition(definition)
+    form_validators.set(key, (form.updated_at, validator))
+    return validator
+
+
+def validate_form_response(form: Form, response_content: str) -> None:
+    validator = get_form_validator(form)
+    if validator is None:
+        return
+    try:
+        validator.model_validate_json(response_content)
+    except ValidationError as error:
+        problems = "; ".join(
+            f"{'.'.join(str(part) for part in problem['loc']) or 'response'}: {problem['msg']}"
+            for problem in error.errors(include_url=False)
+        )
+        raise UnprocessableEntityException(f"Response does not match the form: {problems}")
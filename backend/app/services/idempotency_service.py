@@ -0,0 +1,50 @@
+import hashlib
+import json
+from datetime import timedelta
+from uuid import UUID
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.idempotency_model import IdempotencyKey
+from app.exceptions.handler import UnprocessableEntityException
+
+
+def hash_request(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+async def claim_idempotency_key(db: AsyncSession, form_id: UUID, key: str, request_hash: str) -> IdempotencyKey | None:
+    # Inserting the key first makes a concurrent request with the same key
+    # wait on the unique index until ours commits or rolls back. Returns None
+    # when the key is ours to process, or the stored outcome to replay.
+    # Expired keys are taken over as if they were new.
+    expired = IdempotencyKey.created_at < func.now() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+    stmt = insert(IdempotencyKey).values(form_id=form_id, key=key, request_hash=request_hash)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.form_id, IdempotencyKey.key],
+        set_={"request_hash": stmt.excluded.request_hash, "status_code": None, "response": None, "created_at": func.now()},
+        where=expired,
+    )
+    if (await db.execute(stmt.returning(IdempotencyKey.key))).first():
+        return None
+
+    stored = await db.scalar(select(IdempotencyKey).filter(IdempotencyKey.form_id == form_id, IdempotencyKey.key == key))
+    if stored.request_hash != request_hash:
+        raise UnprocessableEntityException("Idempotency-Key was already used with a different request")
+    return stored
+
+
+async def store_idempotent_response(db: AsyncSession, form_id: UUID, key: str, status_code: int, response: dict) -> None:
+    await db.execute(
+        update(IdempotencyKey)
+        .filter(IdempotencyKey.form_id == form_id, IdempotencyKey.key == key)
+        .values(status_code=status_code, response=response)
+    )
+
+
+async def purge_expired_idempotency_keys(db: AsyncSession) -> int:
+    result = await db.execute(
+        delete(IdempotencyKey).filter(IdempotencyKey.created_at < func.now() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS))
+    )
+    return result.rowcount
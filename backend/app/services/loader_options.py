@@ -0,0 +1,40 @@
+from sqlalchemy.orm import selectinload
+from app.models.club_model import Club
+from app.models.event_model import Event
+from app.models.form_model import Form
+from app.models.registration_model import Registration
+from app.models.team_model import Team
+from app.models.user_model import User
+
+# Loader options per response schema, named after the schema they feed. Every
+# relationship a schema serializes is loaded up front with one SELECT ... IN
+# per level, so the query count of an endpoint does not grow with its rows
+# (lazy loads cannot run during serialization on an AsyncSession anyway).
+
+# TeamSchema: members
+team_schema_options = (selectinload(Team.members),)
+
+# FormResponseModelSchema: responses
+form_response_model_schema_options = (selectinload(Form.responses),)
+
+# EventSchema: forms
+event_schema_options = (selectinload(Event.forms),)
+
+# EventModelSchema: forms with responses, registrations, teams with members
+event_model_schema_options = (
+    selectinload(Event.forms).options(*form_response_model_schema_options),
+    selectinload(Event.registrations),
+    selectinload(Event.teams).options(*team_schema_options),
+)
+
+# ClubSchema: events as EventSchema
+club_schema_options = (selectinload(Club.events).options(*event_schema_options),)
+
+# UserSchema: the owned club as ClubSchema
+user_schema_options = (selectinload(User.club).options(*club_schema_options),)
+
+# RegistrationFullSchema: the form response and the team as TeamSchema
+registration_full_schema_options = (
+    selectinload(Registration.form_response),
+    selectinload(Registration.team).options(*team_schema_options),
+)
@@ -0,0 +1,80 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.token_versions import revoked_sessions
+from app.db.invalidation import notify_revoked_sessions
+from app.models.refresh_token_model import RefreshToken
+from app.exceptions.handler import UnauthorizedException
+
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def add_refresh_token(db: AsyncSession, user_id: UUID, session_id: UUID) -> str:
+    token = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        session_id=session_id,
+        user_id=user_id,
+        token_hash=hash_refresh_token(token),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return token
+
+
+async def find_session_id(db: AsyncSession, token: str) -> UUID | None:
+    return await db.scalar(select(RefreshToken.session_id).filter(RefreshToken.token_hash == hash_refresh_token(token)))
+
+
+async def revoke_sessions(db: AsyncSession, *criteria) -> list[str]:
+    # Call before committing, then add the returned ids to revoked_sessions
+    rows = await db.execute(
+        update(RefreshToken)
+        .filter(RefreshToken.revoked_at.is_(None), *criteria)
+        .values(revoked_at=func.now())
+        .returning(RefreshToken.session_id)
+        .execution_options(synchronize_session=False)
+    )
+    session_ids = sorted({str(session_id) for session_id in rows.scalars()})
+    await notify_revoked_sessions(db, session_ids)
+    return session_ids
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> RefreshToken:
+    # Marks the presented token used; the caller adds its successor and commits
+    row = await db.scalar(
+        select(RefreshToken)
+        .filter(RefreshToken.token_hash == hash_refresh_token(token))
+        .with_for_update()
+    )
+    if row is None or row.revoked_at is not None or row.expires_at <= datetime.now(timezone.utc):
+        raise UnauthorizedException("Invalid refresh token")
+    if row.used_at is not None:
+        # A rotated token came back, so someone holds a copy: end the whole session
+        session_ids = await revoke_sessions(db, RefreshToken.session_id == row.session_id)
+        await db.commit()
+        revoked_sessions.add(*session_ids)
+        raise UnauthorizedException("Refresh token reuse detected, session revoked")
+    row.used_at = datetime.now(timezone.utc)
+    return row
+
+
+async def load_revoked_sessions(db: AsyncSession) -> None:
+    # Access tokens outlive their session's revocation by at most one token
+    # lifetime. Merged rather than replaced, so a revocation added locally
+    # while this query ran is not lost.
+    rows = await db.scalars(
+        select(RefreshToken.session_id)
+        .filter(RefreshToken.revoked_at > func.now() - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+        .distinct()
+    )
+    revoked_sessions.add(*(str(session_id) for session_id in rows))
+
+
+async def purge_expired_refresh_tokens(db: AsyncSession) -> int:
+    result = await db.execute(delete(RefreshToken).filter(RefreshToken.expires_at < func.now()))
+    return result.rowcount
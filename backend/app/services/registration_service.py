@@ -1,15 +1,20 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Page, PageParams, paginate
 from uuid import UUID
 from datetime import datetime, timezone
 from app.models.user_model import User, UserRoleEnum
-from app.models.club_model import Club, ClubStatusEnum
+from app.models.club_model import ClubStatusEnum
+from app.services.resource_service import EventContext
 from app.models.event_model import Event, EventStatusEnum
 from app.models.form_model import Form, FormResponse
 from app.models.team_model import Team, TeamMember
 from app.models.registration_model import Registration, RegistrationStatusEnum, PaymentStatusEnum
 from app.schemas.form_schemas import FormResponseCreate, FormResponseSchema, FormStatusEnum
-from app.schemas.registration_schemas import RegistrationSchema, RegistrationFullSchema
+from app.schemas.registration_schemas import RegistrationSchema, RegistrationFullSchema, RegistrationAnalyticsSchema, AnalyticsIntervalEnum
 from app.schemas.user_schemas import TokenData
+from app.services.loader_options import registration_full_schema_options
+from app.services.registration_stats_service import get_event_registration_stats, get_registration_analytics, record_registration_changed
 from app.exceptions.handler import (
     UnauthorizedException,
     NotFoundException,
@@ -18,66 +23,58 @@ from app.exceptions.handler import (
     ForbiddenException
 )
 
-def get_all_registrations(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID) -> list[RegistrationSchema]:
-    event = db.query(Event).filter(Event.id == event_id, Event.club_id == club_id).first()
-    if not event:
-        raise NotFoundException("Event not found or not part of this club")
-
-    club = db.query(Club).filter(Club.id == club_id).first()
-    if club.created_by != current_user.get_id():
-        raise UnauthorizedException
-    
-    registrations = db.query(Registration).filter(Registration.event_id == event_id).all()
-    return registrations
-
-def get_registration(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID, registration_id: UUID) -> RegistrationFullSchema:
-    event = db.query(Event).filter(Event.id == event_id, Event.club_id == club_id).first()
-    if not event:
-        raise NotFoundException("Event not found or not part of this club")
-
-    club = db.query(Club).filter(Club.id == club_id).first()
-    if club.created_by != current_user.get_id():
-        raise UnauthorizedException
-    
-    registration = db.query(Registration).filter(Registration.id == registration_id).first()
+
+async def get_all_registrations(context: EventContext, db: AsyncSession, page: PageParams) -> Page[RegistrationSchema]:
+    return await paginate(db, select(Registration).filter(Registration.event_id == context.event.id), page, Registration.registered_at, Registration.id)
+
+
+async def get_registration(context: EventContext, db: AsyncSession, registration_id: UUID, for_update: bool = False) -> RegistrationFullSchema:
+    query = (
+        select(Registration)
+        .options(*registration_full_schema_options)
+        .filter(Registration.id == registration_id, Registration.event_id == context.event.id)
+    )
+    if for_update:
+        # Status changes lock the row so concurrent updates can't both apply a counter delta
+        query = query.with_for_update(of=Registration)
+    registration = await db.scalar(query)
     if not registration:
         raise NotFoundException("Registration not found")
-    
-    form_response = db.query(FormResponse).filter(FormResponse.id == registration.form_response_id)
-    team = db.query(Team).filter(Team.id == registration.team_id).first()
-    team_members = db.query(TeamMember).filter(TeamMember.team_id == registration.team_id).all()
-
-    registration.team = team
-    registration.team.members = team_members
-    registration.form_response = form_response
 
     return registration
 
-def confirm_registration(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID, registration_id: UUID) -> RegistrationSchema:
-    registration = get_registration(current_user, db, club_id, event_id, registration_id)
+async def confirm_registration(context: EventContext, db: AsyncSession, registration_id: UUID) -> RegistrationSchema:
+    registration = await get_registration(context, db, registration_id, for_update=True)
 
     if registration.status == RegistrationStatusEnum.confirmed:
         raise ConflictException("Registration is already confirmed")
 
+    before = (registration.status, registration.payment_status)
     registration.status = RegistrationStatusEnum.confirmed
-    db.commit()
-    db.refresh(registration)
+    # Confirming a cancelled registration takes its seat back, if one is free
+    if not await record_registration_changed(
+        db, registration.event_id, before, (registration.status, registration.payment_status), context.event.max_participants
+    ):
+        raise ConflictException("This event is full.")
+    await db.commit()
     return registration
 
-def cancel_registration(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID, registration_id: UUID) -> RegistrationSchema:
-    registration = get_registration(current_user, db, club_id, event_id, registration_id)
+async def cancel_registration(context: EventContext, db: AsyncSession, registration_id: UUID) -> RegistrationSchema:
+    registration = await get_registration(context, db, registration_id, for_update=True)
 
     if registration.status == RegistrationStatusEnum.cancelled:
         raise ConflictException("Registration is already cancelled")
 
+    before = (registration.status, registration.payment_status)
     registration.status = RegistrationStatusEnum.cancelled
-    db.commit()
-    db.refresh(registration)
+    await record_registration_changed(db, registration.event_id, before, (registration.status, registration.payment_status))
+    await db.commit()
     return registration
 
-def update_payment_status(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID, registration_id: UUID, payment_status: str) -> RegistrationSchema:
-    registration = get_registration(current_user, db, club_id, event_id, registration_id)
+async def update_payment_status(context: EventContext, db: AsyncSession, registration_id: UUID, payment_status: str) -> RegistrationSchema:
+    registration = await get_registration(context, db, registration_id, for_update=True)
 
+    before = (registration.status, registration.payment_status)
     if payment_status == "paid":
         registration.payment_status = PaymentStatusEnum.paid
         ts = int(datetime.now(timezone.utc).timestamp())
@@ -89,32 +86,20 @@ def update_payment_status(current_user: TokenData, db: Session, club_id: UUID, e
     else:
         raise BadRequestException(f"Invalid payment status")
 
-    
-    db.commit()
-    db.refresh(registration)
+    await record_registration_changed(db, registration.event_id, before, (registration.status, registration.payment_status))
+    await db.commit()
     return registration
 
-def get_registration_stats(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID):
-    event = db.query(Event).filter(Event.id == event_id, Event.club_id == club_id).first()
-    if not event:
-        raise NotFoundException("Event not found or not part of this club")
-
-    club = db.query(Club).filter(Club.id == club_id).first()
-    if not club or club.created_by != current_user.get_id():
-        raise UnauthorizedException
-
-    total = db.query(Registration).filter(Registration.event_id == event_id).count()
-    confirmed = db.query(Registration).filter(Registration.event_id == event_id, Registration.status == RegistrationStatusEnum.confirmed).count()
-    cancelled = db.query(Registration).filter(Registration.event_id == event_id, Registration.status == RegistrationStatusEnum.cancelled).count()
-    paid = db.query(Registration).filter(Registration.event_id == event_id, Registration.payment_status == PaymentStatusEnum.paid).count()
-    unpaid = db.query(Registration).filter(Registration.event_id == event_id, Registration.payment_status == PaymentStatusEnum.unpaid).count()
-    refunded = db.query(Registration).filter(Registration.event_id == event_id, Registration.payment_status == PaymentStatusEnum.refunded).count()
-
+async def get_registration_stats(context: EventContext, db: AsyncSession):
+    stats = await get_event_registration_stats(db, context.event.id)
     return {
-        "total_registrations": total,
-        "confirmed": confirmed,
-        "cancelled": cancelled,
-        "paid": paid,
-        "unpaid": unpaid,
-        "refunded": refunded
-    }
\ No newline at end of file
+        "total_registrations": stats["total_registrations"],
+        "confirmed": stats["confirmed"],
+        "cancelled": stats["cancelled"],
+        "paid": stats["paid"],
+        "unpaid": stats["unpaid"],
+        "refunded": stats["refunded"]
+    }
+
+async def get_registration_analytics_by_interval(context: EventContext, db: AsyncSession, interval: AnalyticsIntervalEnum) -> RegistrationAnalyticsSchema:
+    return await get_registration_analytics(db, context.event.id, interval)
\ No newline at end of file
@@ -0,0 +1,164 @@
+from collections import Counter
+from uuid import UUID
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.registration_model import (
+    EventRegistrationStats,
+    PaymentStatusEnum,
+    Registration,
+    RegistrationStatusEnum,
+)
+from app.schemas.registration_schemas import AnalyticsIntervalEnum
+
+STATS_COLUMNS = ("total_registrations", *RegistrationStatusEnum.__members__, *PaymentStatusEnum.__members__)
+
+# Keyed by (event_id, interval); a dashboard polling every few seconds reads
+# the cached series instead of rescanning the event's registrations
+registration_analytics = TTLCache(
+    "registration_analytics",
+    settings.REGISTRATION_ANALYTICS_CACHE_MAX_ENTRIES,
+    settings.REGISTRATION_ANALYTICS_CACHE_TTL_SECONDS,
+)
+
+
+def registration_count_columns() -> tuple:
+    return (
+        func.count().label("total_registrations"),
+        *(func.count().filter(Registration.status == status).label(status.value) for status in RegistrationStatusEnum),
+        *(func.count().filter(Registration.payment_status == status).label(status.value) for status in PaymentStatusEnum),
+    )
+
+
+def registration_counters(status: RegistrationStatusEnum, payment_status: PaymentStatusEnum) -> Counter:
+    return Counter({"total_registrations": 1, status.value: 1, payment_status.value: 1})
+
+
+async def apply_registration_delta(db: AsyncSession, event_id: UUID, delta: Counter, capacity: int | None = None) -> bool:
+    # Runs inside the caller's transaction; the upsert row-locks the event's
+    # counters until commit so concurrent deltas apply one after another.
+    # With a capacity, a delta that takes seats only applies while they are
+    # free: waiters re-check the condition against the committed counts, so
+    # the event can never be oversold. Returns False when it is full.
+    delta = {column: value for column, value in delta.items() if value}
+    if not delta:
+        return True
+    seats = delta.get("total_registrations", 0) - delta.get("cancelled", 0)
+    if capacity is None or seats <= 0:
+        where = None
+    elif seats > capacity:
+        return False
+    else:
+        where = EventRegistrationStats.total_registrations - EventRegistrationStats.cancelled + seats <= capacity
+    stmt = insert(EventRegistrationStats).values(event_id=event_id, **delta)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EventRegistrationStats.event_id],
+        set_={
+            **{column: getattr(EventRegistrationStats, column) + stmt.excluded[column] for column in delta},
+            "updated_at": func.now(),
+        },
+        where=where,
+    )
+    return (await db.execute(stmt.returning(EventRegistrationStats.event_id))).first() is not None
+
+
+async def record_registration_created(db: AsyncSession, registration: Registration, capacity: int | None = None) -> bool:
+    return await apply_registration_delta(
+        db, registration.event_id, registration_counters(registration.status, registration.payment_status), capacity
+    )
+
+
+async def record_registration_changed(
+    db: AsyncSession,
+    event_id: UUID,
+    before: tuple[RegistrationStatusEnum, PaymentStatusEnum],
+    after: tuple[RegistrationStatusEnum, PaymentStatusEnum],
+    capacity: int | None = None,
+) -> bool:
+    delta = registration_counters(*after)
+    delta.subtract(registration_counters(*before))
+    return await apply_registration_delta(db, event_id, delta, capacity)
+
+
+async def get_active_registration_count(db: AsyncSession, event_id: UUID) -> int:
+    active = await db.scalar(
+        select(EventRegistrationStats.total_registrations - EventRegistrationStats.cancelled)
+        .filter(EventRegistrationStats.event_id == event_id)
+    )
+    return active or 0
+
+
+async def lock_active_registration_count(db: AsyncSession, event_id: UUID) -> int:
+    # Holds the event's counters row until commit, so seats counted here stay
+    # free for the caller; pair with apply_registration_delta without capacity
+    await db.execute(insert(EventRegistrationStats).values(event_id=event_id).on_conflict_do_nothing())
+    return await db.scalar(
+        select(EventRegistrationStats.total_registrations - EventRegistrationStats.cancelled)
+        .filter(EventRegistrationStats.event_id == event_id)
+        .with_for_update()
+    )
+
+
+async def get_event_registration_stats(db: AsyncSession, event_id: UUID) -> dict[str, int]:
+    stats = await db.get(EventRegistrationStats, event_id)
+    return {column: getattr(stats, column) if stats else 0 for column in STATS_COLUMNS}
+
+
+async def recompute_registration_stats(db: AsyncSession, event_id: UUID) -> tuple[dict[str, int], dict[str, int]]:
+    # Lock the counters row first: writers that already applied a delta hold it
+    # until they commit, and later writers wait for us, so the counts below
+    # cannot miss or double-count a registration
+    await db.execute(insert(EventRegistrationStats).values(event_id=event_id).on_conflict_do_nothing())
+    stats = await db.scalar(
+        select(EventRegistrationStats)
+        .filter(EventRegistrationStats.event_id == event_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    previous = {column: getattr(stats, column) for column in STATS_COLUMNS}
+    row = (await db.execute(
+        select(*registration_count_columns()).filter(Registration.event_id == event_id)
+    )).one()
+    counts = row._asdict()
+    for column in STATS_COLUMNS:
+        setattr(stats, column, counts[column])
+    return previous, counts
+
+
+def _with_ratios(counts: dict) -> dict:
+    total = counts["total_registrations"]
+    return {
+        **counts,
+        "conversion_rate": counts["confirmed"] / total if total else 0.0,
+        "paid_ratio": counts["paid"] / total if total else 0.0,
+    }
+
+
+async def get_registration_analytics(db: AsyncSession, event_id: UUID, interval: AnalyticsIntervalEnum) -> dict:
+    cached = registration_analytics.get((event_id, interval))
+    if cached is not None:
+        return cached
+
+    # One pass over the event's registrations: FILTER counts per bucket, and
+    # the ROLLUP grand-total row (bucket NULL) gives the overall figures
+    bucket = func.date_trunc(interval.value, Registration.registered_at, "UTC").label("bucket")
+    rows = (await db.execute(
+        select(bucket, *registration_count_columns())
+        .filter(Registration.event_id == event_id)
+        .group_by(func.rollup(bucket))
+        .order_by(bucket.asc().nulls_first())
+    )).all()
+    totals = {column: 0 for column in STATS_COLUMNS}
+    series = []
+    for row in rows:
+        counts = row._asdict()
+        if counts.pop("bucket") is None:
+            totals = counts
+        else:
+            series.append({"bucket": row.bucket, **_with_ratios(counts)})
+
+    analytics = {"event_id": event_id, "interval": interval, "totals": _with_ratios(totals), "series": series}
+    registration_analytics.set((event_id, interval), analytics)
+    return analytics
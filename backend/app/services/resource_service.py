@@ -0,0 +1,75 @@
+from typing import NamedTuple, Optional
+from uuid import UUID
+from fastapi import Depends
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.deps import get_db
+from app.models.club_model import Club
+from app.models.event_model import Event
+from app.models.form_model import Form
+from app.schemas.user_schemas import TokenData
+from app.services.club_service import ClubRef
+from app.services.user_service import get_current_user
+from app.exceptions.handler import (
+    NotFoundException,
+    ForbiddenException
+)
+
+
+# Club, event and (for form routes) form addressed by a nested route
+class EventContext(NamedTuple):
+    club: ClubRef
+    event: Event
+    form: Optional[Form] = None
+
+
+async def resolve_event(db: AsyncSession, slug: str, event_id: UUID, form_id: UUID | None = None, options=(), current_user: TokenData | None = None) -> EventContext:
+    # One round trip: the club by slug, outer-joined to the event and form so a
+    # miss still tells us which of the three is absent
+    query = (
+        select(Club.id, Club.created_by, Club.status, Event)
+        .select_from(Club)
+        .outerjoin(Event, and_(Event.id == event_id, Event.club_id == Club.id))
+        .filter(Club.slug == slug)
+        .options(*options)
+    )
+    if form_id is not None:
+        query = query.add_columns(Form).outerjoin(Form, and_(Form.id == form_id, Form.event_id == Event.id))
+    row = (await db.execute(query)).first()
+    if row is None:
+        raise NotFoundException(f"Club with slug {slug} not found")
+    club = ClubRef(id=row.id, created_by=row.created_by, status=row.status)
+    if current_user is not None and club.created_by != current_user.get_id():
+        raise ForbiddenException("You are not the owner of this club")
+    if row.Event is None:
+        raise NotFoundException(f"Event with id {event_id} not found in club {slug}")
+    if form_id is None:
+        return EventContext(club=club, event=row.Event)
+    if row.Form is None:
+        raise NotFoundException(f"Form with id {form_id} not found in event with id {event_id}")
+    return EventContext(club=club, event=row.Event, form=row.Form)
+
+
+# Dependency factories; FastAPI resolves each dependency once per request and
+# shares the route's session, so services never look the resources up again.
+# options are loader options for the event, matching the route's response schema.
+def event_resolver(*options, owner: bool = True, session=get_db):
+    if owner:
+        async def resolve_owned_event(slug: str, event_id: UUID, current_user: TokenData = Depends(get_current_user), db: AsyncSession = Depends(session)) -> EventContext:
+            return await resolve_event(db, slug, event_id, options=options, current_user=current_user)
+        return resolve_owned_event
+
+    async def resolve_public_event(slug: str, event_id: UUID, db: AsyncSession = Depends(session)) -> EventContext:
+        return await resolve_event(db, slug, event_id, options=options)
+    return resolve_public_event
+
+
+def form_resolver(*options, owner: bool = True, session=get_db):
+    if owner:
+        async def resolve_owned_form(slug: str, event_id: UUID, form_id: UUID, current_user: TokenData = Depends(get_current_user), db: AsyncSession = Depends(session)) -> EventContext:
+            return await resolve_event(db, slug, event_id, form_id, options=options, current_user=current_user)
+        return resolve_owned_form
+
+    async def resolve_public_form(slug: str, event_id: UUID, form_id: UUID, db: AsyncSession = Depends(session)) -> EventContext:
+        return await resolve_event(db, slug, event_id, form_id, options=options)
+    return resolve_public_form
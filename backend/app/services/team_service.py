@@ -1,7 +1,12 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Page, PageParams, paginate
+from app.db.errors import unique_violation
 from uuid import UUID
 from datetime import datetime, timezone
-from app.models.club_model import Club
+from app.services.loader_options import team_schema_options
+from app.services.resource_service import EventContext
 from app.models.event_model import Event
 from app.models.team_model import Team, TeamMember
 from app.schemas.team_schemas import TeamSchema, TeamMemberSchema, TeamBase, TeamMemberBase
@@ -14,39 +19,32 @@ from app.exceptions.handler import (
 )
 
 
-def verify_club_event_access(db: Session, current_user: TokenData, club_id: UUID, event_id: UUID):
-    event = db.query(Event).filter(Event.id == event_id, Event.club_id == club_id).first()
-    if not event:
-        raise NotFoundException("Event not found or not part of this club")
+MEMBER_CONFLICTS = {
+    "uq_team_members_event_id_email": "A team member with this email is already registered for this event.",
+    "uq_team_members_event_id_student_id": "A team member with this student id is already registered for this event.",
+}
 
-    club = db.query(Club).filter(Club.id == club_id).first()
-    if not club or club.created_by != current_user.get_id():
-        raise UnauthorizedException
 
-    return event
+def member_conflict(error: IntegrityError) -> ConflictException:
+    message = MEMBER_CONFLICTS.get(unique_violation(error))
+    if message is None:
+        raise error
+    return ConflictException(message)
 
 
-def get_all_teams(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID) -> list[TeamSchema]:
-    verify_club_event_access(db, current_user, club_id, event_id)
-    teams = db.query(Team).filter(Team.event_id == event_id).all()
-    for team in teams:
-        team.members = db.query(TeamMember).filter(TeamMember.team_id == team.id).all()
-    return teams
+async def get_all_teams(context: EventContext, db: AsyncSession, page: PageParams) -> Page[TeamSchema]:
+    return await paginate(db, select(Team).options(*team_schema_options).filter(Team.event_id == context.event.id), page, Team.created_at, Team.id)
 
 
-def get_team(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID, team_id: UUID) -> TeamSchema:
-    verify_club_event_access(db, current_user, club_id, event_id)
-    team = db.query(Team).filter(Team.id == team_id, Team.event_id == event_id).first()
+async def get_team(context: EventContext, db: AsyncSession, team_id: UUID) -> TeamSchema:
+    team = await db.scalar(select(Team).options(*team_schema_options).filter(Team.id == team_id, Team.event_id == context.event.id))
     if not team:
         raise NotFoundException("Team not found in this event")
-
-    team.members = db.query(TeamMember).filter(TeamMember.team_id == team_id).all()
     return team
 
 
-def update_team_info(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID, team_id: UUID, update_data: TeamBase):
-    verify_club_event_access(db, current_user, club_id, event_id)
-    team = db.query(Team).filter(Team.id == team_id, Team.event_id == event_id).first()
+async def update_team_info(context: EventContext, db: AsyncSession, team_id: UUID, update_data: TeamBase):
+    team = await db.scalar(select(Team).options(*team_schema_options).filter(Team.id == team_id, Team.event_id == context.event.id))
     if not team:
         raise NotFoundException("Team not found")
 
@@ -55,24 +53,23 @@ def update_team_info(current_user: TokenData, db: Session, club_id: UUID, event_
     team.leader_email = update_data.leader_email
     team.updated_at = datetime.now(timezone.utc)
 
-    db.commit()
-    db.refresh(team)
+    await db.commit()
     return team
 
 
-def get_team_members(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID, team_id: UUID) -> list[TeamMemberSchema]:
-    verify_club_event_access(db, current_user, club_id, event_id)
-    team = db.query(Team).filter(Team.id == team_id, Team.event_id == event_id).first()
+async def get_team_members(context: EventContext, db: AsyncSession, team_id: UUID, page: PageParams) -> Page[TeamMemberSchema]:
+    team = await db.scalar(select(Team).filter(Team.id == team_id, Team.event_id == context.event.id))
     if not team:
         raise NotFoundException("Team not found")
 
-    members = db.query(TeamMember).filter(TeamMember.team_id == team_id).all()
-    return members
+    return await paginate(db, select(TeamMember).filter(TeamMember.team_id == team_id), page, TeamMember.created_at, TeamMember.id)
 
 
-def update_team_member(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID, member_id: UUID, update_data: TeamMemberBase):
-    verify_club_event_access(db, current_user, club_id, event_id)
-    member = db.query(TeamMember).filter(TeamMember.id == member_id).first()
+async def update_team_member(context: EventContext, db: AsyncSession, team_id: UUID, member_id: UUID, update_data: TeamMemberBase):
+    member = await db.scalar(
+        select(TeamMember)
+        .filter(TeamMember.id == member_id, TeamMember.team_id == team_id, TeamMember.event_id == context.event.id)
+    )
     if not member:
         raise NotFoundException("Team member not found")
 
@@ -81,17 +78,22 @@ def update_team_member(current_user: TokenData, db: Session, club_id: UUID, even
     member.member_student_id = update_data.member_student_id
     member.updated_at = datetime.now(timezone.utc)
 
-    db.commit()
-    db.refresh(member)
+    try:
+        await db.commit()
+    except IntegrityError as error:
+        await db.rollback()
+        raise member_conflict(error)
     return member
 
 
-def delete_team_member(current_user: TokenData, db: Session, club_id: UUID, event_id: UUID, member_id: UUID):
-    verify_club_event_access(db, current_user, club_id, event_id)
-    member = db.query(TeamMember).filter(TeamMember.id == member_id).first()
+async def delete_team_member(context: EventContext, db: AsyncSession, team_id: UUID, member_id: UUID):
+    member = await db.scalar(
+        select(TeamMember)
+        .filter(TeamMember.id == member_id, TeamMember.team_id == team_id, TeamMember.event_id == context.event.id)
+    )
     if not member:
         raise NotFoundException("Team member not found")
 
-    db.delete(member)
-    db.commit()
-    return {"message": "Team member removed successfully"}
+    await db.delete(member)
+    await db.commit()
+    return {"message": "Team member removed successfully"}
\ No newline at end of file
@@ -1,17 +1,30 @@
-import traceback
+import asyncio
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Annotated
+from typing import Annotated, NamedTuple
 from uuid import UUID, uuid4
 from passlib.context import CryptContext
 import jwt
 from jwt import PyJWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Page, PageParams, paginate
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from fastapi import Depends, Cookie,  Response
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.token_versions import revoked_sessions, token_version_floors
+from app.db.deps import get_db
+from app.db.invalidation import commit_and_invalidate, notify_token_versions
 from app.models.user_model import User, UserRoleEnum
-from app.models.club_model import Club
+from app.models.club_model import Club, ClubStatusEnum
 from app.models.event_model import Event
+from app.models.refresh_token_model import RefreshToken
+from app.services.loader_options import user_schema_options
+from app.services.refresh_token_service import add_refresh_token, find_session_id, revoke_sessions, rotate_refresh_token
 from app.schemas.user_schemas import Token, TokenData, UserCreate, UserUpdate, UserSchema, PasswordChange
 from app.exceptions.handler import (
     UnauthorizedException,
@@ -21,25 +34,66 @@ from app.exceptions.handler import (
 )
 
 
+logger = logging.getLogger(__name__)
+
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl='/api/auth/token')
-bcrypt_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+bcrypt_context = CryptContext(
+    schemes=['bcrypt'],
+    deprecated='auto',
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+# bcrypt takes hundreds of milliseconds per call and releases the GIL, so it
+# runs on a few dedicated threads instead of blocking the event loop
+password_hashing_pool = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hashing")
+
+
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt_context.verify(plain_password, hashed_password)
+# What authorization checks need to know about the caller
+class Principal(NamedTuple):
+    id: UUID
+    role: UserRoleEnum
+    club_id: UUID | None
+    club_status: ClubStatusEnum | None
+    token_version: int
 
-def get_password_hash(password: str) -> str:
-    return bcrypt_context.hash(password)
+principals = TTLCache("principals", settings.PRINCIPAL_CACHE_MAX_ENTRIES, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+# Decoded access tokens by SHA-256 digest, each kept no longer than the token is valid
+verified_tokens = TTLCache("verified_tokens", settings.VERIFIED_TOKEN_CACHE_MAX_ENTRIES, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
 
-def authenticate_user(email: str, password: str, db: Session) -> User | Exception:
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(plain_password=password, hashed_password=user.password):
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(password_hashing_pool, bcrypt_context.verify, plain_password, hashed_password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    # The second item is a fresh hash when the stored one uses another cost
+    return await asyncio.get_running_loop().run_in_executor(password_hashing_pool, bcrypt_context.verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(password_hashing_pool, bcrypt_context.hash, password)
+
+async def authenticate_user(email: str, password: str, db: AsyncSession) -> User | Exception:
+    user = await db.scalar(select(User).filter(User.email == email))
+    if not user:
         raise UnauthorizedException("Authentication Failed! Wrong email or password")
+    valid, new_hash = await verify_and_update_password(plain_password=password, hashed_password=user.password)
+    if not valid:
+        raise UnauthorizedException("Authentication Failed! Wrong email or password")
+    if new_hash:
+        user.password = new_hash
+        await db.commit()
     return user
 
-def create_access_token(email: str, uuid: UUID, expires_delta: timedelta) -> str:
+def create_access_token(email: str, principal: Principal, session_id: UUID, expires_delta: timedelta) -> str:
+    # role and club_id let authorization checks skip the database; ver marks
+    # the claims stale once the user's token version moves past it
     payload = {
         'sub': email,
-        'id': str(uuid),
+        'id': str(principal.id),
+        'role': principal.role.value,
+        'club_id': str(principal.club_id) if principal.club_id else None,
+        'ver': principal.token_version,
+        'sid': str(session_id),
         'exp': datetime.now(timezone.utc) + expires_delta
     }
 
@@ -48,90 +102,158 @@ def create_access_token(email: str, uuid: UUID, expires_delta: timedelta) -> str
 def verify_token(token: str) -> TokenData:
     if not token or token.count('.') != 2:
         raise UnauthorizedException("Invalid token format")
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload['id']
-        return TokenData(id=user_id)
-    except PyJWTError as error:
-        print(traceback.format_exc())
-        raise UnauthorizedException(error)
+    digest = hashlib.sha256(token.encode()).digest()
+    current_user = verified_tokens.get(digest)
+    if current_user is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], options={"require": ["exp"]})
+        except PyJWTError as error:
+            logger.info("Rejected access token: %s", error)
+            raise UnauthorizedException(str(error))
+        current_user = TokenData(id=payload['id'], role=payload.get('role'), club_id=payload.get('club_id'), token_version=payload.get('ver'), session_id=payload.get('sid'))
+        verified_tokens.set(digest, current_user, ttl_seconds=payload['exp'] - time.time())
+    # Revocation is checked on every call, cached or not
+    if current_user.session_id is not None and str(current_user.session_id) in revoked_sessions:
+        raise UnauthorizedException("Session has been revoked")
+    return current_user
     
 def get_token_from_cookie(access_token: str | None = Cookie(None)) -> str:
     if not access_token:
         raise UnauthorizedException("Not authenticated")
     return access_token
     
-def register_user(db: Session, user: UserCreate) -> UserSchema:
-    if db.query(User).filter((User.email == user.email)).first():
+async def register_user(db: AsyncSession, user: UserCreate) -> UserSchema:
+    if await db.scalar(select(User).filter((User.email == user.email))):
         raise ConflictException("User with this email or username already exists")
     new_user = User(
         id = uuid4(),
         name = user.name,
         email = user.email,
-        password = get_password_hash(user.password),
-        university_id = user.university_id
+        password = await get_password_hash(user.password),
+        university_id = user.university_id,
+        club = None
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
 
     return new_user
 
-def get_current_user(token: Annotated[str, Depends(get_token_from_cookie)]) -> TokenData:
-    return verify_token(token)
+async def get_current_user(token: Annotated[str, Depends(get_token_from_cookie)], db: AsyncSession = Depends(get_db)) -> TokenData:
+    current_user = verify_token(token)
+    if token_version_floors.accepts(str(current_user.id), current_user.token_version):
+        return current_user
+    # Claims changed since the token was issued (or it predates them); read them again
+    try:
+        principal = await get_principal(uuid=current_user.id, db=db)
+        if not token_version_floors.accepts(str(principal.id), principal.token_version):
+            # Cached before a change this worker only learned of on a reload
+            principals.invalidate(str(principal.id))
+            principal = await get_principal(uuid=current_user.id, db=db)
+    except NotFoundException:
+        raise UnauthorizedException("Not authenticated")
+    return TokenData(id=principal.id, role=principal.role, club_id=principal.club_id, token_version=principal.token_version, session_id=current_user.session_id)
 
 CurrentUser = Annotated[TokenData, Depends(get_current_user)]
 
-def login_user(data: Annotated[OAuth2PasswordRequestForm, Depends()], db: Session) -> Token:
+async def login_user(data: Annotated[OAuth2PasswordRequestForm, Depends()], db: AsyncSession) -> Token:
     # Check if there are no users in the DB
-    has_user = db.query(User).first()
+    has_user = await db.scalar(select(User.id).limit(1))
 
     # If DB is empty, and login matches ADMIN credentials → auto-register admin
     if not has_user and data.username == settings.ADMIN_EMAIL and data.password == settings.ADMIN_PASSWORD:
-        from uuid import uuid4
         admin_user = User(
             id=uuid4(),
             name=settings.ADMIN_USERNAME,
             email=settings.ADMIN_EMAIL,
-            password=get_password_hash(settings.ADMIN_PASSWORD),
+            password=await get_password_hash(settings.ADMIN_PASSWORD),
             role = UserRoleEnum.admin
         )
         db.add(admin_user)
-        db.commit()
-        db.refresh(admin_user)
+        await db.commit()
         user = admin_user
     else:
         # Normal authentication
-        user = authenticate_user(data.username, data.password, db)
+        user = await authenticate_user(data.username, data.password, db)
         if not user:
             raise UnauthorizedException("Authentication Failed! Wrong email or password")
 
     # Create JWT token
-    token = create_access_token(user.email, user.id, timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
-    return Token(access_token=token, token_type='bearer')
+    return await issue_tokens(db, user.id, user.email, uuid4())
+
+async def issue_tokens(db: AsyncSession, user_id: UUID, email: str, session_id: UUID) -> Token:
+    principal = await get_principal(uuid=user_id, db=db)
+    refresh_token = add_refresh_token(db, user_id, session_id)
+    await db.commit()
+    access_token = create_access_token(email, principal, session_id, timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+    return Token(access_token=access_token, refresh_token=refresh_token, token_type='bearer')
+
+async def refresh_access_token(db: AsyncSession, refresh_token: str) -> Token:
+    # Rotation: the presented token is spent and a new one issued in the same session
+    row = await rotate_refresh_token(db, refresh_token)
+    email = await db.scalar(select(User.email).filter(User.id == row.user_id))
+    return await issue_tokens(db, row.user_id, email, row.session_id)
 
 
-def get_user_by_uuid(uuid: UUID, db: Session) -> User:
+async def get_user_by_uuid(uuid: UUID, db: AsyncSession) -> User:
     if isinstance(uuid, str):
         try:
             uuid = UUID(uuid)
         except ValueError:
             raise BadRequestException("Invalid UUID")
-    user = db.query(User).filter(User.id == uuid).first()
-    if not user.club:
-        user.club = None
+    user = await db.scalar(select(User).options(*user_schema_options).filter(User.id == uuid))
     if not user:
         raise NotFoundException(f"User with ID {uuid} not found")
     return user
 
-def update_user(current_user: TokenData, uuid: UUID, updated_attributes: UserUpdate, db: Session) -> UserSchema:
-    user = db.query(User).filter(User.id == uuid).first()
-    curr_user = db.query(User).filter(User.id == current_user.get_id()).first()
+async def get_principal(uuid: UUID, db: AsyncSession) -> Principal:
+    if isinstance(uuid, str):
+        try:
+            uuid = UUID(uuid)
+        except ValueError:
+            raise BadRequestException("Invalid UUID")
+    principal = principals.get(str(uuid))
+    if principal is None:
+        row = (await db.execute(
+            select(User.id, User.role, User.token_version, Club.id.label("club_id"), Club.status.label("club_status"))
+            .outerjoin(Club, Club.created_by == User.id)
+            .filter(User.id == uuid)
+        )).first()
+        if not row:
+            raise NotFoundException(f"User with ID {uuid} not found")
+        principal = Principal(id=row.id, role=row.role, club_id=row.club_id, club_status=row.club_status, token_version=row.token_version)
+        principals.set(str(uuid), principal)
+    return principal
+
+async def bump_token_versions(db: AsyncSession, *user_ids: UUID) -> dict[str, int]:
+    # Call before commit_and_invalidate, then raise the local floors once committed
+    rows = await db.execute(
+        update(User)
+        .filter(User.id.in_(user_ids))
+        .values(token_version=User.token_version + 1, token_version_changed_at=func.now())
+        .returning(User.id, User.token_version)
+        .execution_options(synchronize_session=False)
+    )
+    versions = {str(row.id): row.token_version for row in rows}
+    await notify_token_versions(db, versions)
+    return versions
+
+async def load_token_version_floors(db: AsyncSession) -> None:
+    # Tokens issued before a change expire within one token lifetime, so older
+    # bumps don't matter. Floors only ever rise, so reloads merge into them.
+    rows = await db.execute(
+        select(User.id, User.token_version)
+        .filter(User.token_version_changed_at > func.now() - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+    )
+    token_version_floors.raise_floors({str(row.id): row.token_version for row in rows})
+
+async def update_user(current_user: TokenData, uuid: UUID, updated_attributes: UserUpdate, db: AsyncSession) -> UserSchema:
+    user = await db.scalar(select(User).options(*user_schema_options).filter(User.id == uuid))
+    curr_user = await db.scalar(select(User).filter(User.id == current_user.get_id()))
     if not user:
         raise NotFoundException(f"User with ID {uuid} not found")
     if user.email != updated_attributes.email:
-        if db.query(User).filter(User.email == updated_attributes.email).first():
+        if await db.scalar(select(User).filter(User.email == updated_attributes.email)):
             raise ConflictException(f"User with email {updated_attributes.email} already exists")
 
     if updated_attributes.email is not None:
@@ -142,39 +264,58 @@ def update_user(current_user: TokenData, uuid: UUID, updated_attributes: UserUpd
         user.university_id = updated_attributes.university_id
     user.updated_at = datetime.now(tz = timezone.utc)
 
-    db.commit()
-    db.refresh(user)
+    await commit_and_invalidate(db, {principals: [str(user.id)]})
 
     return user
 
-def change_password(current_user: TokenData, new_password: PasswordChange, db: Session) -> None:
+async def change_password(current_user: TokenData, new_password: PasswordChange, db: AsyncSession) -> None:
     uuid = current_user.get_id()
-    user = get_user_by_uuid(uuid=uuid, db=db)
+    user = await get_user_by_uuid(uuid=uuid, db=db)
 
     if new_password.new_password == new_password.current_password:
         raise ConflictException("New password can not be the same as the old password")
 
-    if not verify_password(new_password.current_password, user.password):
+    if not await verify_password(new_password.current_password, user.password):
         raise UnauthorizedException("Wrong password")
     
     if new_password.new_password != new_password.new_password_confirm:
         raise BadRequestException("New password does not match confirm new password")
     
-    user.password = get_password_hash(new_password.new_password)
-    db.commit()
+    user.password = await get_password_hash(new_password.new_password)
+    # Sign out every other session; the one changing the password stays
+    criteria = [RefreshToken.user_id == user.id]
+    if current_user.session_id is not None:
+        criteria.append(RefreshToken.session_id != current_user.session_id)
+    session_ids = await revoke_sessions(db, *criteria)
+    await commit_and_invalidate(db, {principals: [str(user.id)]})
+    revoked_sessions.add(*session_ids)
 
-def logout_user(response: Response):
+async def logout_user(response: Response, db: AsyncSession, access_token: str | None, refresh_token: str | None):
+    session_id = await find_session_id(db, refresh_token) if refresh_token else None
+    if session_id is None and access_token:
+        try:
+            session_id = verify_token(access_token).session_id
+        except UnauthorizedException:
+            pass
+    if session_id is not None:
+        session_ids = await revoke_sessions(db, RefreshToken.session_id == session_id)
+        await db.commit()
+        revoked_sessions.add(*session_ids)
     response.delete_cookie(
         key="access_token",
         path="/",
         httponly=True
     )
+    response.delete_cookie(
+        key="refresh_token",
+        path="/api/auth",
+        httponly=True
+    )
 
 # List all users
-def list_users(current_user:TokenData, db: Session) -> list[UserSchema]:
+async def list_users(current_user:TokenData, db: AsyncSession, page: PageParams) -> Page[UserSchema]:
     uuid = current_user.get_id()
-    user = get_user_by_uuid(uuid=uuid, db=db)
-    if user.role == UserRoleEnum.admin:
-        return db.query(User).filter(User.id != uuid).all()
+    if current_user.role == UserRoleEnum.admin:
+        return await paginate(db, select(User).options(*user_schema_options).filter(User.id != uuid), page, User.created_at, User.id)
     else:
-        raise UnauthorizedException("Admin user required")
+        raise UnauthorizedException("Admin user required")
\ No newline at end of file
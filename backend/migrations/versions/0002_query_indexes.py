@@ -0,0 +1,60 @@
+"""query indexes
+
+Adds the indexes behind the service-layer filters. The unique=True that
+every primary key also declared never produced a second index (Postgres
+folds it into the primary key), so it is only removed from the models.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns); built concurrently so live tables stay writable
+INDEXES = (
+    ("ix_clubs_status", "clubs", ["status"]),
+    ("ix_clubs_created_by", "clubs", ["created_by"]),
+    ("ix_events_status", "events", ["status"]),
+    ("ix_events_club_id_status", "events", ["club_id", "status"]),
+    ("ix_forms_event_id_status", "forms", ["event_id", "status"]),
+    ("ix_form_responses_form_id", "form_responses", ["form_id"]),
+    ("ix_teams_event_id", "teams", ["event_id"]),
+    ("ix_team_members_team_id", "team_members", ["team_id"]),
+    ("ix_team_members_member_email", "team_members", ["member_email"]),
+    ("ix_team_members_member_student_id", "team_members", ["member_student_id"]),
+    ("ix_registrations_event_id_status", "registrations", ["event_id", "status"]),
+    ("ix_registrations_event_id_payment_status", "registrations", ["event_id", "payment_status"]),
+)
+
+
+def drop_invalid_index(name: str, table: str) -> None:
+    # A failed or cancelled concurrent build leaves an INVALID index under
+    # the name, which IF NOT EXISTS would then skip; drop it and build again
+    invalid = op.get_bind().scalar(
+        sa.text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    )
+    if invalid:
+        op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            drop_invalid_index(name, table)
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
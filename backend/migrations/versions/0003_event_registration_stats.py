@@ -0,0 +1,60 @@
+"""event registration stats
+
+Adds the per-event registration counters and backfills them from the
+existing registrations.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_registration_stats",
+        sa.Column("event_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("total_registrations", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("pending", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("confirmed", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("cancelled", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("unpaid", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("paid", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("refunded", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("event_id"),
+    )
+    op.execute(
+        """
+        INSERT INTO event_registration_stats
+            (event_id, total_registrations, pending, confirmed, cancelled, unpaid, paid, refunded)
+        SELECT
+            event_id,
+            count(*),
+            count(*) FILTER (WHERE status = 'pending'),
+            count(*) FILTER (WHERE status = 'confirmed'),
+            count(*) FILTER (WHERE status = 'cancelled'),
+            count(*) FILTER (WHERE payment_status = 'unpaid'),
+            count(*) FILTER (WHERE payment_status = 'paid'),
+            count(*) FILTER (WHERE payment_status = 'refunded')
+        FROM registrations
+        WHERE event_id IS NOT NULL
+        GROUP BY event_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("event_registration_stats")
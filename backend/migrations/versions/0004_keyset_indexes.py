@@ -0,0 +1,73 @@
+"""keyset indexes
+
+Adds (scope, created_at, id) indexes behind cursor pagination so each page
+is a range scan from the cursor, and drops the indexes they supersede as a
+leading prefix.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns); built concurrently so live tables stay writable
+INDEXES = (
+    ("ix_users_created_at_id", "users", ["created_at", "id"]),
+    ("ix_clubs_created_at_id", "clubs", ["created_at", "id"]),
+    ("ix_clubs_status_created_at_id", "clubs", ["status", "created_at", "id"]),
+    ("ix_events_club_id_created_at_id", "events", ["club_id", "created_at", "id"]),
+    ("ix_events_club_id_status_created_at_id", "events", ["club_id", "status", "created_at", "id"]),
+    ("ix_forms_event_id_created_at_id", "forms", ["event_id", "created_at", "id"]),
+    ("ix_forms_event_id_status_created_at_id", "forms", ["event_id", "status", "created_at", "id"]),
+    ("ix_form_responses_form_id_submitted_at_id", "form_responses", ["form_id", "submitted_at", "id"]),
+    ("ix_registrations_event_id_registered_at_id", "registrations", ["event_id", "registered_at", "id"]),
+    ("ix_teams_event_id_created_at_id", "teams", ["event_id", "created_at", "id"]),
+    ("ix_team_members_team_id_created_at_id", "team_members", ["team_id", "created_at", "id"]),
+)
+
+SUPERSEDED = (
+    ("ix_clubs_status", "clubs", ["status"]),
+    ("ix_events_club_id_status", "events", ["club_id", "status"]),
+    ("ix_forms_event_id_status", "forms", ["event_id", "status"]),
+    ("ix_form_responses_form_id", "form_responses", ["form_id"]),
+    ("ix_teams_event_id", "teams", ["event_id"]),
+    ("ix_team_members_team_id", "team_members", ["team_id"]),
+)
+
+
+def drop_invalid_index(name: str, table: str) -> None:
+    # A failed or cancelled concurrent build leaves an INVALID index under
+    # the name, which IF NOT EXISTS would then skip; drop it and build again
+    invalid = op.get_bind().scalar(
+        sa.text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    )
+    if invalid:
+        op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            drop_invalid_index(name, table)
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in SUPERSEDED:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in SUPERSEDED:
+            drop_invalid_index(name, table)
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,89 @@
+"""team member uniqueness
+
+Copies event_id onto team_members and adds unique indexes on
+(event_id, lower(member_email)) and (event_id, member_student_id), the
+latter only where a student id is present. They replace the plain email
+and student id indexes, which only served the old duplicate pre-check.
+
+Existing duplicates must be resolved first; the upgrade stops and lists
+how many there are rather than building an invalid index.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DUPLICATES = {
+    "email": "SELECT count(*) FROM (SELECT 1 FROM team_members WHERE event_id IS NOT NULL GROUP BY event_id, lower(member_email) HAVING count(*) > 1) AS d",
+    "student id": "SELECT count(*) FROM (SELECT 1 FROM team_members WHERE event_id IS NOT NULL AND member_student_id IS NOT NULL GROUP BY event_id, member_student_id HAVING count(*) > 1) AS d",
+}
+
+
+def drop_invalid_index(name: str, table: str) -> None:
+    # A failed or cancelled concurrent build leaves an INVALID index under
+    # the name, which IF NOT EXISTS would then skip; drop it and build again
+    invalid = op.get_bind().scalar(
+        sa.text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    )
+    if invalid:
+        op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    op.add_column("team_members", sa.Column("event_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key(
+        "team_members_event_id_fkey", "team_members", "events", ["event_id"], ["id"], ondelete="SET NULL"
+    )
+    op.execute("UPDATE team_members SET event_id = teams.event_id FROM teams WHERE teams.id = team_members.team_id")
+
+    connection = op.get_bind()
+    for label, query in DUPLICATES.items():
+        count = connection.scalar(sa.text(query))
+        if count:
+            raise RuntimeError(f"{count} events have team members sharing a {label}; resolve them before upgrading")
+
+    with op.get_context().autocommit_block():
+        drop_invalid_index("uq_team_members_event_id_email", "team_members")
+        op.create_index(
+            "uq_team_members_event_id_email",
+            "team_members",
+            ["event_id", sa.text("lower(member_email)")],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        drop_invalid_index("uq_team_members_event_id_student_id", "team_members")
+        op.create_index(
+            "uq_team_members_event_id_student_id",
+            "team_members",
+            ["event_id", "member_student_id"],
+            unique=True,
+            postgresql_where=sa.text("member_student_id IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index("ix_team_members_member_email", table_name="team_members", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_team_members_member_student_id", table_name="team_members", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, column in (("ix_team_members_member_student_id", "member_student_id"), ("ix_team_members_member_email", "member_email")):
+            drop_invalid_index(name, "team_members")
+            op.create_index(name, "team_members", [column], postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index("uq_team_members_event_id_student_id", table_name="team_members", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("uq_team_members_event_id_email", table_name="team_members", postgresql_concurrently=True, if_exists=True)
+    op.drop_constraint("team_members_event_id_fkey", "team_members", type_="foreignkey")
+    op.drop_column("team_members", "event_id")
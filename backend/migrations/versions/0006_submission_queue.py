@@ -0,0 +1,59 @@
+"""submission queue
+
+Adds forms.intake_mode and the submission_queue table behind queued intake:
+submissions are stored as tickets and admitted in batches by
+app/jobs/admission_worker.py.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+intake_mode = sa.Enum("direct", "queued", name="formintakemodeenum")
+
+
+def upgrade() -> None:
+    intake_mode.create(op.get_bind(), checkfirst=True)
+    op.add_column("forms", sa.Column("intake_mode", intake_mode, server_default="direct", nullable=False))
+    op.create_table(
+        "submission_queue",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("form_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("event_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("status", sa.Enum("queued", "accepted", "rejected", name="submissionstatusenum"), nullable=False),
+        sa.Column("registration_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("detail", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["form_id"], ["forms.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["registration_id"], ["registrations.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_submission_queue_queued_created_at",
+        "submission_queue",
+        ["created_at"],
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_submission_queue_queued_created_at", table_name="submission_queue")
+    op.drop_table("submission_queue")
+    op.drop_column("forms", "intake_mode")
+    for enum_name in ("submissionstatusenum", "formintakemodeenum"):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,37 @@
+"""user token version
+
+Adds the version embedded in access tokens, bumped when a user's role or
+club claims change so workers can stop trusting older tokens.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("token_version", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("users", sa.Column("token_version_changed_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        "ix_users_token_version_changed_at",
+        "users",
+        ["token_version_changed_at"],
+        postgresql_where=sa.text("token_version_changed_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_token_version_changed_at", table_name="users")
+    op.drop_column("users", "token_version_changed_at")
+    op.drop_column("users", "token_version")
@@ -0,0 +1,64 @@
+"""Per-request cost of access token verification.
+
+Compares a full HMAC check and decode of the access token (what every
+request paid before verified tokens were cached) with verify_token on a
+cached token and on a cache miss.
+
+    python scripts/bench_verify_token.py --iterations 100000
+
+Run from the backend directory with the API's environment (.env) so the
+settings load; no database or server is needed.
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import timedelta
+from uuid import uuid4
+
+import jwt
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.config import settings  # noqa: E402
+from app.models.user_model import UserRoleEnum  # noqa: E402
+from app.schemas.user_schemas import TokenData  # noqa: E402
+from app.services.user_service import Principal, create_access_token, verified_tokens, verify_token  # noqa: E402
+
+
+def decode_only(token: str) -> TokenData:
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], options={"require": ["exp"]})
+    return TokenData(id=payload['id'], role=payload.get('role'), club_id=payload.get('club_id'), token_version=payload.get('ver'), session_id=payload.get('sid'))
+
+
+def cache_miss(token: str) -> TokenData:
+    verified_tokens.clear()
+    return verify_token(token)
+
+
+def main(args: argparse.Namespace) -> int:
+    principal = Principal(id=uuid4(), role=UserRoleEnum.club, club_id=uuid4(), club_status=None, token_version=0)
+    token = create_access_token("bench@example.com", principal, uuid4(), timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+    assert decode_only(token) == verify_token(token)
+
+    cases = {
+        "decode on every request": lambda: decode_only(token),
+        "verify_token, cache miss": lambda: cache_miss(token),
+        "verify_token, cached": lambda: verify_token(token),
+    }
+    results = {}
+    for name, call in cases.items():
+        verify_token(token)
+        best = min(timeit.repeat(call, number=args.iterations, repeat=args.repeat))
+        results[name] = best / args.iterations * 1e6
+        print(f"{name:<26} {results[name]:8.2f} us/request")
+    speedup = results["decode on every request"] / results["verify_token, cached"]
+    print(f"cached verification is {speedup:.1f}x faster than decoding")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    sys.exit(main(parser.parse_args()))
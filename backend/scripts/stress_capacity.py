@@ -0,0 +1,93 @@
+"""Oversell check for event capacity.
+
+Creates a published event with max_participants=CAPACITY under an approved
+club, fires SUBMISSIONS concurrent registrations at it and verifies that
+exactly CAPACITY were accepted, the rest were refused as full, and the
+registration counters agree.
+
+    python scripts/stress_capacity.py --base-url http://localhost:8000 \\
+        --email owner@example.com --password secret --club chess \\
+        --capacity 25 --submissions 400 --concurrency 100
+
+Needs httpx (requirements-dev.txt) and a running API whose user owns the
+given, already approved, club. Start the API with RATE_LIMIT_ENABLED=false,
+or the submission budget refuses most of the burst with 429.
+"""
+import argparse
+import asyncio
+import sys
+import uuid
+from collections import Counter
+
+import httpx
+
+
+async def submit(client: httpx.AsyncClient, url: str, run: str, index: int, gate: asyncio.Semaphore) -> int:
+    payload = {
+        "response_content": "stress",
+        "team_name": f"team-{index}",
+        "leader_name": "Leader",
+        "leader_email": f"leader-{run}-{index}@example.com",
+        "members": [{"member_name": f"member-{index}", "member_email": f"member-{run}-{index}@example.com"}],
+    }
+    async with gate:
+        response = await client.post(url, json=payload)
+    return response.status_code
+
+
+async def main(args: argparse.Namespace) -> int:
+    run = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as owner, \
+            httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as public:
+        (await owner.post("/api/auth/token", data={"username": args.email, "password": args.password})).raise_for_status()
+        event = (await owner.post(f"/api/club/{args.club}/event/create", json={
+            "title": f"Capacity {run}",
+            "slug": f"capacity-{run}",
+            "start_time": "2030-01-01T10:00:00",
+            "end_time": "2030-01-01T18:00:00",
+            "max_participants": args.capacity,
+        }))
+        event.raise_for_status()
+        event_id = event.json()["id"]
+        (await owner.patch(f"/api/club/{args.club}/event/{event_id}/publish")).raise_for_status()
+        form = await owner.post(f"/api/club/{args.club}/event/{event_id}/form/create", json={"title": "Register", "form_content": "stress"})
+        form.raise_for_status()
+        form_id = form.json()["id"]
+        (await owner.patch(f"/api/club/{args.club}/event/{event_id}/form/{form_id}/publish")).raise_for_status()
+
+        url = f"/api/club/{args.club}/event/{event_id}/form/{form_id}/form-response/create"
+        gate = asyncio.Semaphore(args.concurrency)
+        codes = Counter(await asyncio.gather(*(submit(public, url, run, index, gate) for index in range(args.submissions))))
+
+        stats = await owner.get(f"/api/club/{args.club}/event/{event_id}/registrations/stats")
+        stats.raise_for_status()
+        stats = stats.json()
+
+    accepted, refused = codes.get(201, 0), codes.get(409, 0)
+    print(f"event {event_id}: {dict(codes)}; counters {stats}")
+    expected = min(args.capacity, args.submissions)
+    failures = []
+    if accepted != expected:
+        failures.append(f"accepted {accepted} registrations, expected {expected}")
+    if accepted + refused != args.submissions:
+        failures.append(f"{args.submissions - accepted - refused} submissions failed with another status")
+    if stats["total_registrations"] - stats["cancelled"] != accepted:
+        failures.append(f"counters report {stats['total_registrations'] - stats['cancelled']} active registrations")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if not failures:
+        print("OK: no oversell")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--club", required=True, help="slug of an approved club owned by the user")
+    parser.add_argument("--capacity", type=int, default=25)
+    parser.add_argument("--submissions", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=100)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,137 @@
+# The suite runs against its own Postgres database, named by TEST_DATABASE_URL.
+# It is migrated to head once and emptied before every test; without the
+# variable every test is skipped.
+#
+#   TEST_DATABASE_URL=postgresql://localhost/portal_test python -m pytest
+import os
+from pathlib import Path
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+# Settings are read at import time, so they must be in place before app imports
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "postgresql://localhost/unused"
+os.environ.pop("REPLICA_DATABASE_URL", None)
+os.environ.pop("CACHE_INVALIDATION_CHANNEL", None)
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "5"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ADMIN_USERNAME", "admin")
+os.environ.setdefault("ADMIN_EMAIL", "admin@example.com")
+os.environ.setdefault("ADMIN_PASSWORD", "adminpass")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+
+import httpx
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from app.core.cache import caches
+from app.core.config import settings
+from app.core.token_versions import revoked_sessions, token_version_floors
+from app.db.database import Base, SessionLocal
+from app.main import app
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+FORM_CONTENT = "Tell us about your team"
+
+
+def pytest_collection_modifyitems(config, items):
+    if not TEST_DATABASE_URL:
+        skip = pytest.mark.skip(reason="TEST_DATABASE_URL is not set")
+        for item in items:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated_database():
+    if not TEST_DATABASE_URL:
+        return
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    command.upgrade(config, "head")
+
+
+@pytest.fixture(autouse=True)
+async def clean_database(migrated_database):
+    if not TEST_DATABASE_URL:
+        yield
+        return
+    tables = ", ".join(f'"{table.name}"' for table in Base.metadata.sorted_tables)
+    async with SessionLocal() as db:
+        await db.execute(text(f"TRUNCATE {tables} CASCADE"))
+        await db.commit()
+    for cache in caches.values():
+        cache.clear()
+    revoked_sessions.clear()
+    token_version_floors.clear()
+    yield
+
+
+def make_client(cookies: dict[str, str] | None = None) -> httpx.AsyncClient:
+    # https so the secure auth cookies are sent back
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="https://test", cookies=cookies)
+
+
+async def expect(response: httpx.Response, status_code: int) -> httpx.Response:
+    assert response.status_code == status_code, f"{response.request.method} {response.request.url}: {response.status_code} {response.text}"
+    return response
+
+
+@pytest.fixture
+async def admin():
+    async with make_client() as client:
+        # The first login on an empty database creates the admin
+        await expect(await client.post("/api/auth/token", data={"username": settings.ADMIN_EMAIL, "password": settings.ADMIN_PASSWORD}), 200)
+        yield client
+
+
+@pytest.fixture
+async def owner(admin):
+    async with make_client() as client:
+        await expect(await client.post("/api/auth", json={"name": "Owner", "email": "owner@example.com", "password": "secret"}), 201)
+        await expect(await client.post("/api/auth/token", data={"username": "owner@example.com", "password": "secret"}), 200)
+        await expect(await client.post("/api/club/create", json={"name": "Chess", "slug": "chess"}), 201)
+        await expect(await admin.patch("/api/clubs/chess/approve"), 201)
+        yield client
+
+
+@pytest.fixture
+async def anon():
+    async with make_client() as client:
+        yield client
+
+
+async def create_event(owner: httpx.AsyncClient, slug: str, max_participants: int | None = None) -> dict:
+    event = (await expect(await owner.post("/api/club/chess/event/create", json={
+        "title": slug.title(),
+        "slug": slug,
+        "start_time": "2030-01-01T10:00:00",
+        "end_time": "2030-01-01T18:00:00",
+        "max_participants": max_participants,
+    }), 201)).json()
+    await expect(await owner.patch(f"/api/club/chess/event/{event['id']}/publish"), 201)
+    return event
+
+
+async def create_form(owner: httpx.AsyncClient, event_id: str, form_content: str = FORM_CONTENT, intake_mode: str = "direct") -> dict:
+    form = (await expect(await owner.post(f"/api/club/chess/event/{event_id}/form/create", json={
+        "title": "Register",
+        "form_content": form_content,
+        "intake_mode": intake_mode,
+    }), 201)).json()
+    await expect(await owner.patch(f"/api/club/chess/event/{event_id}/form/{form['id']}/publish"), 201)
+    return form
+
+
+def submission(index: int, members: int = 2) -> dict:
+    return {
+        "response_content": "We like chess",
+        "team_name": f"Team {index}",
+        "leader_name": "Leader",
+        "leader_email": f"leader-{index}@example.com",
+        "members": [
+            {"member_name": f"Member {index}.{member}", "member_email": f"member-{index}-{member}@example.com"}
+            for member in range(members)
+        ],
+    }
@@ -0,0 +1,126 @@
+# The admission worker settles queued submissions in arrival order
+import asyncio
+from uuid import UUID, uuid4
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from app.db.database import SessionLocal
+from app.exceptions.handler import ConflictException
+from app.models.submission_model import SubmissionQueue
+from app.schemas.form_schemas import FormResponseCreate
+from app.services import admission_service
+from app.services.admission_service import EVENT_FULL, MEMBER_TAKEN, drain_submission_queue
+from app.services.form_response_service import add_form_response
+from app.services.registration_stats_service import get_event_registration_stats
+from app.services.resource_service import resolve_event
+from tests.conftest import create_event, create_form, expect, submission
+
+
+@pytest.fixture
+async def queued_event(owner):
+    event = await create_event(owner, "queued", max_participants=3)
+    form = await create_form(owner, event["id"], intake_mode="queued")
+    return event, form
+
+
+async def enqueue(client, event: dict, form: dict, payload: dict) -> UUID:
+    url = f"/api/club/chess/event/{event['id']}/form/{form['id']}/form-response/create"
+    return UUID((await expect(await client.post(url, json=payload), 202)).json()["id"])
+
+
+async def drain() -> None:
+    async with SessionLocal() as db:
+        await drain_submission_queue(db, 100)
+
+
+async def outcomes(ticket_ids: list[UUID]) -> list[tuple[str, str | None]]:
+    async with SessionLocal() as db:
+        tickets = {ticket.id: ticket for ticket in await db.scalars(select(SubmissionQueue).filter(SubmissionQueue.id.in_(ticket_ids)))}
+    return [(tickets[ticket_id].status.value, tickets[ticket_id].detail) for ticket_id in ticket_ids]
+
+
+def sharing_member_with(index: int, other: int) -> dict:
+    payload = submission(index)
+    payload["members"][0] = submission(other)["members"][0]
+    return payload
+
+
+async def test_batch_admits_in_arrival_order(queued_event, anon):
+    event, form = queued_event
+    payloads = [submission(0), submission(1), sharing_member_with(2, 0), submission(3), submission(4)]
+    ticket_ids = [await enqueue(anon, event, form, payload) for payload in payloads]
+
+    await drain()
+
+    assert await outcomes(ticket_ids) == [
+        ("accepted", None),
+        ("accepted", None),
+        ("rejected", MEMBER_TAKEN),
+        ("accepted", None),
+        ("rejected", EVENT_FULL),
+    ]
+    async with SessionLocal() as db:
+        assert (await get_event_registration_stats(db, UUID(event["id"])))["total_registrations"] == 3
+
+
+async def test_member_lost_during_insert_frees_the_seat(queued_event, anon, monkeypatch):
+    event, form = queued_event
+    first = await enqueue(anon, event, form, submission(0))
+    await drain()
+    # A direct submission registered the member after the worker's lookup,
+    # so the clash only shows up as a unique violation on insert
+    ticket_ids = [await enqueue(anon, event, form, payload) for payload in (sharing_member_with(1, 0), submission(2), submission(3))]
+
+    async def nothing_registered(db, event_id, submissions):
+        return set()
+    monkeypatch.setattr(admission_service, "registered_member_keys", nothing_registered)
+    await drain()
+
+    assert await outcomes([first, *ticket_ids]) == [
+        ("accepted", None),
+        ("rejected", MEMBER_TAKEN),
+        ("accepted", None),
+        ("accepted", None),
+    ]
+
+
+async def test_other_integrity_errors_are_not_reported_as_member_taken(queued_event, anon, monkeypatch):
+    event, form = queued_event
+    ticket_id = await enqueue(anon, event, form, submission(0))
+    build_registration = admission_service.build_registration
+
+    def orphaned_registration(event_id, form_id, response_data):
+        return build_registration(event_id, uuid4(), response_data)
+    monkeypatch.setattr(admission_service, "build_registration", orphaned_registration)
+
+    with pytest.raises(IntegrityError):
+        await drain()
+    assert await outcomes([ticket_id]) == [("queued", None)]
+
+
+async def test_worker_and_direct_submissions_do_not_deadlock(owner, anon):
+    # Both paths lock the counters row before inserting members, so a batch
+    # and direct submissions fighting over the same members cannot deadlock
+    event = await create_event(owner, "mixed")
+    direct = await create_form(owner, event["id"])
+    queued = await create_form(owner, event["id"], intake_mode="queued")
+    event_id, form_id = UUID(event["id"]), UUID(direct["id"])
+
+    async def submit(index: int) -> None:
+        async with SessionLocal() as db:
+            context = await resolve_event(db, "chess", event_id, form_id)
+            try:
+                await add_form_response(context, db, FormResponseCreate.model_validate(submission(index)))
+            except ConflictException:
+                return
+            await db.commit()
+
+    for round in range(5):
+        indexes = range(round * 100, round * 100 + 20)
+        for index in indexes:
+            await enqueue(anon, event, queued, submission(index))
+        # Direct submissions take the members in the opposite order to the batch
+        await asyncio.gather(drain(), *(submit(index) for index in reversed(indexes)))
+
+    async with SessionLocal() as db:
+        assert (await get_event_registration_stats(db, event_id))["total_registrations"] == 100
@@ -0,0 +1,48 @@
+# Concurrent submissions must never register more teams than an event allows
+import asyncio
+from uuid import UUID
+from sqlalchemy import func, select
+from app.db.database import SessionLocal
+from app.exceptions.handler import ConflictException
+from app.models.registration_model import Registration, RegistrationStatusEnum
+from app.schemas.form_schemas import FormResponseCreate
+from app.services.form_response_service import add_form_response
+from app.services.registration_stats_service import get_active_registration_count, get_event_registration_stats
+from app.services.resource_service import resolve_event
+from tests.conftest import create_event, create_form, submission
+
+CAPACITY = 5
+SUBMISSIONS = 40
+
+
+async def submit(event_id: UUID, form_id: UUID, index: int) -> bool:
+    # Each submission gets its own session and connection, like separate requests
+    async with SessionLocal() as db:
+        context = await resolve_event(db, "chess", event_id, form_id)
+        try:
+            await add_form_response(context, db, FormResponseCreate.model_validate(submission(index)))
+        except ConflictException:
+            return False
+        await db.commit()
+        return True
+
+
+async def test_concurrent_submissions_do_not_oversell(owner):
+    event = await create_event(owner, "capped", max_participants=CAPACITY)
+    form = await create_form(owner, event["id"])
+    event_id, form_id = UUID(event["id"]), UUID(form["id"])
+
+    accepted = await asyncio.gather(*(submit(event_id, form_id, index) for index in range(SUBMISSIONS)))
+
+    async with SessionLocal() as db:
+        registered = await db.scalar(
+            select(func.count())
+            .select_from(Registration)
+            .filter(Registration.event_id == event_id, Registration.status != RegistrationStatusEnum.cancelled)
+        )
+        counted = await get_active_registration_count(db, event_id)
+        stats = await get_event_registration_stats(db, event_id)
+    assert registered <= CAPACITY
+    assert sum(accepted) == registered == CAPACITY
+    assert counted == registered
+    assert stats["total_registrations"] == registered
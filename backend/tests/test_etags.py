@@ -0,0 +1,25 @@
+# Conditional GETs answer 304 only for resources that exist and are unchanged
+from uuid import uuid4
+from tests.conftest import create_event, expect
+
+
+async def club_id(anon) -> str:
+    return (await expect(await anon.get("/api/clubs/chess"), 200)).json()["id"]
+
+
+async def test_published_events_revalidate(owner, anon):
+    await create_event(owner, "open")
+    url = f"/api/club/{await club_id(anon)}/event/published"
+
+    etag = (await expect(await anon.get(url), 200)).headers["etag"]
+    await expect(await anon.get(url, headers={"If-None-Match": etag}), 304)
+
+    await create_event(owner, "another")
+    await expect(await anon.get(url, headers={"If-None-Match": etag}), 200)
+
+
+async def test_unknown_club_is_not_found_despite_matching_etag(owner, anon):
+    # A club with nothing published has the same empty fingerprint as no club
+    etag = (await expect(await anon.get(f"/api/club/{await club_id(anon)}/event/published"), 200)).headers["etag"]
+
+    await expect(await anon.get(f"/api/club/{uuid4()}/event/published", headers={"If-None-Match": etag}), 404)
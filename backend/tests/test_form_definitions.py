@@ -0,0 +1,30 @@
+# Responses to forms with a JSON definition are checked against its fields
+import json
+import pytest
+from tests.conftest import create_event, create_form, expect, submission
+
+
+def submit_url(event: dict, form: dict) -> str:
+    return f"/api/club/chess/event/{event['id']}/form/{form['id']}/form-response/create"
+
+
+@pytest.mark.parametrize("name", ["_secret", "model_config", "model_dump"])
+async def test_field_names_clashing_with_pydantic_are_usable(owner, anon, name):
+    event = await create_event(owner, "named")
+    form = await create_form(owner, event["id"], json.dumps({"fields": [{"name": name, "type": "integer"}]}))
+
+    answered = submission(0) | {"response_content": json.dumps({name: 3})}
+    await expect(await anon.post(submit_url(event, form), json=answered), 201)
+
+    wrong_type = submission(1) | {"response_content": json.dumps({name: "three"})}
+    response = await expect(await anon.post(submit_url(event, form), json=wrong_type), 422)
+    assert name in response.json()["detail"]
+
+
+async def test_invalid_definition_is_rejected(owner):
+    event = await create_event(owner, "invalid")
+    response = await owner.post(f"/api/club/chess/event/{event['id']}/form/create", json={
+        "title": "Register",
+        "form_content": json.dumps({"fields": [{"name": "pick", "type": "select"}]}),
+    })
+    await expect(response, 422)
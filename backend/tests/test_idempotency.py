@@ -0,0 +1,69 @@
+# Submissions carrying an Idempotency-Key are processed once per key
+import asyncio
+from uuid import UUID
+from sqlalchemy import func, select
+from app.db.database import SessionLocal
+from app.models.registration_model import Registration
+from app.schemas.form_schemas import FormResponseCreate
+from app.schemas.registration_schemas import RegistrationFullSchema
+from app.services.form_response_service import add_form_response
+from app.services.idempotency_service import claim_idempotency_key, hash_request, store_idempotent_response
+from app.services.resource_service import resolve_event
+from tests.conftest import create_event, create_form, expect, submission
+
+
+async def setup_form(owner) -> tuple[dict, dict, str]:
+    event = await create_event(owner, "retried")
+    form = await create_form(owner, event["id"])
+    return event, form, f"/api/club/chess/event/{event['id']}/form/{form['id']}/form-response/create"
+
+
+async def registration_count(event_id: str) -> int:
+    async with SessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(Registration).filter(Registration.event_id == UUID(event_id)))
+
+
+async def test_replay_returns_the_stored_response(owner, anon):
+    event, form, url = await setup_form(owner)
+    headers = {"Idempotency-Key": "retry-1"}
+
+    first = await expect(await anon.post(url, json=submission(0), headers=headers), 201)
+    replay = await expect(await anon.post(url, json=submission(0), headers=headers), 201)
+
+    assert "idempotent-replayed" not in first.headers
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert replay.json() == first.json()
+    assert await registration_count(event["id"]) == 1
+
+
+async def test_key_reused_with_another_payload_is_rejected(owner, anon):
+    event, form, url = await setup_form(owner)
+    headers = {"Idempotency-Key": "retry-1"}
+
+    await expect(await anon.post(url, json=submission(0), headers=headers), 201)
+    await expect(await anon.post(url, json=submission(1), headers=headers), 422)
+
+    assert await registration_count(event["id"]) == 1
+
+
+async def test_retry_waits_for_the_request_in_flight(owner, anon):
+    event, form, url = await setup_form(owner)
+    payload = FormResponseCreate.model_validate(submission(0))
+
+    async with SessionLocal() as db:
+        # The first request has claimed the key but not committed yet
+        context = await resolve_event(db, "chess", UUID(event["id"]), UUID(form["id"]))
+        assert await claim_idempotency_key(db, context.form.id, "retry-1", hash_request(payload.model_dump(mode="json"))) is None
+        retry = asyncio.create_task(anon.post(url, json=submission(0), headers={"Idempotency-Key": "retry-1"}))
+        await asyncio.sleep(0.2)
+        assert not retry.done()
+
+        registration = await add_form_response(context, db, payload)
+        body = RegistrationFullSchema.model_validate(registration).model_dump(mode="json")
+        await store_idempotent_response(db, context.form.id, "retry-1", 201, body)
+        await db.commit()
+
+    response = await expect(await retry, 201)
+    assert response.headers["idempotent-replayed"] == "true"
+    assert response.json() == body
+    assert await registration_count(event["id"]) == 1
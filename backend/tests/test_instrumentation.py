@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import select
+from app.db.database import SessionLocal
+from app.db.instrumentation import track_queries
+from app.models.club_model import Club
+
+
+async def run_lookups(count: int) -> None:
+    async with SessionLocal() as db:
+        for _ in range(count):
+            await db.scalar(select(Club.id).filter(Club.slug == "chess"))
+
+
+async def test_assert_max_queries_counts_executed_statements():
+    with track_queries() as stats:
+        await run_lookups(3)
+    assert stats.count == 3
+    stats.assert_max_queries(3)
+    with pytest.raises(AssertionError, match="at most 2 queries, 3 were executed"):
+        stats.assert_max_queries(2)
+
+
+async def test_assert_no_n_plus_one_flags_repeated_query_shapes():
+    with track_queries() as stats:
+        await run_lookups(2)
+    stats.assert_no_n_plus_one(threshold=3)
+    with track_queries() as stats:
+        await run_lookups(3)
+    with pytest.raises(AssertionError, match="N\\+1"):
+        stats.assert_no_n_plus_one(threshold=3)
+
+
+async def test_nested_trackers_both_record(anon):
+    # The request middleware tracks every request; an outer tracker still sees its queries
+    with track_queries() as stats:
+        response = await anon.get("/api/clubs")
+    assert response.status_code == 200
+    assert stats.count >= 1
+    assert f'desc="{stats.count} queries"' in response.headers["server-timing"]
@@ -0,0 +1,55 @@
+# Password hashing runs off the event loop and keeps stored hashes at the configured cost
+import threading
+from passlib.hash import bcrypt
+from sqlalchemy import select, update
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.user_model import User
+from app.services import user_service
+from tests.conftest import expect
+
+CREDENTIALS = {"username": "member@example.com", "password": "secret"}
+
+
+async def stored_hash() -> str:
+    async with SessionLocal() as db:
+        return await db.scalar(select(User.password).filter(User.email == CREDENTIALS["username"]))
+
+
+async def test_login_rehashes_a_cheaper_hash(admin, anon):
+    await expect(await anon.post("/api/auth", json={"name": "Member", "email": CREDENTIALS["username"], "password": CREDENTIALS["password"]}), 201)
+    cheaper = bcrypt.using(rounds=settings.BCRYPT_ROUNDS - 1).hash(CREDENTIALS["password"])
+    async with SessionLocal() as db:
+        await db.execute(update(User).filter(User.email == CREDENTIALS["username"]).values(password=cheaper))
+        await db.commit()
+
+    await expect(await anon.post("/api/auth/token", data=CREDENTIALS), 200)
+
+    upgraded = await stored_hash()
+    assert upgraded != cheaper
+    assert bcrypt.from_string(upgraded).rounds == settings.BCRYPT_ROUNDS
+    assert bcrypt.verify(CREDENTIALS["password"], upgraded)
+    # Once upgraded, later logins leave the hash alone
+    await expect(await anon.post("/api/auth/token", data=CREDENTIALS), 200)
+    assert await stored_hash() == upgraded
+
+
+async def test_hashing_runs_on_the_password_pool(admin, anon, monkeypatch):
+    threads = []
+    context = user_service.bcrypt_context
+
+    class RecordingContext:
+        def hash(self, password):
+            threads.append(threading.current_thread())
+            return context.hash(password)
+
+        def verify_and_update(self, password, hashed):
+            threads.append(threading.current_thread())
+            return context.verify_and_update(password, hashed)
+    monkeypatch.setattr(user_service, "bcrypt_context", RecordingContext())
+
+    await expect(await anon.post("/api/auth", json={"name": "Member", "email": CREDENTIALS["username"], "password": CREDENTIALS["password"]}), 201)
+    await expect(await anon.post("/api/auth/token", data=CREDENTIALS), 200)
+
+    assert len(threads) == 2
+    assert all(thread is not threading.main_thread() and thread.name.startswith("password-hashing") for thread in threads)
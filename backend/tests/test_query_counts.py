@@ -0,0 +1,46 @@
+# Query counts must not grow with the number of rows an endpoint returns
+import pytest
+from app.db.instrumentation import track_queries
+from tests.conftest import create_event, create_form, expect, submission
+
+TEAMS = 6
+
+
+@pytest.fixture
+async def registered_event(owner, anon):
+    # Several events with forms, the first with TEAMS registered teams of three
+    events = [await create_event(owner, f"event-{index}") for index in range(3)]
+    forms = [await create_form(owner, event["id"]) for event in events]
+    url = f"/api/club/chess/event/{events[0]['id']}/form/{forms[0]['id']}/form-response/create"
+    registrations = [(await expect(await anon.post(url, json=submission(index, members=3)), 201)).json() for index in range(TEAMS)]
+    return events[0], registrations
+
+
+async def fetch_tracked(client, url: str):
+    with track_queries() as stats:
+        await expect(await client.get(url), 200)
+    # Strict: no query shape may run twice in one request
+    stats.assert_no_n_plus_one(threshold=2)
+    return stats
+
+
+async def test_team_list(owner, registered_event):
+    event, _ = registered_event
+    stats = await fetch_tracked(owner, f"/api/club/chess/event/{event['id']}/team")
+    stats.assert_max_queries(3)
+
+
+async def test_owner_event_list(owner, registered_event):
+    stats = await fetch_tracked(owner, "/api/club/chess/event/all")
+    stats.assert_max_queries(1)
+
+
+async def test_registration_detail(owner, registered_event):
+    event, registrations = registered_event
+    stats = await fetch_tracked(owner, f"/api/club/chess/event/{event['id']}/registrations/{registrations[0]['id']}")
+    stats.assert_max_queries(5)
+
+
+async def test_public_club_list(anon, registered_event):
+    stats = await fetch_tracked(anon, "/api/clubs")
+    stats.assert_max_queries(4)
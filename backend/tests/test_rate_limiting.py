@@ -0,0 +1,106 @@
+# Token bucket rate limiting per user or client address
+import math
+from datetime import timedelta
+from uuid import uuid4
+import pytest
+from starlette.requests import Request
+from app.core import rate_limiting
+from app.core.config import settings
+from app.core.rate_limiting import MemoryRateLimitStore, client_key, parse_limit
+from app.core.token_versions import revoked_sessions
+from app.models.user_model import UserRoleEnum
+from app.services.user_service import Principal, create_access_token
+from tests.conftest import expect
+
+
+@pytest.fixture
+def limited(monkeypatch) -> MemoryRateLimitStore:
+    store = MemoryRateLimitStore()
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limiting, "store", store)
+    return store
+
+
+def request(headers: dict[str, str] | None = None, client: str = "10.0.0.1") -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+        "client": (client, 50000),
+    })
+
+
+def access_token(session_id=None) -> tuple[str, str]:
+    user_id = uuid4()
+    principal = Principal(id=user_id, role=UserRoleEnum.regular, club_id=None, club_status=None, token_version=0)
+    return str(user_id), create_access_token("member@example.com", principal, session_id or uuid4(), timedelta(minutes=5))
+
+
+async def test_bucket_denies_when_empty_and_refills(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiting.time, "monotonic", lambda: now[0])
+    store, bucket = MemoryRateLimitStore(), parse_limit("2/second")
+
+    assert await store.take("client", bucket) == 0
+    assert await store.take("client", bucket) == 0
+    assert await store.take("client", bucket) == pytest.approx(0.5)
+    # Another key has its own bucket
+    assert await store.take("other", bucket) == 0
+
+    now[0] += 0.5
+    assert await store.take("client", bucket) == 0
+    assert await store.take("client", bucket) == pytest.approx(0.5)
+
+
+def test_invalid_limits_are_rejected():
+    for limit in ("0/minute", "10", "10/fortnight"):
+        with pytest.raises(ValueError):
+            parse_limit(limit)
+
+
+async def test_exhausted_budget_answers_429_with_retry_after(limited, anon):
+    bucket = parse_limit(settings.RATE_LIMIT_AUTH)
+    for _ in range(bucket.burst):
+        await expect(await anon.post("/api/auth/token", data={"username": "nobody@example.com", "password": "wrong"}), 401)
+
+    response = await expect(await anon.post("/api/auth/token", data={"username": "nobody@example.com", "password": "wrong"}), 429)
+
+    # One token comes back every 1 / rate seconds
+    assert 1 <= int(response.headers["retry-after"]) <= math.ceil(1 / bucket.rate)
+
+
+async def test_signed_in_clients_are_keyed_by_user():
+    user_id, token = access_token()
+
+    assert client_key(request({"cookie": f"access_token={token}"})) == f"user:{user_id}"
+    assert client_key(request({"cookie": "access_token=not.a.token"})) == "ip:10.0.0.1"
+    assert client_key(request()) == "ip:10.0.0.1"
+
+
+async def test_revoked_sessions_fall_back_to_the_address():
+    session_id = uuid4()
+    _, token = access_token(session_id)
+    revoked_sessions.add(str(session_id))
+
+    assert client_key(request({"cookie": f"access_token={token}"})) == "ip:10.0.0.1"
+
+
+@pytest.mark.parametrize("hops, forwarded, expected", [
+    (0, "203.0.113.7", "10.0.0.1"),
+    (1, "203.0.113.7", "203.0.113.7"),
+    (1, "198.51.100.1, 203.0.113.7", "203.0.113.7"),
+    (2, "198.51.100.1, 203.0.113.7", "198.51.100.1"),
+    (2, "203.0.113.7", "10.0.0.1"),
+    (1, "", "10.0.0.1"),
+])
+async def test_trusted_proxy_hops_pick_the_forwarded_address(monkeypatch, hops, forwarded, expected):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXY_HOPS", hops)
+
+    assert client_key(request({"x-forwarded-for": forwarded})) == f"ip:{expected}"
+
+
+async def test_failing_store_lets_requests_through(limited, anon, monkeypatch):
+    async def unreachable(key, bucket):
+        raise ConnectionError("store is down")
+    monkeypatch.setattr(limited, "take", unreachable)
+
+    await expect(await anon.get("/api/clubs"), 200)
@@ -0,0 +1,97 @@
+# Refresh token rotation and session revocation
+import pytest
+from app.core.token_versions import revoked_sessions
+from app.db.database import SessionLocal
+from app.exceptions.handler import UnauthorizedException
+from app.main import reload_token_state
+from app.models.refresh_token_model import RefreshToken
+from app.services.refresh_token_service import revoke_sessions
+from app.services.user_service import verify_token
+from tests.conftest import expect, make_client
+
+CREDENTIALS = {"username": "member@example.com", "password": "secret"}
+
+
+@pytest.fixture
+async def member(admin):
+    async with make_client() as client:
+        await expect(await client.post("/api/auth", json={"name": "Member", "email": CREDENTIALS["username"], "password": CREDENTIALS["password"]}), 201)
+        await expect(await client.post("/api/auth/token", data=CREDENTIALS), 200)
+        yield client
+
+
+async def login() -> dict[str, str]:
+    async with make_client() as client:
+        await expect(await client.post("/api/auth/token", data=CREDENTIALS), 200)
+        return dict(client.cookies)
+
+
+async def status_with(cookies: dict[str, str], method: str, url: str, **kwargs) -> int:
+    async with make_client(cookies) as client:
+        return (await client.request(method, url, **kwargs)).status_code
+
+
+async def test_refresh_rotates_the_refresh_token(member):
+    first = member.cookies["refresh_token"]
+    await expect(await member.post("/api/auth/refresh"), 200)
+    second = member.cookies["refresh_token"]
+
+    assert second != first
+    await expect(await member.get("/api/user/me"), 200)
+    await expect(await member.post("/api/auth/refresh"), 200)
+
+
+async def test_reused_refresh_token_revokes_the_session(member):
+    stolen = member.cookies["refresh_token"]
+    await expect(await member.post("/api/auth/refresh"), 200)
+
+    assert await status_with({"refresh_token": stolen}, "POST", "/api/auth/refresh") == 401
+    # The legitimate holder is signed out too, access and refresh token alike
+    await expect(await member.get("/api/user/me"), 401)
+    await expect(await member.post("/api/auth/refresh"), 401)
+
+
+async def test_logout_revokes_the_access_token(member):
+    cookies = dict(member.cookies)
+    await expect(await member.post("/api/auth/logout"), 204)
+
+    assert await status_with(cookies, "GET", "/api/user/me") == 401
+    assert await status_with(cookies, "POST", "/api/auth/refresh") == 401
+
+
+async def test_password_change_revokes_other_sessions(member):
+    other = await login()
+    await expect(await member.patch("/api/user/change-password", json={
+        "current_password": "secret",
+        "new_password": "changed",
+        "new_password_confirm": "changed",
+    }), 200)
+
+    assert await status_with(other, "GET", "/api/user/me") == 401
+    assert await status_with(other, "POST", "/api/auth/refresh") == 401
+    await expect(await member.get("/api/user/me"), 200)
+
+
+async def test_verify_token_rejects_a_revoked_session(member):
+    token = member.cookies["access_token"]
+    session_id = str(verify_token(token).session_id)
+
+    revoked_sessions.add(session_id)
+
+    with pytest.raises(UnauthorizedException):
+        verify_token(token)
+
+
+async def test_revocations_by_another_worker_are_picked_up_on_reload(member):
+    token = member.cookies["access_token"]
+    session_id = verify_token(token).session_id
+    # Another worker revokes the session; this one hears nothing until it reloads
+    async with SessionLocal() as db:
+        await revoke_sessions(db, RefreshToken.session_id == session_id)
+        await db.commit()
+    verify_token(token)
+
+    await reload_token_state()
+
+    with pytest.raises(UnauthorizedException):
+        verify_token(token)
@@ -0,0 +1,54 @@
+# verify_token serves repeat tokens from its cache, but never past revocation or expiry
+import asyncio
+import time
+from datetime import timedelta
+from uuid import uuid4
+import jwt
+import pytest
+from app.core.token_versions import revoked_sessions
+from app.exceptions.handler import UnauthorizedException
+from app.models.user_model import UserRoleEnum
+from app.services.user_service import Principal, create_access_token, verify_token
+
+
+def access_token(session_id, expires_delta: timedelta) -> str:
+    principal = Principal(id=uuid4(), role=UserRoleEnum.regular, club_id=None, club_status=None, token_version=0)
+    return create_access_token("member@example.com", principal, session_id, expires_delta)
+
+
+@pytest.fixture
+def decodes(monkeypatch) -> list[str]:
+    calls = []
+    decode = jwt.decode
+
+    def counting_decode(token, *args, **kwargs):
+        calls.append(token)
+        return decode(token, *args, **kwargs)
+    monkeypatch.setattr(jwt, "decode", counting_decode)
+    return calls
+
+
+async def test_cache_hit_still_checks_revocation(decodes):
+    session_id = uuid4()
+    token = access_token(session_id, timedelta(minutes=5))
+    verify_token(token)
+    verify_token(token)
+    assert len(decodes) == 1
+
+    revoked_sessions.add(str(session_id))
+
+    with pytest.raises(UnauthorizedException):
+        verify_token(token)
+    assert len(decodes) == 1
+
+
+async def test_cache_entries_expire_with_the_token(decodes):
+    token = access_token(uuid4(), timedelta(seconds=1))
+    verify_token(token)
+    expires_at = jwt.decode(token, options={"verify_signature": False})["exp"]
+
+    await asyncio.sleep(max(0, expires_at - time.time()) + 0.05)
+
+    # A cache entry outliving the token would still be served here
+    with pytest.raises(UnauthorizedException):
+        verify_token(token)
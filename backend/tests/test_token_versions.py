@@ -0,0 +1,32 @@
+# Access tokens carry role and club claims until the user's token version moves on
+from uuid import uuid4
+from app.db.database import SessionLocal
+from app.main import reload_token_state
+from app.models.club_model import Club, ClubStatusEnum
+from app.services.user_service import bump_token_versions, get_current_user, verify_token
+from tests.conftest import expect
+
+
+async def test_bumped_token_version_rereads_claims(admin, anon):
+    await expect(await anon.post("/api/auth", json={"name": "Member", "email": "member@example.com", "password": "secret"}), 201)
+    await expect(await anon.post("/api/auth/token", data={"username": "member@example.com", "password": "secret"}), 200)
+    token = anon.cookies["access_token"]
+    user_id = verify_token(token).id
+
+    # Another worker approves a club for the user; this one hears nothing
+    # until it reloads, and trusts the claims in the token until then
+    async with SessionLocal() as db:
+        club = Club(id=uuid4(), name="Chess", slug="chess", created_by=user_id, status=ClubStatusEnum.active)
+        db.add(club)
+        await bump_token_versions(db, user_id)
+        await db.commit()
+    async with SessionLocal() as db:
+        stale = await get_current_user(token, db)
+    assert stale.club_id is None
+
+    await reload_token_state()
+
+    async with SessionLocal() as db:
+        fresh = await get_current_user(token, db)
+    assert fresh.club_id == club.id
+    assert fresh.token_version == stale.token_version + 1
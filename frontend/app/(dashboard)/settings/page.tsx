@@ -10,6 +10,7 @@ import { toast } from "sonner"
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card";
 import { Separator } from "@/components/ui/separator";
 import { useRouter } from 'next/navigation'
+import { fetchWithRefresh } from "@/lib/utils";
 
 const profileFormSchema = z.object({
     username: z.string().min(2, { message: "Name must be at least 2 characters." }),
@@ -32,7 +33,7 @@ export default function SettingsPage() {
     useEffect(() => {
         async function fetchProfile() {
         try {
-            const res = await fetch(`${API_BASE_URL}/api/user/me`, {
+            const res = await fetchWithRefresh(`${API_BASE_URL}/api/user/me`, {
             credentials: "include",
             });
             if (res.ok) {
@@ -75,7 +76,7 @@ export default function SettingsPage() {
 
     async function onProfileSubmit(values: z.infer<typeof profileFormSchema>) {
         try {
-            const res = await fetch(`${API_BASE_URL}/api/user/me/`, {
+            const res = await fetchWithRefresh(`${API_BASE_URL}/api/user/me/`, {
             method: "PATCH",
             credentials: "include",
             headers: {
@@ -110,7 +111,7 @@ export default function SettingsPage() {
 
     async function onPasswordSubmit(values: z.infer<typeof passwordFormSchema>) {
         try {
-            const res = await fetch(`${API_BASE_URL}/api/user/change-password`, {
+            const res = await fetchWithRefresh(`${API_BASE_URL}/api/user/change-password`, {
             method: "PATCH",
             credentials: "include",
             headers: {
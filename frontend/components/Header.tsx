@@ -10,6 +10,7 @@ import { toast } from "sonner"
 import { useDispatch } from 'react-redux'
 import { AppDispatch, useAppSelector } from '@/redux/store'
 import { logIn, logOut } from '@/redux/features/auth-slice'
+import { fetchWithRefresh } from '@/lib/utils'
 
 const navLinks = [
   { href: "/", label: "Home" },
@@ -56,7 +57,7 @@ export default function Header() {
   useEffect(() => {
     (async () => {
       try {
-        const resp = await fetch(`${API_BASE_URL}/api/user/me/`, {
+        const resp = await fetchWithRefresh(`${API_BASE_URL}/api/user/me/`, {
           method: 'GET',
           headers: { 'Content-Type': 'application/json' },
           credentials: 'include',
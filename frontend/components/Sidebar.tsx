@@ -7,6 +7,7 @@ import { usePathname } from 'next/navigation'
 import { useDispatch } from 'react-redux'
 import { AppDispatch, useAppSelector } from '@/redux/store'
 import { logIn, logOut } from '@/redux/features/auth-slice'
+import { fetchWithRefresh } from '@/lib/utils'
 import { Sheet, SheetContent, SheetTitle, SheetTrigger } from './ui/sheet'
 import { Button } from './ui/button'
 import { toast } from "sonner"
@@ -40,7 +41,7 @@ export function useUserInfo() {
   useEffect(() => {
     (async () => {
       try {
-        const resp = await fetch(`${API_BASE_URL}/api/user/me/`, {
+        const resp = await fetchWithRefresh(`${API_BASE_URL}/api/user/me/`, {
           method: "GET",
           headers: { "Content-Type": "application/json" },
           credentials: "include",
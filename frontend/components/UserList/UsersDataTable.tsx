@@ -17,7 +17,7 @@ async function getData(): Promise<Users[]> {
       
     });
     const data = await resp.json()
-    return data
+    return data.items
 }
 
 export default async function UsersDataTable() {
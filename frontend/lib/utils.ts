@@ -4,3 +4,15 @@ import { twMerge } from "tailwind-merge"
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs))
 }
+
+// Access tokens are short-lived: on a 401, renew them with the refresh
+// cookie and retry the request once
+export async function fetchWithRefresh(input: string, init: RequestInit = {}): Promise<Response> {
+  const resp = await fetch(input, { ...init, credentials: "include" })
+  if (resp.status !== 401) return resp
+  const refreshed = await fetch(`${process.env.NEXT_PUBLIC_API_BASE_URL}/api/auth/refresh`, {
+    method: "POST",
+    credentials: "include",
+  })
+  return refreshed.ok ? fetch(input, { ...init, credentials: "include" }) : resp
+}